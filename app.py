@@ -7,8 +7,9 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, date, timedelta
+from html import escape
 import pandas as pd
-from database import Database
+from database import Database, CachedReads
 from utils import *
 
 
@@ -36,6 +37,15 @@ def init_db():
 
 db = init_db()
 
+# Cached reads: results are keyed by method, arguments and db.data_version,
+# so reruns reuse them until any write commits. The TTL bounds staleness
+# for writes made by other processes and for date-relative results.
+@st.cache_data(ttl=300, max_entries=500, show_spinner=False)
+def cached_read(method: str, data_version: int, args: tuple, kwargs: tuple):
+    return getattr(db, method)(*args, **dict(kwargs))
+
+reads = CachedReads(db, cached_read)
+
 # ============ SIDEBAR NAVIGATION ============
 
 def sidebar_navigation():
@@ -105,7 +115,7 @@ def render_dashboard():
     """, unsafe_allow_html=True)
     
     # Get Statistics
-    stats = db.get_dashboard_stats()
+    stats = reads.get_dashboard_stats()
     
     # Top Metrics Row with enhanced styling
     st.markdown("<div style='margin-bottom: 30px;'>", unsafe_allow_html=True)
@@ -158,7 +168,7 @@ def render_dashboard():
         st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
         st.markdown("<h3 style='margin-bottom: 20px;'>📊 Requests by Team</h3>", unsafe_allow_html=True)
         
-        team_data = db.get_requests_by_team()
+        team_data = reads.get_requests_by_team()
         if team_data:
             df_teams = pd.DataFrame(team_data)
             fig = px.bar(df_teams, x='name', y='count', 
@@ -176,7 +186,7 @@ def render_dashboard():
         st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
         st.markdown("<h3 style='margin-bottom: 20px;'>🏗️ Equipment by Category</h3>", unsafe_allow_html=True)
         
-        category_data = db.get_equipment_by_category()
+        category_data = reads.get_equipment_by_category()
         if category_data:
             df_categories = pd.DataFrame(category_data)
             fig = px.pie(df_categories, values='count', names='category', 
@@ -193,17 +203,9 @@ def render_dashboard():
     st.markdown("<div class='custom-card'>", unsafe_allow_html=True)
     st.markdown("<h3>📝 Recent Activity</h3>", unsafe_allow_html=True)
     
-    activities = db.get_recent_activity(limit=8)
+    activities = reads.get_recent_activity(limit=8)
     if activities:
-        for activity in activities:
-            timestamp = format_date(activity['created_at'].split()[0]) if activity.get('created_at') else 'N/A'
-            st.markdown(f"""
-            <div class='activity-item'>
-                <strong>{activity['action']}</strong>
-                <p style='margin: 4px 0; font-size: 12px; color: #666;'>{activity['details']}</p>
-                <span style='font-size: 11px; color: #999;'>{timestamp}</span>
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown(render_cards(create_activity_item, activities), unsafe_allow_html=True)
     else:
         st.info("No recent activity")
     
@@ -222,69 +224,55 @@ def render_equipment():
     tab1, tab2, tab3 = st.tabs(["📋 All Equipment", "➕ Add Equipment", "🔍 Equipment Details"])
     
     with tab1:
-        equipment_list = db.get_all_equipment()
+        categories = reads.get_distinct_values('equipment', 'category')
         
-        if equipment_list:
+        if categories:
             # Filters
             col1, col2, col3 = st.columns(3)
             with col1:
                 filter_status = st.selectbox("Filter by Status", ["All", "Usable", "Scrapped"])
             with col2:
-                categories = list(set([e['category'] for e in equipment_list]))
                 filter_category = st.selectbox("Filter by Category", ["All"] + categories)
             with col3:
-                departments = list(set([e['department'] for e in equipment_list]))
+                departments = reads.get_distinct_values('equipment', 'department')
                 filter_dept = st.selectbox("Filter by Department", ["All"] + departments)
             
-            # Apply filters
-            filtered = equipment_list
-            if filter_status != "All":
-                filtered = [e for e in filtered if e['status'] == filter_status]
-            if filter_category != "All":
-                filtered = [e for e in filtered if e['category'] == filter_category]
-            if filter_dept != "All":
-                filtered = [e for e in filtered if e['department'] == filter_dept]
+            # Fetch only the matching page
+            filters = {
+                'status': None if filter_status == "All" else filter_status,
+                'category': None if filter_category == "All" else filter_category,
+                'department': None if filter_dept == "All" else filter_dept,
+            }
+            page_size = 30
+            page_key = f"eq_page_{filter_status}_{filter_category}_{filter_dept}"
+            filtered, total = fetch_page(
+                lambda limit, offset: reads.query_equipment(filters, limit=limit, offset=offset,
+                                                            include_request_counts=True),
+                page_size, page_key)
             
-            # Display equipment cards
-            for i in range(0, len(filtered), 3):
+            if not filtered:
+                st.info("No equipment matches the selected filters")
+            
+            # Display equipment cards: one markdown block per grid column
+            if filtered:
                 cols = st.columns(3)
                 for j, col in enumerate(cols):
-                    if i + j < len(filtered):
-                        eq = filtered[i + j]
-                        with col:
-                            # Smart button - count of open requests
-                            open_requests = db.get_equipment_request_count(eq['id'])
-                            
-                            status_color = get_status_color(eq['status'])
-                            
-                            st.markdown(f"""
-                            <div class='equipment-card'>
-                                <h4 style='margin: 0 0 10px 0; color: #1e3a8a;'>{eq['name']}</h4>
-                                <p style='font-size: 12px; color: #666; margin: 4px 0;'>
-                                    <strong>SN:</strong> {eq['serial_number']}
-                                </p>
-                                <p style='font-size: 12px; color: #666; margin: 4px 0;'>
-                                    <strong>Category:</strong> {eq['category']}
-                                </p>
-                                <p style='font-size: 12px; color: #666; margin: 4px 0;'>
-                                    <strong>Department:</strong> {eq['department']}
-                                </p>
-                                <p style='font-size: 12px; color: #666; margin: 4px 0;'>
-                                    <strong>Location:</strong> {eq['location'] or 'N/A'}
-                                </p>
-                                <div style='margin-top: 12px;'>
-                                    {create_badge(eq['status'], status_color)}
-                                </div>
-                                <div style='margin-top: 12px;'>
-                                    {create_smart_button(open_requests, 'Open Requests')}
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            
-                            if st.button(f"View Details", key=f"view_eq_{eq['id']}", use_container_width=True):
-                                st.session_state.selected_equipment = eq['id']
-                                st.session_state.current_page = "equipment"
-                                st.rerun()
+                    with col:
+                        st.markdown(render_cards(create_equipment_card, filtered[j::3]), unsafe_allow_html=True)
+                
+                # A single picker replaces a "View Details" button per card
+                detail_col, button_col = st.columns([3, 1])
+                with detail_col:
+                    chosen = st.selectbox("Equipment details", filtered, key="view_eq_choice",
+                                          format_func=lambda eq: f"{eq['name']} ({eq['serial_number']})")
+                with button_col:
+                    st.markdown("<div style='height: 28px;'></div>", unsafe_allow_html=True)
+                    if st.button("View Details", key="view_eq", use_container_width=True):
+                        st.session_state.selected_equipment = chosen['id']
+                        st.session_state.current_page = "equipment"
+                        st.rerun()
+            
+            page_selector(total, page_size, page_key)
         else:
             st.info("No equipment found. Add your first equipment to get started!")
     
@@ -305,7 +293,7 @@ def render_equipment():
                 assigned_employee = st.text_input("Assigned Employee", placeholder="e.g., John Smith")
             
             with col2:
-                teams = db.get_all_teams()
+                teams = reads.get_all_teams()
                 team_options = {t['name']: t['id'] for t in teams}
                 team_name = st.selectbox("Maintenance Team", list(team_options.keys()))
                 
@@ -347,10 +335,10 @@ def render_equipment():
     
     with tab3:
         if 'selected_equipment' in st.session_state:
-            eq = db.get_equipment_by_id(st.session_state.selected_equipment)
+            eq = reads.get_equipment_by_id(st.session_state.selected_equipment)
             
             if eq:
-                st.markdown(f"<h2>{eq['name']}</h2>", unsafe_allow_html=True)
+                st.markdown(f"<h2>{escape(eq['name'])}</h2>", unsafe_allow_html=True)
                 
                 # Equipment Details Card
                 st.markdown("<div class='custom-card'>", unsafe_allow_html=True)
@@ -379,7 +367,7 @@ def render_equipment():
                 st.markdown("</div>", unsafe_allow_html=True)
                 
                 # Smart Button - Maintenance History
-                requests = db.get_requests_by_equipment(eq['id'])
+                requests = reads.get_requests_by_equipment(eq['id'])
                 open_count = len([r for r in requests if r['stage'] not in ['Repaired', 'Scrap']])
                 
                 st.markdown(f"<h3>Maintenance History {create_smart_button(open_count, 'Open Requests')}</h3>", unsafe_allow_html=True)
@@ -407,65 +395,67 @@ def render_requests():
     tab1, tab2 = st.tabs(["📋 All Requests", "➕ Create Request"])
     
     with tab1:
-        requests = db.get_all_requests()
+        # Filters
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            filter_stage = st.selectbox("Filter by Stage", ["All", "New", "In Progress", "Repaired", "Scrap"])
+        with col2:
+            filter_type = st.selectbox("Filter by Type", ["All", "Corrective", "Preventive"])
+        with col3:
+            filter_priority = st.selectbox("Filter by Priority", ["All", "Critical", "High", "Medium", "Low"])
+        with col4:
+            show_overdue = st.checkbox("Show Only Overdue", value=False)
         
-        if requests:
-            # Filters
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                filter_stage = st.selectbox("Filter by Stage", ["All", "New", "In Progress", "Repaired", "Scrap"])
-            with col2:
-                filter_type = st.selectbox("Filter by Type", ["All", "Corrective", "Preventive"])
-            with col3:
-                filter_priority = st.selectbox("Filter by Priority", ["All", "Critical", "High", "Medium", "Low"])
-            with col4:
-                show_overdue = st.checkbox("Show Only Overdue", value=False)
+        # Fetch only the matching page
+        filters = {
+            'stage': None if filter_stage == "All" else filter_stage,
+            'request_type': None if filter_type == "All" else filter_type,
+            'priority': None if filter_priority == "All" else filter_priority,
+        }
+        page_size = 50
+        page_key = f"req_page_{filter_stage}_{filter_type}_{filter_priority}_{show_overdue}"
+        filtered, total = fetch_page(
+            lambda limit, offset: reads.query_requests(filters, overdue_only=show_overdue,
+                                                       limit=limit, offset=offset),
+            page_size, page_key)
+        
+        # Display as table
+        if filtered:
+            df_requests = pd.DataFrame(filtered)
+            display_cols = ['id', 'subject', 'equipment_name', 'request_type', 'scheduled_date', 
+                          'stage', 'priority', 'assigned_technician', 'team_name']
+            df_display = df_requests[display_cols]
+            df_display.columns = ['ID', 'Subject', 'Equipment', 'Type', 'Scheduled', 'Stage', 'Priority', 'Technician', 'Team']
             
-            # Apply filters
-            filtered = requests
-            if filter_stage != "All":
-                filtered = [r for r in filtered if r['stage'] == filter_stage]
-            if filter_type != "All":
-                filtered = [r for r in filtered if r['request_type'] == filter_type]
-            if filter_priority != "All":
-                filtered = [r for r in filtered if r['priority'] == filter_priority]
-            if show_overdue:
-                filtered = [r for r in filtered if is_overdue(r['scheduled_date']) and r['stage'] not in ['Repaired', 'Scrap']]
+            st.dataframe(df_display, width='stretch', hide_index=True)
+            page_selector(total, page_size, page_key)
             
-            # Display as table
-            if filtered:
-                df_requests = pd.DataFrame(filtered)
-                display_cols = ['id', 'subject', 'equipment_name', 'request_type', 'scheduled_date', 
-                              'stage', 'priority', 'assigned_technician', 'team_name']
-                df_display = df_requests[display_cols]
-                df_display.columns = ['ID', 'Subject', 'Equipment', 'Type', 'Scheduled', 'Stage', 'Priority', 'Technician', 'Team']
-                
-                st.dataframe(df_display, width='stretch', hide_index=True)
+            # Quick stage update
+            st.markdown("<br>", unsafe_allow_html=True)
+            with st.expander("🔄 Quick Stage Update"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    request_id = st.number_input("Request ID", min_value=1, step=1)
+                with col2:
+                    new_stage = st.selectbox("New Stage", ["New", "In Progress", "Repaired", "Scrap"])
                 
-                # Quick stage update
-                st.markdown("<br>", unsafe_allow_html=True)
-                with st.expander("🔄 Quick Stage Update"):
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        request_id = st.number_input("Request ID", min_value=1, step=1)
-                    with col2:
-                        new_stage = st.selectbox("New Stage", ["New", "In Progress", "Repaired", "Scrap"])
-                    
-                    if st.button("Update Stage", width='stretch'):
-                        try:
-                            db.update_request_stage(request_id, new_stage)
-                            st.success(f"✅ Request #{request_id} moved to '{new_stage}' stage!")
-                            
-                            if new_stage == "Scrap":
-                                st.warning("⚠️ Equipment has been automatically marked as 'Scrapped'")
-                            
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"❌ Error: {str(e)}")
-            else:
-                st.info("No requests match the selected filters")
+                if st.button("Update Stage", width='stretch'):
+                    try:
+                        db.update_request_stage(request_id, new_stage)
+                        st.success(f"✅ Request #{request_id} moved to '{new_stage}' stage!")
+                        
+                        if new_stage == "Scrap":
+                            st.warning("⚠️ Equipment has been automatically marked as 'Scrapped'")
+                        
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"❌ Error: {str(e)}")
+        elif any(filters.values()) or show_overdue:
+            st.info("No requests match the selected filters")
+            page_selector(total, page_size, page_key)
         else:
             st.info("No maintenance requests found")
+            page_selector(total, page_size, page_key)
     
     with tab2:
         st.markdown("<div class='custom-card'>", unsafe_allow_html=True)
@@ -474,7 +464,7 @@ def render_requests():
             st.markdown("<h3>Create Maintenance Request</h3>", unsafe_allow_html=True)
             
             # Equipment selection with auto-fill
-            equipment_list = db.get_all_equipment()
+            equipment_list = reads.get_all_equipment()
             equipment_options = {f"{e['name']} ({e['serial_number']})": e['id'] for e in equipment_list if e['status'] == 'Usable'}
             
             selected_eq_str = st.selectbox("Select Equipment*", list(equipment_options.keys()))
@@ -482,13 +472,13 @@ def render_requests():
             
             # Auto-fill preview
             if selected_eq_id:
-                eq_data = db.get_equipment_by_id(selected_eq_id)
+                eq_data = reads.get_equipment_by_id(selected_eq_id)
                 st.info(f"🔍 Auto-filled: Department: **{eq_data['department']}** | Team: **{eq_data['team_name'] or 'Not Assigned'}**")
                 
                 # Get team members for technician assignment
                 team_members = []
                 if eq_data.get('team_id'):
-                    team_members = db.get_team_members(eq_data['team_id'])
+                    team_members = reads.get_team_members(eq_data['team_id'])
             
             col1, col2 = st.columns(2)
             
@@ -542,6 +532,10 @@ def render_requests():
 
 # ============ KANBAN BOARD PAGE ============
 
+KANBAN_COLUMN_LIMIT = 50           # cards shown per open column
+KANBAN_TERMINAL_LIMIT = 10         # initial cards (and "load more" step) for closed columns
+KANBAN_TERMINAL_STAGES = ("Repaired", "Scrap")
+
 def render_kanban():
     st.markdown("""
     <div style='margin-bottom: 30px;'>
@@ -552,26 +546,40 @@ def render_kanban():
     
     stages = ["New", "In Progress", "Repaired", "Scrap"]
     
+    # Closed columns grow with history, so they start short and page on demand
+    limits = {stage: st.session_state.get(f"kanban_limit_{stage}", KANBAN_TERMINAL_LIMIT)
+              for stage in KANBAN_TERMINAL_STAGES}
+    board = reads.get_kanban_board(stages, limits, default_limit=KANBAN_COLUMN_LIMIT)
+    today = date.today()
+    
     cols = st.columns(4)
     
     for idx, stage in enumerate(stages):
         with cols[idx]:
             stage_color = get_stage_color(stage)
-            requests = db.get_requests_by_stage(stage)
+            column = board[stage]
+            requests = annotate_requests(column['requests'], today)
             
-            st.markdown(f"""
+            cards = render_cards(lambda req: create_kanban_card(req, req['is_overdue']), requests)
+            more = ''
+            if column['count'] > len(requests):
+                more = f"<p style='text-align: center; color: #94a3b8; font-size: 12px;'>Showing {len(requests)} of {column['count']}</p>"
+            
+            # One markdown block per column instead of one per card
+            st.markdown(compact_html(f"""
             <div class='kanban-column'>
                 <div class='kanban-header' style='border-bottom: 3px solid {stage_color};'>
-                    {stage} ({len(requests)})
+                    {stage} ({column['count']})
                 </div>
-            """, unsafe_allow_html=True)
-            
-            for req in requests:
-                overdue = is_overdue(req['scheduled_date']) and stage not in ['Repaired', 'Scrap']
-                card_html = create_kanban_card(req, overdue)
-                st.markdown(card_html, unsafe_allow_html=True)
+                {cards}
+                {more}
+            </div>
+            """), unsafe_allow_html=True)
             
-            st.markdown("</div>", unsafe_allow_html=True)
+            if stage in KANBAN_TERMINAL_STAGES and column['count'] > len(requests):
+                if st.button("Load more", key=f"kanban_more_{stage}", width='stretch'):
+                    st.session_state[f"kanban_limit_{stage}"] = limits[stage] + KANBAN_TERMINAL_LIMIT
+                    st.rerun()
     
     # Quick move functionality
     st.markdown("<br><br>", unsafe_allow_html=True)
@@ -609,28 +617,45 @@ def render_calendar():
     </div>
     """, unsafe_allow_html=True)
     
-    # Get preventive maintenance requests
-    all_requests = db.get_all_requests()
-    preventive_requests = [r for r in all_requests if r['request_type'] == 'Preventive']
+    # Navigable month / quarter window; only that slice is fetched and plotted
+    col1, col2, col3, col4 = st.columns([2, 1, 3, 1])
+    with col1:
+        span = st.radio("Window", ["Month", "Quarter"], horizontal=True, key="calendar_span")
+    offset_key = f"calendar_offset_{span}"
+    offset = st.session_state.get(offset_key, 0)
+    with col2:
+        if st.button("◀ Previous", key="calendar_prev", width='stretch'):
+            st.session_state[offset_key] = offset - 1
+            st.rerun()
+    with col4:
+        if st.button("Next ▶", key="calendar_next", width='stretch'):
+            st.session_state[offset_key] = offset + 1
+            st.rerun()
     
-    if preventive_requests:
-        # Calendar view using timeline
-        st.markdown("<div class='calendar-container'>", unsafe_allow_html=True)
-        
-        # Create DataFrame for calendar
-        calendar_data = []
-        for req in preventive_requests:
-            calendar_data.append({
-                'Task': req['subject'],
-                'Start': req['scheduled_date'],
-                'End': req['scheduled_date'],
-                'Equipment': req['equipment_name'],
-                'Team': req['team_name'],
-                'Stage': req['stage'],
-                'Technician': req['assigned_technician'] or 'Unassigned'
-            })
-        
-        df_calendar = pd.DataFrame(calendar_data)
+    today = date.today()
+    window_start, window_end = calendar_window(today, span, offset)
+    with col3:
+        st.markdown(f"<h3 style='text-align: center; margin: 0;'>{window_start.strftime('%b %Y')}"
+                    f"{'' if span == 'Month' else ' – ' + window_end.strftime('%b %Y')}</h3>",
+                    unsafe_allow_html=True)
+    
+    window_requests = reads.get_preventive_requests(window_start, window_end)
+    
+    # Calendar view using timeline
+    st.markdown("<div class='calendar-container'>", unsafe_allow_html=True)
+    
+    if window_requests:
+        # Build the frame column-wise from the query rows
+        df_calendar = pd.DataFrame(window_requests)
+        df_calendar = pd.DataFrame({
+            'Task': df_calendar['subject'],
+            'Start': df_calendar['scheduled_date'],
+            'End': df_calendar['scheduled_date'],
+            'Equipment': df_calendar['equipment_name'],
+            'Team': df_calendar['team_name'],
+            'Stage': df_calendar['stage'],
+            'Technician': df_calendar['assigned_technician'].fillna('').replace('', 'Unassigned'),
+        })
         
         # Timeline chart
         fig = px.timeline(df_calendar, x_start='Start', x_end='End', y='Task', 
@@ -644,60 +669,26 @@ def render_calendar():
                              'Scrap': '#FF4444'
                          })
         
+        fig.update_xaxes(range=[window_start, window_end + timedelta(days=1)])
         fig.update_layout(height=500)
         st.plotly_chart(fig, width='stretch')
-        
-        st.markdown("</div>", unsafe_allow_html=True)
-        
-        # Upcoming preventive maintenance
-        st.markdown("<div class='custom-card'>", unsafe_allow_html=True)
-        st.markdown("<h3>📆 Upcoming Preventive Maintenance (Next 30 Days)</h3>", unsafe_allow_html=True)
-        
-        today = date.today()
-        next_30_days = today + timedelta(days=30)
-        
-        upcoming = [r for r in preventive_requests 
-                   if today <= datetime.strptime(r['scheduled_date'], '%Y-%m-%d').date() <= next_30_days
-                   and r['stage'] not in ['Repaired', 'Scrap']]
-        
-        if upcoming:
-            for req in upcoming:
-                scheduled_dt = datetime.strptime(req['scheduled_date'], '%Y-%m-%d').date()
-                days_until = (scheduled_dt - today).days
-                
-                priority_color = get_priority_color(req['priority'])
-                
-                st.markdown(f"""
-                <div style='background: white; border-left: 4px solid {priority_color}; border-radius: 8px; padding: 12px; margin-bottom: 10px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
-                    <div style='display: flex; justify-content: space-between; align-items: start;'>
-                        <div>
-                            <h4 style='margin: 0; color: #1e3a8a;'>{req['subject']}</h4>
-                            <p style='margin: 4px 0; font-size: 13px; color: #666;'>
-                                <strong>Equipment:</strong> {req['equipment_name']} | 
-                                <strong>Team:</strong> {req['team_name']} |
-                                <strong>Technician:</strong> {req['assigned_technician'] or 'Not Assigned'}
-                            </p>
-                        </div>
-                        <div style='text-align: right;'>
-                            <div style='background: {priority_color}; color: white; padding: 4px 12px; border-radius: 12px; font-size: 11px; font-weight: 600; margin-bottom: 4px;'>
-                                {req['priority']}
-                            </div>
-                            <div style='font-size: 12px; color: #666;'>
-                                📅 {format_date(req['scheduled_date'])}
-                            </div>
-                            <div style='font-size: 11px; color: #999;'>
-                                {'Today!' if days_until == 0 else f'In {days_until} days'}
-                            </div>
-                        </div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.info("No upcoming preventive maintenance scheduled in the next 30 days")
-        
-        st.markdown("</div>", unsafe_allow_html=True)
     else:
-        st.info("No preventive maintenance requests found")
+        st.info("No preventive maintenance scheduled in this period")
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+    
+    # Upcoming preventive maintenance
+    st.markdown("<div class='custom-card'>", unsafe_allow_html=True)
+    st.markdown("<h3>📆 Upcoming Preventive Maintenance (Next 30 Days)</h3>", unsafe_allow_html=True)
+    
+    upcoming = reads.get_preventive_requests(today, today + timedelta(days=30), open_only=True)
+    
+    if upcoming:
+        st.markdown(render_cards(create_upcoming_card, annotate_requests(upcoming, today)), unsafe_allow_html=True)
+    else:
+        st.info("No upcoming preventive maintenance scheduled in the next 30 days")
+    
+    st.markdown("</div>", unsafe_allow_html=True)
 
 # ============ TEAMS PAGE ============
 
@@ -712,32 +703,23 @@ def render_teams():
     tab1, tab2, tab3 = st.tabs(["📋 All Teams", "👨‍🔧 Team Members", "➕ Add Team/Member"])
     
     with tab1:
-        teams = db.get_all_teams()
+        teams = reads.get_team_summaries()
         
         if teams:
             for team in teams:
-                # Get team statistics
-                team_requests = db.get_all_requests()
-                team_requests = [r for r in team_requests if r.get('team_id') == team['id']]
-                active_requests = [r for r in team_requests if r['stage'] not in ['Repaired', 'Scrap']]
-                
-                team_equipment = db.get_all_equipment()
-                team_equipment = [e for e in team_equipment if e.get('team_id') == team['id']]
-                
-                # Get team members
-                team_members = db.get_team_members(team['id'])
+                team_members = team['members']
                 
                 st.markdown(f"""
                 <div class='custom-card' style='border-left: 4px solid #667eea;'>
-                    <h3 style='margin: 0 0 10px 0; color: #1e3a8a;'>{team['name']}</h3>
-                    <p style='color: #666; margin: 0 0 15px 0;'>{team['description'] or 'No description'}</p>
+                    <h3 style='margin: 0 0 10px 0; color: #1e3a8a;'>{escape(team['name'])}</h3>
+                    <p style='color: #666; margin: 0 0 15px 0;'>{escape(team['description'] or 'No description')}</p>
                     
                     <div style='display: flex; gap: 20px; margin-bottom: 15px;'>
                         <div>
-                            {create_smart_button(len(team_equipment), 'Equipment')}
+                            {create_smart_button(team['equipment_count'], 'Equipment')}
                         </div>
                         <div>
-                            {create_smart_button(len(active_requests), 'Active Requests')}
+                            {create_smart_button(team['active_requests'], 'Active Requests')}
                         </div>
                         <div>
                             {create_smart_button(len(team_members), 'Team Members')}
@@ -747,7 +729,7 @@ def render_teams():
                     <div style='background: #f8fafc; padding: 10px; border-radius: 8px;'>
                         <strong style='color: #475569;'>Team Members:</strong><br>
                         {'<span style="color: #94a3b8;">No members assigned</span>' if not team_members else 
-                         ', '.join([f"{m['name']} ({m['role']})" if m['role'] else m['name'] for m in team_members])}
+                         escape(', '.join([f"{m['name']} ({m['role']})" if m['role'] else m['name'] for m in team_members]))}
                     </div>
                 </div>
                 """, unsafe_allow_html=True)
@@ -758,7 +740,7 @@ def render_teams():
         st.markdown("<div class='custom-card'>", unsafe_allow_html=True)
         st.markdown("<h3>All Team Members</h3>", unsafe_allow_html=True)
         
-        all_members = db.get_all_team_members()
+        all_members = reads.get_all_team_members()
         
         if all_members:
             df_members = pd.DataFrame(all_members)
@@ -820,7 +802,7 @@ def render_teams():
             with st.form("add_member_form"):
                 st.markdown("<h3>Add Team Member</h3>", unsafe_allow_html=True)
                 
-                teams = db.get_all_teams()
+                teams = reads.get_all_teams()
                 team_options = {t['name']: t['id'] for t in teams}
                 
                 if teams:
@@ -7,5 +7,7 @@ from api.equipment import equipment_bp
 from api.requests import requests_bp
 from api.teams import teams_bp
 from api.dashboard import dashboard_bp
+from api.changes import changes_bp
+from api.sync import sync_bp
 
-__all__ = ['equipment_bp', 'requests_bp', 'teams_bp', 'dashboard_bp']
+__all__ = ['equipment_bp', 'requests_bp', 'teams_bp', 'dashboard_bp', 'changes_bp', 'sync_bp']
@@ -0,0 +1,83 @@
+"""
+Bulk Write Helpers
+Request parsing, batching and per-item results shared by the bulk endpoints
+"""
+
+from itertools import islice
+
+from flask import current_app, request, jsonify
+from sqlalchemy import insert, select
+
+from database import db
+
+MAX_BATCH_SIZE = 5000
+
+
+def bulk_items():
+    """Items of a bulk request body: a JSON array or {'items': [...]}"""
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('items')
+    if not isinstance(data, list):
+        raise ValueError("Expected a JSON array or an object with an 'items' array")
+    return data
+
+
+def batch_size():
+    """Rows written per transaction: ?batch_size= or the BULK_BATCH_SIZE config"""
+    try:
+        size = int(request.args.get('batch_size', current_app.config['BULK_BATCH_SIZE']))
+    except (TypeError, ValueError):
+        raise ValueError('batch_size must be an integer')
+    return max(1, min(size, MAX_BATCH_SIZE))
+
+
+def chunked(iterable, size):
+    """Yield lists of at most ``size`` items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def int_field(item, key):
+    """``item[key]`` coerced with int(), or None when it is missing or not a number"""
+    try:
+        return int(item[key])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def insert_rows(model, rows):
+    """Insert ``rows`` with one Core executemany and return their new ids in row order
+
+    RETURNING can't be used for this: SQLite doesn't guarantee its row order,
+    so SQLAlchemy would fall back to one INSERT per row. Instead the ids are
+    read back afterwards; the transaction holds SQLite's write lock from the
+    first insert, so the batch received the newest ids, in insertion order.
+    """
+    db.session.execute(insert(model.__table__), rows)
+    return db.session.scalars(
+        select(model.id).order_by(model.id.desc()).limit(len(rows))
+    ).all()[::-1]
+
+
+def item_error(index, error):
+    """Per-item failure entry for the bulk response"""
+    if isinstance(error, KeyError):
+        message = f"Missing field {error}"
+    else:
+        message = str(error)
+    return {'index': index, 'error': message}
+
+
+def bulk_response(results):
+    """Summary plus one result per submitted item, in submission order"""
+    failed = sum(1 for result in results if 'error' in result)
+    return jsonify({
+        'succeeded': len(results) - failed,
+        'failed': failed,
+        'results': results
+    }), 200
@@ -0,0 +1,93 @@
+"""
+Change Feed API Blueprint
+Server-Sent Events stream and catch-up endpoint for the change feed
+"""
+
+import json
+import time
+
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from database import db
+import changes
+
+changes_bp = Blueprint('changes', __name__)
+
+FEED_PAGE_SIZE = 500
+
+
+def resume_point():
+    """Sequence number to continue after: Last-Event-ID, then ?since=, else now"""
+    value = request.headers.get('Last-Event-ID') or request.args.get('since')
+    if value is None:
+        return changes.latest_seq()
+    try:
+        return max(0, int(value))
+    except ValueError:
+        raise ValueError('since / Last-Event-ID must be an integer sequence number')
+
+
+def sse_event(change):
+    return f"id: {change['seq']}\nevent: change\ndata: {json.dumps(change)}\n\n"
+
+
+@changes_bp.route('/', methods=['GET'])
+def get_changes():
+    """Events after ?since= (at most ?limit=), for polling clients and catch-up"""
+    try:
+        since = resume_point()
+        limit = max(1, min(int(request.args.get('limit', FEED_PAGE_SIZE)), FEED_PAGE_SIZE))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        events = changes.events_since(since, limit)
+        return jsonify({
+            'events': events,
+            'last_seq': events[-1]['seq'] if events else since
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@changes_bp.route('/stream', methods=['GET'])
+def stream_changes():
+    """Stream events as text/event-stream, resuming after Last-Event-ID or ?since=
+
+    Each stream holds a server thread, so it ends after
+    CHANGE_FEED_STREAM_SECONDS; EventSource then reconnects with the last
+    id it saw and continues where this stream stopped.
+    """
+    try:
+        since = resume_point()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    poll = current_app.config['CHANGE_FEED_POLL_SECONDS']
+    keepalive = current_app.config['CHANGE_FEED_KEEPALIVE_SECONDS']
+    lifetime = current_app.config['CHANGE_FEED_STREAM_SECONDS']
+
+    def generate():
+        last = since
+        last_sent = time.monotonic()
+        closes_at = last_sent + lifetime
+        yield f"retry: {int(poll * 1000) or 1000}\n\n"
+        while time.monotonic() < closes_at:
+            events = changes.events_since(last, FEED_PAGE_SIZE)
+            # Hand the connection back to the pool while the stream idles
+            db.session.remove()
+            if events:
+                yield ''.join(sse_event(change) for change in events)
+                last = events[-1]['seq']
+                last_sent = time.monotonic()
+                continue
+            if time.monotonic() - last_sent >= keepalive:
+                yield ': keepalive\n\n'
+                last_sent = time.monotonic()
+            changes.wait_for_commit(min(poll, max(closes_at - time.monotonic(), 0)))
+        # Sets Last-Event-ID for the reconnect even when no event was sent
+        yield f"id: {last}\n\n"
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
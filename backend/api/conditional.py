@@ -0,0 +1,83 @@
+"""
+Conditional GET and Compression Helpers
+Strong ETags from table versions, 304 responses and gzip negotiation
+"""
+
+import gzip
+import hashlib
+from datetime import date
+from functools import wraps
+
+from flask import current_app, g, request, make_response
+import table_versions
+
+GZIP_SUFFIX = '-gzip'
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/csv', 'text/plain')
+
+
+def resource_etag(tables, daily):
+    """ETag for the current URL given the versions of the tables it reads
+
+    ``daily`` responses also depend on today's date (e.g. is_overdue).
+    """
+    versions = table_versions.current([model.__tablename__ for model in tables])
+    parts = [request.full_path] + [f'{name}={version}' for name, version in sorted(versions.items())]
+    if daily:
+        parts.append(date.today().isoformat())
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+
+def conditional(*tables, daily=False):
+    """Answer If-None-Match with 304 without running the view
+
+    ``tables`` are the models whose rows the response is built from. The
+    ETag is read before the view runs, so a write that lands meanwhile can
+    only make it stale in the direction of an extra download. The view
+    finds it in ``g.etag``; anything it caches in-process must be keyed by
+    it, or a cached body could be sent under a newer ETag.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = g.etag = resource_etag(tables, daily)
+            for candidate in (etag, etag + GZIP_SUFFIX):
+                if request.if_none_match.contains(candidate):
+                    response = current_app.response_class(status=304)
+                    response.set_etag(candidate)
+                    response.vary.add('Accept-Encoding')
+                    response.cache_control.no_cache = True
+                    return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+                # Let browsers keep the body but revalidate it on every use
+                response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+
+def gzip_response(response):
+    """after_request hook: gzip large bodies for clients that accept it
+
+    Streamed responses (exports, the change feed) are passed through. The
+    ETag of a compressed body gets a suffix, as the bytes differ.
+    """
+    if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+            or response.mimetype not in COMPRESSIBLE_TYPES or 'Content-Encoding' in response.headers):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if not request.accept_encodings['gzip']:
+        return response
+    data = response.get_data()
+    if len(data) < current_app.config['GZIP_MIN_BYTES']:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=current_app.config['GZIP_LEVEL']))
+    response.headers['Content-Encoding'] = 'gzip'
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(etag + GZIP_SUFFIX, weak)
+    return response
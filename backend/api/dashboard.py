@@ -3,84 +3,71 @@ Dashboard API Blueprint
 Endpoints for dashboard statistics and analytics
 """
 
-from flask import Blueprint, jsonify, request
-from database import db
-from models import Equipment, MaintenanceRequest, Team
-from sqlalchemy import func
+from flask import Blueprint, jsonify, request, current_app, g
+from models import Team, ActivityLog, DashboardCounter
+from api.export import stream_export
+from api.conditional import conditional
+from cache import dashboard_cache
+import counters
 from datetime import date
 
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
+
+def cache_ttl():
+    return current_app.config.get('DASHBOARD_CACHE_TTL', 0)
+
+def cache_key(name):
+    """Cache key tied to the response's ETag (set by @conditional)
+    
+    The ETag carries the versions of the tables read, so an entry cached
+    before a write - in this worker or another - is never served again.
+    """
+    return (name, g.etag)
+
+# Aggregates are read from the materialized dashboard_counters table
+# (see counters.py), which the write endpoints keep up to date.
+
 @dashboard_bp.route('/stats', methods=['GET'])
+@conditional(DashboardCounter, daily=True)
 def get_dashboard_stats():
     """Get dashboard statistics"""
     try:
-        # Total equipment (usable)
-        total_equipment = Equipment.query.filter_by(status='Usable').count()
-
-        # Active requests (not Repaired or Scrap)
-        active_requests = MaintenanceRequest.query.filter(
-            ~MaintenanceRequest.stage.in_(['Repaired', 'Scrap'])
-        ).count()
-
-        # Overdue requests
-        overdue_requests = MaintenanceRequest.query.filter(
-            ~MaintenanceRequest.stage.in_(['Repaired', 'Scrap']),
-            MaintenanceRequest.scheduled_date < date.today()
-        ).count()
-
-        # Total teams
-        total_teams = Team.query.count()
-
-        # Critical requests
-        critical_requests = MaintenanceRequest.query.filter(
-            MaintenanceRequest.priority == 'Critical',
-            ~MaintenanceRequest.stage.in_(['Repaired', 'Scrap'])
-        ).count()
-
-        return jsonify({
-            'total_equipment': total_equipment,
-            'active_requests': active_requests,
-            'overdue_requests': overdue_requests,
-            'total_teams': total_teams,
-            'critical_requests': critical_requests
-        }), 200
+        today = date.today()
+        stats = dashboard_cache.get_or_set(
+            cache_key('stats'), cache_ttl(), lambda: counters.dashboard_stats(today)
+        )
+        return jsonify(stats), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @dashboard_bp.route('/requests-by-team', methods=['GET'])
+@conditional(DashboardCounter, Team)
 def get_requests_by_team():
     """Get request count grouped by team"""
     try:
-        results = db.session.query(
-            Team.name,
-            func.count(MaintenanceRequest.id).label('count')
-        ).outerjoin(MaintenanceRequest).group_by(Team.id).all()
-
-        return jsonify([{'team': r[0], 'count': r[1]} for r in results]), 200
+        results = dashboard_cache.get_or_set(cache_key('requests-by-team'), cache_ttl(), counters.requests_by_team)
+        return jsonify(results), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @dashboard_bp.route('/equipment-by-category', methods=['GET'])
+@conditional(DashboardCounter)
 def get_equipment_by_category():
     """Get equipment count grouped by category"""
     try:
-        results = db.session.query(
-            Equipment.category,
-            func.count(Equipment.id).label('count')
-        ).group_by(Equipment.category).all()
-
-        return jsonify([{'category': r[0], 'count': r[1]} for r in results]), 200
+        results = dashboard_cache.get_or_set(cache_key('equipment-by-category'), cache_ttl(),
+                                             counters.equipment_by_category)
+        return jsonify(results), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @dashboard_bp.route('/recent-activity', methods=['GET'])
+@conditional(ActivityLog)
 def get_recent_activity():
     """Get recent activity log"""
     try:
-        from models import ActivityLog
-
         # Parse limit safely
         try:
             limit = int(request.args.get('limit', 10))
@@ -104,3 +91,14 @@ def get_recent_activity():
         return jsonify(payload), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+
+@dashboard_bp.route('/activity-log/export', methods=['GET'])
+@conditional(ActivityLog)
+def export_activity_log():
+    """Stream the full activity log as NDJSON or CSV"""
+    try:
+        query = ActivityLog.query.order_by(ActivityLog.id)
+        return stream_export(query, ActivityLog.to_dict, 'activity_log')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -5,21 +5,46 @@ Endpoints for equipment management
 
 from flask import Blueprint, request, jsonify
 from database import db
-from models import Equipment, Team, ActivityLog
+from cache import invalidate_dashboard_cache
+from models import Equipment, Team, MaintenanceRequest, ActivityLog
+from api.pagination import list_response
+from api.conditional import conditional
+from api.bulk import batch_size
+import equipment_import
+import counters
+import read_model
+import io
 from datetime import datetime
 
 equipment_bp = Blueprint('equipment', __name__)
 
+# Whitelisted ?sort= keys and ?fields= names for the list routes
+SORT_KEYS = {
+    'created_at': Equipment.created_at,
+    'name': Equipment.name,
+    'serial_number': Equipment.serial_number,
+    'category': Equipment.category,
+    'department': Equipment.department,
+}
+LIST_FIELDS = Equipment.__table__.columns.keys() + ['team_name', 'request_count']
+# Tables the GET routes read, whose versions make up their ETags
+LIST_TABLES = (Equipment, Team, MaintenanceRequest)
+
+def equipment_list_response(query):
+    return list_response(query, Equipment, SORT_KEYS, LIST_FIELDS,
+                         prepare=Equipment.list_query, serialize=Equipment.serialize_row)
+
 @equipment_bp.route('/', methods=['GET'])
+@conditional(*LIST_TABLES)
 def get_all_equipment():
     """Get all equipment"""
     try:
-        equipment = Equipment.query.all()
-        return jsonify([eq.to_dict() for eq in equipment]), 200
+        return equipment_list_response(Equipment.query)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @equipment_bp.route('/<int:equipment_id>', methods=['GET'])
+@conditional(*LIST_TABLES)
 def get_equipment(equipment_id):
     """Get single equipment by ID"""
     try:
@@ -53,7 +78,7 @@ def create_equipment():
         )
         
         db.session.add(equipment)
-        db.session.commit()
+        db.session.flush()
         
         # Log activity
         log = ActivityLog(
@@ -62,19 +87,47 @@ def create_equipment():
             details=f"Equipment '{equipment.name}' added to system"
         )
         db.session.add(log)
+        counters.track(after=counters.equipment_keys(equipment))
         db.session.commit()
+        invalidate_dashboard_cache()
         
         return jsonify(equipment.to_dict()), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
 
+@equipment_bp.route('/import', methods=['POST'])
+def import_equipment():
+    """Import equipment from a CSV / NDJSON upload (multipart 'file' or raw body)"""
+    upload = request.files.get('file')
+    fmt = request.args.get('format') or equipment_import.guess_format(
+        upload.filename if upload else None, upload.mimetype if upload else request.mimetype
+    )
+    if fmt not in equipment_import.IMPORT_FORMATS:
+        return jsonify({'error': f"Invalid format '{fmt}'. Allowed: {', '.join(equipment_import.IMPORT_FORMATS)}"}), 400
+    try:
+        size = batch_size()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        stream = io.TextIOWrapper(upload.stream if upload else request.stream,
+                                  encoding='utf-8-sig', newline='')
+        result = equipment_import.import_equipment(equipment_import.read_records(stream, fmt), size)
+        invalidate_dashboard_cache()
+        return jsonify(result), 200
+    except Exception as e:
+        db.session.rollback()
+        invalidate_dashboard_cache()
+        return jsonify({'error': str(e)}), 400
+
 @equipment_bp.route('/<int:equipment_id>', methods=['PUT'])
 def update_equipment(equipment_id):
     """Update equipment"""
     try:
         equipment = Equipment.query.get_or_404(equipment_id)
         data = request.get_json()
+        counter_keys = counters.equipment_keys(equipment)
         
         # Update fields
         if 'name' in data:
@@ -94,7 +147,11 @@ def update_equipment(equipment_id):
         if 'notes' in data:
             equipment.notes = data['notes']
         
+        counters.track(counter_keys, counters.equipment_keys(equipment))
+        if 'name' in data:
+            read_model.refresh_equipment(equipment.id)
         db.session.commit()
+        invalidate_dashboard_cache()
         
         return jsonify(equipment.to_dict()), 200
     except Exception as e:
@@ -106,8 +163,12 @@ def delete_equipment(equipment_id):
     """Delete equipment"""
     try:
         equipment = Equipment.query.get_or_404(equipment_id)
+        counters.track(before=counters.equipment_keys(equipment))
+        request_ids = read_model.request_ids(MaintenanceRequest.equipment_id, equipment_id)
         db.session.delete(equipment)
+        read_model.refresh_requests(request_ids)
         db.session.commit()
+        invalidate_dashboard_cache()
         
         return jsonify({'message': 'Equipment deleted successfully'}), 200
     except Exception as e:
@@ -115,19 +176,19 @@ def delete_equipment(equipment_id):
         return jsonify({'error': str(e)}), 400
 
 @equipment_bp.route('/by-team/<int:team_id>', methods=['GET'])
+@conditional(*LIST_TABLES)
 def get_equipment_by_team(team_id):
     """Get equipment by team"""
     try:
-        equipment = Equipment.query.filter_by(team_id=team_id).all()
-        return jsonify([eq.to_dict() for eq in equipment]), 200
+        return equipment_list_response(Equipment.query.filter_by(team_id=team_id))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @equipment_bp.route('/by-status/<string:status>', methods=['GET'])
+@conditional(*LIST_TABLES)
 def get_equipment_by_status(status):
     """Get equipment by status"""
     try:
-        equipment = Equipment.query.filter_by(status=status).all()
-        return jsonify([eq.to_dict() for eq in equipment]), 200
+        return equipment_list_response(Equipment.query.filter_by(status=status))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -0,0 +1,70 @@
+"""
+Streaming Export Helpers
+NDJSON / CSV responses generated row by row from a server-side cursor
+"""
+
+import csv
+import io
+import json
+
+from flask import Response, request, jsonify, stream_with_context
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Rows fetched per cursor round trip and serialized per yielded chunk
+EXPORT_BATCH_SIZE = 1000
+
+
+def _ndjson_chunks(rows, serialize):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(serialize(row), default=str))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def _csv_chunks(rows, serialize):
+    buffer = io.StringIO()
+    writer = None
+    pending = 0
+    for row in rows:
+        item = serialize(row)
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(item))
+            writer.writeheader()
+        writer.writerow(item)
+        pending += 1
+        if pending >= EXPORT_BATCH_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_export(query, serialize, filename):
+    """Stream ``query`` as ``?format=ndjson`` (default) or ``?format=csv``
+
+    Rows are pulled with ``yield_per`` so only one batch is materialized at
+    a time, and the generator runs inside the request context so the
+    session stays usable while the response is being sent.
+    """
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"Invalid format '{fmt}'. Allowed: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    chunks = _csv_chunks if fmt == 'csv' else _ndjson_chunks
+    rows = query.yield_per(EXPORT_BATCH_SIZE)
+
+    return Response(
+        stream_with_context(chunks(rows, serialize)),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename={filename}.{fmt}'}
+    )
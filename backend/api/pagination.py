@@ -0,0 +1,119 @@
+"""
+List Endpoint Helpers
+Keyset pagination, sparse fieldsets and whitelisted sorting for list routes
+"""
+
+import base64
+import json
+from datetime import date, datetime
+
+from flask import request, jsonify
+from sqlalchemy import and_, or_
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+
+def _encode_cursor(value, row_id):
+    """Encode the sort value and id of the last row as an opaque token"""
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(token, column):
+    """Decode a cursor token back into (sort value, id)"""
+    try:
+        value, row_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+        python_type = column.type.python_type
+        if value is not None and python_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif value is not None and python_type is date:
+            value = date.fromisoformat(value)
+        return value, int(row_id)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+
+def _parse_list_args(sort_keys, fields):
+    """Validate ?sort=, ?fields=, ?limit= and ?cursor= against the whitelists"""
+    sort = request.args.get('sort', 'created_at')
+    descending = sort.startswith('-')
+    sort_name = sort.lstrip('-')
+    if sort_name not in sort_keys:
+        raise ValueError(f"Invalid sort key '{sort_name}'. Allowed: {', '.join(sort_keys)}")
+
+    selected = None
+    if request.args.get('fields'):
+        selected = [f.strip() for f in request.args['fields'].split(',') if f.strip()] or None
+        unknown = [f for f in selected or () if f not in fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    limit = None
+    cursor = request.args.get('cursor')
+    if 'limit' in request.args or cursor:
+        try:
+            limit = int(request.args.get('limit', DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            raise ValueError('limit must be an integer')
+        limit = max(1, min(limit, MAX_LIMIT))
+
+    if cursor:
+        cursor = _decode_cursor(cursor, sort_keys[sort_name])
+
+    return sort_name, descending, selected, limit, cursor
+
+
+def list_response(query, model, sort_keys, fields, prepare=None, serialize=None):
+    """Build the JSON response for a list route
+
+    ``sort_keys`` maps whitelisted ``?sort=`` names to columns (prefix with
+    ``-`` for descending); ties are broken on ``model.id`` so (sort column,
+    id) is the keyset. ``fields`` lists the keys allowed in ``?fields=``.
+    ``prepare(query, fields)`` may add columns to the query (e.g. joined
+    aggregates) and ``serialize(row, fields)`` turns one result row into a
+    dict (defaults to ``to_dict(fields)``). Both receive the ``?fields=``
+    selection (None when absent) so they can skip values nobody asked for.
+
+    Without ``?limit=``/``?cursor=`` the response stays a plain JSON array;
+    with them it becomes ``{'items': [...], 'next_cursor': token|null}``.
+    """
+    try:
+        sort_name, descending, selected, limit, cursor = _parse_list_args(sort_keys, fields)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    column = sort_keys[sort_name]
+    if prepare:
+        query = prepare(query, selected)
+
+    if cursor:
+        value, last_id = cursor
+        if descending:
+            query = query.filter(or_(column < value, and_(column == value, model.id < last_id)))
+        else:
+            query = query.filter(or_(column > value, and_(column == value, model.id > last_id)))
+
+    if descending:
+        query = query.order_by(column.desc(), model.id.desc())
+    else:
+        query = query.order_by(column.asc(), model.id.asc())
+
+    if limit:
+        query = query.limit(limit + 1)
+    rows = query.all()
+
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1] if isinstance(rows[-1], model) else rows[-1][0]
+        next_cursor = _encode_cursor(getattr(last, column.key), last.id)
+
+    serialize = serialize or (lambda row, fields: row.to_dict(fields))
+    items = [serialize(row, selected) for row in rows]
+
+    if limit:
+        return jsonify({'items': items, 'next_cursor': next_cursor}), 200
+    return jsonify(items), 200
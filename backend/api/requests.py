@@ -5,40 +5,135 @@ Endpoints for maintenance request management
 
 from flask import Blueprint, request, jsonify
 from database import db
-from models import MaintenanceRequest, Equipment, ActivityLog
+from cache import invalidate_dashboard_cache
+from models import MaintenanceRequest, RequestView, Equipment, ActivityLog
+from api.pagination import list_response
+from api.conditional import conditional
+from api.export import stream_export
+from api.bulk import bulk_items, batch_size, chunked, int_field, insert_rows, item_error, bulk_response
+from sqlalchemy import insert
+import counters
+import changes
+import sync
+import read_model
+from collections import Counter
 from datetime import datetime
+from types import SimpleNamespace
 
 requests_bp = Blueprint('requests', __name__)
 
+# Whitelisted ?sort= keys and ?fields= names for the list routes, which
+# read the request_view read model (see read_model.py)
+SORT_KEYS = {
+    'created_at': RequestView.created_at,
+    'scheduled_date': RequestView.scheduled_date,
+    'subject': RequestView.subject,
+    'stage': RequestView.stage,
+    'priority': RequestView.priority,
+}
+LIST_FIELDS = MaintenanceRequest.__table__.columns.keys() + [
+    'equipment_name', 'equipment_serial', 'team_name', 'is_overdue'
+]
+
+# Fields a PUT / bulk PATCH may change directly
+UPDATABLE_FIELDS = ('subject', 'stage', 'assigned_technician', 'priority',
+                    'description', 'duration_hours')
+
+def request_list_response(query):
+    return list_response(query, RequestView, SORT_KEYS, LIST_FIELDS)
+
+def filtered_requests_query():
+    """request_view query narrowed by the optional stage/type/team_id filters"""
+    stage = request.args.get('stage')
+    request_type = request.args.get('type')
+    team_id = request.args.get('team_id')
+    
+    query = RequestView.query
+    
+    if stage:
+        query = query.filter_by(stage=stage)
+    if request_type:
+        query = query.filter_by(request_type=request_type)
+    if team_id:
+        query = query.filter_by(team_id=int(team_id))
+    
+    return query
+
+def request_row(data, equipment):
+    """Column values for a new request, team and department auto-filled from equipment"""
+    return {
+        'subject': data['subject'],
+        'equipment_id': equipment.id,
+        'request_type': data['request_type'],
+        'scheduled_date': datetime.strptime(data['scheduled_date'], '%Y-%m-%d').date(),
+        'duration_hours': data.get('duration_hours', 1.0),
+        'stage': data.get('stage', 'New'),
+        'assigned_technician': data.get('assigned_technician'),
+        'team_id': equipment.team_id,
+        'department': equipment.department,
+        'priority': data.get('priority', 'Medium'),
+        'description': data.get('description')
+    }
+
+def apply_request_update(req, data, deltas):
+    """Apply an update payload to ``req``, adding its counter changes to ``deltas``
+
+    Returns the activity-log rows the change produced.
+    """
+    old_stage = req.stage
+    deltas.subtract(counters.request_keys(req))
+    
+    for field in UPDATABLE_FIELDS:
+        if field in data:
+            setattr(req, field, data[field])
+    
+    # If stage changed to Repaired, set completed_at
+    if req.stage == 'Repaired' and old_stage != 'Repaired':
+        req.completed_at = datetime.utcnow()
+    
+    # If stage changed to Scrap, mark equipment as Scrapped
+    logs = []
+    equipment = req.equipment if req.stage == 'Scrap' and old_stage != 'Scrap' else None
+    if equipment:
+        deltas.subtract(counters.equipment_keys(equipment))
+        equipment.status = 'Scrapped'
+        deltas.update(counters.equipment_keys(equipment))
+        logs.append({
+            'equipment_id': equipment.id,
+            'request_id': req.id,
+            'action': 'Equipment Scrapped',
+            'details': f"Equipment '{equipment.name}' marked as scrapped due to request #{req.id}"
+        })
+    
+    deltas.update(counters.request_keys(req))
+    return logs
+
 @requests_bp.route('/', methods=['GET'])
+@conditional(RequestView, daily=True)
 def get_all_requests():
     """Get all maintenance requests"""
     try:
-        # Optional filters
-        stage = request.args.get('stage')
-        request_type = request.args.get('type')
-        team_id = request.args.get('team_id')
-        
-        query = MaintenanceRequest.query
-        
-        if stage:
-            query = query.filter_by(stage=stage)
-        if request_type:
-            query = query.filter_by(request_type=request_type)
-        if team_id:
-            query = query.filter_by(team_id=int(team_id))
-        
-        requests = query.all()
-        return jsonify([req.to_dict() for req in requests]), 200
+        return request_list_response(filtered_requests_query())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@requests_bp.route('/export', methods=['GET'])
+@conditional(RequestView, daily=True)
+def export_requests():
+    """Stream every (filtered) maintenance request as NDJSON or CSV"""
+    try:
+        query = filtered_requests_query().order_by(RequestView.id)
+        return stream_export(query, RequestView.to_dict, 'maintenance_requests')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @requests_bp.route('/<int:request_id>', methods=['GET'])
+@conditional(RequestView, daily=True)
 def get_request(request_id):
     """Get single request by ID"""
     try:
-        req = MaintenanceRequest.query.get_or_404(request_id)
-        return jsonify(req.to_dict()), 200
+        view = RequestView.query.get_or_404(request_id)
+        return jsonify(view.to_dict()), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 404
 
@@ -53,25 +148,10 @@ def create_request():
         if not equipment:
             return jsonify({'error': 'Equipment not found'}), 404
         
-        # Convert date string to date object
-        scheduled_date = datetime.strptime(data['scheduled_date'], '%Y-%m-%d').date()
-        
-        req = MaintenanceRequest(
-            subject=data['subject'],
-            equipment_id=data['equipment_id'],
-            request_type=data['request_type'],
-            scheduled_date=scheduled_date,
-            duration_hours=data.get('duration_hours', 1.0),
-            stage=data.get('stage', 'New'),
-            assigned_technician=data.get('assigned_technician'),
-            team_id=equipment.team_id,  # Auto-fill from equipment
-            department=equipment.department,  # Auto-fill from equipment
-            priority=data.get('priority', 'Medium'),
-            description=data.get('description')
-        )
+        req = MaintenanceRequest(**request_row(data, equipment))
         
         db.session.add(req)
-        db.session.commit()
+        db.session.flush()
         
         # Log activity
         log = ActivityLog(
@@ -81,9 +161,12 @@ def create_request():
             details=f"Request '{req.subject}' created for {equipment.name}"
         )
         db.session.add(log)
+        counters.track(after=counters.request_keys(req))
+        read_model.refresh_requests([req.id])
         db.session.commit()
+        invalidate_dashboard_cache()
         
-        return jsonify(req.to_dict()), 201
+        return jsonify(db.session.get(RequestView, req.id).to_dict()), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
@@ -95,53 +178,152 @@ def update_request(request_id):
         req = MaintenanceRequest.query.get_or_404(request_id)
         data = request.get_json()
         
-        old_stage = req.stage
-        
-        # Update fields
-        if 'subject' in data:
-            req.subject = data['subject']
-        if 'stage' in data:
-            req.stage = data['stage']
-        if 'assigned_technician' in data:
-            req.assigned_technician = data['assigned_technician']
-        if 'priority' in data:
-            req.priority = data['priority']
-        if 'description' in data:
-            req.description = data['description']
-        if 'duration_hours' in data:
-            req.duration_hours = data['duration_hours']
-        
-        # If stage changed to Repaired, set completed_at
-        if req.stage == 'Repaired' and old_stage != 'Repaired':
-            req.completed_at = datetime.utcnow()
-        
-        # If stage changed to Scrap, mark equipment as Scrapped
-        if req.stage == 'Scrap' and old_stage != 'Scrap':
-            equipment = Equipment.query.get(req.equipment_id)
-            if equipment:
-                equipment.status = 'Scrapped'
-                log = ActivityLog(
-                    equipment_id=equipment.id,
-                    request_id=req.id,
-                    action='Equipment Scrapped',
-                    details=f"Equipment '{equipment.name}' marked as scrapped due to request #{req.id}"
-                )
-                db.session.add(log)
+        deltas = Counter()
+        for log in apply_request_update(req, data, deltas):
+            db.session.add(ActivityLog(**log))
         
+        counters.apply_deltas(deltas)
+        read_model.refresh_requests([request_id])
         db.session.commit()
+        invalidate_dashboard_cache()
         
-        return jsonify(req.to_dict()), 200
+        return jsonify(db.session.get(RequestView, request_id).to_dict()), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
 
+@requests_bp.route('/bulk', methods=['POST'])
+def bulk_create_requests():
+    """Create many requests, committing once per batch"""
+    try:
+        items = bulk_items()
+        size = batch_size()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # One IN query for every referenced equipment
+    equipment_ids = {int_field(item, 'equipment_id') for item in items} - {None}
+    # Plain copies: each batch's commit expires ORM rows, which would then reload one by one
+    equipment_by_id = {
+        eq.id: SimpleNamespace(id=eq.id, team_id=eq.team_id, department=eq.department, name=eq.name)
+        for eq in Equipment.query.filter(Equipment.id.in_(equipment_ids))
+    }
+    
+    results = [None] * len(items)
+    for batch in chunked(enumerate(items), size):
+        rows, indexes = [], []
+        for index, data in batch:
+            try:
+                equipment = equipment_by_id.get(int_field(data, 'equipment_id'))
+                if not equipment:
+                    raise LookupError('Equipment not found')
+                rows.append(request_row(data, equipment))
+                indexes.append(index)
+            except (AttributeError, KeyError, LookupError, TypeError, ValueError) as e:
+                results[index] = item_error(index, e)
+        if not rows:
+            continue
+        
+        try:
+            ids = insert_rows(MaintenanceRequest, sync.stamp_rows(rows))
+            db.session.execute(insert(ActivityLog), [{
+                'request_id': request_id,
+                'equipment_id': row['equipment_id'],
+                'action': 'Request Created',
+                'details': f"Request '{row['subject']}' created for {equipment_by_id[row['equipment_id']].name}"
+            } for request_id, row in zip(ids, rows)])
+            changes.record_rows(MaintenanceRequest, ids, rows)
+            read_model.refresh_requests(ids)
+            deltas = Counter()
+            for row in rows:
+                deltas.update(counters.request_keys(SimpleNamespace(**row)))
+            counters.apply_deltas(deltas)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            for index in indexes:
+                results[index] = item_error(index, e)
+            continue
+        
+        for index, request_id in zip(indexes, ids):
+            results[index] = {'index': index, 'id': request_id}
+    
+    invalidate_dashboard_cache()
+    return bulk_response(results)
+
+def prefetch_batch_requests(items):
+    """Load a batch's requests, and the equipment of those being scrapped, with one IN query each
+
+    req.equipment then resolves from the session's identity map. Loading per
+    batch matters because each commit expires everything loaded before it.
+    """
+    request_ids = {item.get('id') for item in items
+                   if isinstance(item, dict) and isinstance(item.get('id'), int)}
+    requests_by_id = {req.id: req for req in
+                      MaintenanceRequest.query.filter(MaintenanceRequest.id.in_(request_ids))}
+    scrap_ids = {item['id'] for item in items if isinstance(item, dict)
+                 and item.get('stage') == 'Scrap' and item.get('id') in request_ids}
+    scrap_equipment_ids = {req.equipment_id for req_id, req in requests_by_id.items()
+                           if req_id in scrap_ids}
+    if scrap_equipment_ids:
+        Equipment.query.filter(Equipment.id.in_(scrap_equipment_ids)).all()
+    return requests_by_id
+
+@requests_bp.route('/bulk', methods=['PATCH'])
+def bulk_update_requests():
+    """Update many requests by id, committing once per batch"""
+    try:
+        items = bulk_items()
+        size = batch_size()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    results = [None] * len(items)
+    for batch in chunked(enumerate(items), size):
+        requests_by_id = prefetch_batch_requests([data for _, data in batch])
+        deltas = Counter()
+        logs, indexes = [], []
+        for index, data in batch:
+            try:
+                req = requests_by_id.get(data.get('id'))
+                if not req:
+                    raise LookupError('Request not found')
+                logs.extend(apply_request_update(req, data, deltas))
+                indexes.append(index)
+            except (AttributeError, LookupError, TypeError, ValueError) as e:
+                results[index] = item_error(index, e)
+        if not indexes:
+            continue
+        
+        try:
+            db.session.flush()
+            if logs:
+                db.session.execute(insert(ActivityLog), logs)
+            counters.apply_deltas(deltas)
+            read_model.refresh_requests([items[index]['id'] for index in indexes])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            for index in indexes:
+                results[index] = item_error(index, e)
+            continue
+        
+        for index in indexes:
+            results[index] = {'index': index, 'id': items[index]['id']}
+    
+    invalidate_dashboard_cache()
+    return bulk_response(results)
+
 @requests_bp.route('/<int:request_id>', methods=['DELETE'])
 def delete_request(request_id):
     """Delete maintenance request"""
     try:
         req = MaintenanceRequest.query.get_or_404(request_id)
+        counters.track(before=counters.request_keys(req))
         db.session.delete(req)
+        read_model.remove_requests([request_id])
         db.session.commit()
+        invalidate_dashboard_cache()
         
         return jsonify({'message': 'Request deleted successfully'}), 200
     except Exception as e:
@@ -149,28 +331,39 @@ def delete_request(request_id):
         return jsonify({'error': str(e)}), 400
 
 @requests_bp.route('/by-equipment/<int:equipment_id>', methods=['GET'])
+@conditional(RequestView, daily=True)
 def get_requests_by_equipment(equipment_id):
     """Get requests for specific equipment"""
     try:
-        requests = MaintenanceRequest.query.filter_by(equipment_id=equipment_id).all()
-        return jsonify([req.to_dict() for req in requests]), 200
+        return request_list_response(RequestView.query.filter_by(equipment_id=equipment_id))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @requests_bp.route('/by-stage/<string:stage>', methods=['GET'])
+@conditional(RequestView, daily=True)
 def get_requests_by_stage(stage):
     """Get requests by stage"""
     try:
-        requests = MaintenanceRequest.query.filter_by(stage=stage).all()
-        return jsonify([req.to_dict() for req in requests]), 200
+        return request_list_response(RequestView.query.filter_by(stage=stage))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @requests_bp.route('/preventive', methods=['GET'])
+@conditional(RequestView, daily=True)
 def get_preventive_requests():
-    """Get all preventive maintenance requests"""
+    """Get preventive maintenance requests, optionally scheduled within ?start= / ?end="""
+    try:
+        query = RequestView.query.filter_by(request_type='Preventive')
+        if request.args.get('start'):
+            start = datetime.strptime(request.args['start'], '%Y-%m-%d').date()
+            query = query.filter(RequestView.scheduled_date >= start)
+        if request.args.get('end'):
+            end = datetime.strptime(request.args['end'], '%Y-%m-%d').date()
+            query = query.filter(RequestView.scheduled_date <= end)
+    except ValueError:
+        return jsonify({'error': 'start and end must be YYYY-MM-DD dates'}), 400
+    
     try:
-        requests = MaintenanceRequest.query.filter_by(request_type='Preventive').all()
-        return jsonify([req.to_dict() for req in requests]), 200
+        return request_list_response(query)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
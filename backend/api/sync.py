@@ -0,0 +1,63 @@
+"""
+Sync API Blueprint
+Rows changed and deleted since a client's last sync version
+"""
+
+from flask import Blueprint, request, jsonify
+from models import Team, Equipment, MaintenanceRequest, Tombstone
+import sync
+
+sync_bp = Blueprint('sync', __name__)
+
+
+def changed_rows(model, since, upto):
+    """Serialized rows of ``model`` written in (since, upto]; every row when since is 0"""
+    query = model.query.filter(model.row_version <= upto)
+    if since:
+        query = query.filter(model.row_version > since)
+    query = query.order_by(model.row_version, model.id)
+
+    if model in (MaintenanceRequest, Equipment, Team):
+        return [model.serialize_row(row) for row in model.list_query(query)]
+    return [row.to_dict() for row in query]
+
+
+@sync_bp.route('/', methods=['GET'])
+def get_changes_since():
+    """Changed rows and deleted ids per entity since ?since=<version>
+
+    Clients store the returned ``version`` and pass it back as ``since``
+    next time; ``since`` 0 (or missing) returns a full snapshot. Rows
+    written while the response is built carry higher versions and arrive
+    with the next sync.
+    """
+    try:
+        since = int(request.args.get('since', 0))
+        if since < 0:
+            raise ValueError
+    except ValueError:
+        return jsonify({'error': 'since must be a non-negative integer version'}), 400
+
+    try:
+        upto = sync.current_version()
+        changed = {name: changed_rows(model, since, upto) for model, name in sync.SYNCED.items()}
+
+        deleted = {name: [] for name in sync.SYNCED.values()}
+        if since:
+            for tombstone in Tombstone.query.filter(
+                Tombstone.row_version > since, Tombstone.row_version <= upto
+            ).order_by(Tombstone.row_version):
+                deleted[tombstone.entity].append(tombstone.entity_id)
+            # An id deleted and then reused by a new row is reported as changed only
+            for name, ids in deleted.items():
+                alive = {row['id'] for row in changed[name]}
+                deleted[name] = [entity_id for entity_id in ids if entity_id not in alive]
+
+        return jsonify({
+            'version': upto,
+            'since': since,
+            'changed': changed,
+            'deleted': deleted
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
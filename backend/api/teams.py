@@ -5,27 +5,44 @@ Endpoints for team and team member management
 
 from flask import Blueprint, request, jsonify
 from database import db
-from models import Team, TeamMember
+from cache import invalidate_dashboard_cache
+from models import Team, TeamMember, Equipment, MaintenanceRequest
+from api.pagination import list_response
+from api.conditional import conditional
+import counters
+import read_model
+import sync
 
 teams_bp = Blueprint('teams', __name__)
 
+# Whitelisted ?sort= keys and ?fields= names for the list routes
+TEAM_SORT_KEYS = {'created_at': Team.created_at, 'name': Team.name}
+TEAM_FIELDS = Team.__table__.columns.keys() + ['member_count', 'equipment_count']
+MEMBER_SORT_KEYS = {'created_at': TeamMember.created_at, 'name': TeamMember.name}
+MEMBER_FIELDS = TeamMember.__table__.columns.keys() + ['team_name']
+# Tables the GET routes read, whose versions make up their ETags
+TEAM_TABLES = (Team, TeamMember, Equipment)
+MEMBER_TABLES = (TeamMember, Team)
+
 # ============ TEAMS ============
 
 @teams_bp.route('/', methods=['GET'])
+@conditional(*TEAM_TABLES)
 def get_all_teams():
     """Get all teams"""
     try:
-        teams = Team.query.all()
-        return jsonify([team.to_dict() for team in teams]), 200
+        return list_response(Team.query, Team, TEAM_SORT_KEYS, TEAM_FIELDS,
+                             prepare=Team.list_query, serialize=Team.serialize_row)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @teams_bp.route('/<int:team_id>', methods=['GET'])
+@conditional(*TEAM_TABLES)
 def get_team(team_id):
     """Get single team by ID"""
     try:
-        team = Team.query.get_or_404(team_id)
-        return jsonify(team.to_dict()), 200
+        row = Team.list_query(Team.query.filter(Team.id == team_id)).first_or_404()
+        return jsonify(Team.serialize_row(row)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 404
 
@@ -41,9 +58,33 @@ def create_team():
         )
         
         db.session.add(team)
+        counters.track(after=counters.team_keys(team))
+        db.session.commit()
+        invalidate_dashboard_cache()
+        
+        return jsonify(team.serialize(member_count=0, equipment_count=0)), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+
+@teams_bp.route('/<int:team_id>', methods=['PUT'])
+def update_team(team_id):
+    """Update team name / description"""
+    try:
+        team = Team.query.get_or_404(team_id)
+        data = request.get_json()
+        
+        if 'description' in data:
+            team.description = data['description']
+        if 'name' in data:
+            team.name = data['name']
+            read_model.refresh_team(team_id)
+        
         db.session.commit()
+        invalidate_dashboard_cache()
         
-        return jsonify(team.to_dict()), 201
+        row = Team.list_query(Team.query.filter(Team.id == team_id)).one()
+        return jsonify(Team.serialize_row(row)), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
@@ -53,8 +94,16 @@ def delete_team(team_id):
     """Delete team"""
     try:
         team = Team.query.get_or_404(team_id)
+        counters.track(before=counters.team_keys(team))
+        counters.drop_team(team_id)
+        request_ids = read_model.request_ids(MaintenanceRequest.team_id, team_id)
+        # The flush nulls their team_id without passing through sync's hooks
+        sync.stamp_where(Equipment, Equipment.team_id == team_id)
+        sync.stamp_where(MaintenanceRequest, MaintenanceRequest.team_id == team_id)
         db.session.delete(team)
+        read_model.refresh_requests(request_ids)
         db.session.commit()
+        invalidate_dashboard_cache()
         
         return jsonify({'message': 'Team deleted successfully'}), 200
     except Exception as e:
@@ -64,20 +113,21 @@ def delete_team(team_id):
 # ============ TEAM MEMBERS ============
 
 @teams_bp.route('/members', methods=['GET'])
+@conditional(*MEMBER_TABLES)
 def get_all_members():
     """Get all team members"""
     try:
-        members = TeamMember.query.all()
-        return jsonify([member.to_dict() for member in members]), 200
+        return list_response(TeamMember.query, TeamMember, MEMBER_SORT_KEYS, MEMBER_FIELDS)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @teams_bp.route('/<int:team_id>/members', methods=['GET'])
+@conditional(*MEMBER_TABLES)
 def get_team_members(team_id):
     """Get members of a specific team"""
     try:
-        members = TeamMember.query.filter_by(team_id=team_id).all()
-        return jsonify([member.to_dict() for member in members]), 200
+        query = TeamMember.query.filter_by(team_id=team_id)
+        return list_response(query, TeamMember, MEMBER_SORT_KEYS, MEMBER_FIELDS)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -5,12 +5,17 @@ Main application entry point
 
 from flask import Flask
 from flask_cors import CORS
-from database import db
+from database import db, configure_sqlite
+from json_provider import provider_class
 from datetime import datetime, date
 import os
 
-def create_app():
-    """Application factory pattern"""
+def create_app(config=None):
+    """Application factory pattern
+    
+    ``config`` overrides the defaults below (e.g. a different database URI
+    for tests or benchmarks).
+    """
     app = Flask(__name__)
     
     # Configuration
@@ -18,6 +23,24 @@ def create_app():
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['SECRET_KEY'] = 'your-secret-key-change-in-production'
     app.config['JSON_SORT_KEYS'] = False
+    app.config['JSON_PROVIDER'] = 'auto'  # 'orjson' when installed, else 'stdlib'
+    app.config['DASHBOARD_CACHE_TTL'] = 5  # seconds; 0 disables the dashboard cache
+    app.config['SQLITE_BUSY_TIMEOUT_MS'] = 5000
+    app.config['SEED_DATABASE'] = True
+    app.config['PREPARE_DATABASE'] = True  # run prepare_database() from create_app
+    app.config['BULK_BATCH_SIZE'] = 500  # rows per transaction for the bulk endpoints
+    app.config['CHANGE_FEED_POLL_SECONDS'] = 1.0  # how soon streams see other workers' writes
+    app.config['CHANGE_FEED_KEEPALIVE_SECONDS'] = 15
+    app.config['CHANGE_FEED_STREAM_SECONDS'] = 300  # streams then end and the client reconnects
+    app.config['CHANGE_FEED_RETENTION_HOURS'] = 24  # older events are pruned; 0 keeps them all
+    app.config['GZIP_MIN_BYTES'] = 1024  # smaller responses are sent uncompressed
+    app.config['GZIP_LEVEL'] = 6
+    if config:
+        app.config.update(config)
+    
+    # jsonify() encoder (see json_provider.py)
+    app.json = provider_class(app.config['JSON_PROVIDER'])(app)
+    app.json.sort_keys = app.config['JSON_SORT_KEYS']
     
     # Initialize extensions
     db.init_app(app)
@@ -25,14 +48,24 @@ def create_app():
     
     # Import models and routes (after app creation)
     with app.app_context():
+        configure_sqlite(db.engine, app.config['SQLITE_BUSY_TIMEOUT_MS'])
+        
         from models import Team, TeamMember, Equipment, MaintenanceRequest, ActivityLog
-        from api import equipment_bp, requests_bp, teams_bp, dashboard_bp
+        import changes  # noqa: F401 - registers the change feed's session hooks
+        import sync
+        import table_versions
+        table_versions.track_writes(db.engine)
+        from api import equipment_bp, requests_bp, teams_bp, dashboard_bp, changes_bp, sync_bp
+        from api.conditional import gzip_response
 
         # Register blueprints
         app.register_blueprint(equipment_bp, url_prefix='/api/equipment')
         app.register_blueprint(requests_bp, url_prefix='/api/requests')
         app.register_blueprint(teams_bp, url_prefix='/api/teams')
         app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
+        app.register_blueprint(changes_bp, url_prefix='/api/changes')
+        app.register_blueprint(sync_bp, url_prefix='/api/sync')
+        app.after_request(gzip_response)
         
         @app.route('/api/health', methods=['GET'])
         def health_check():
@@ -49,15 +82,45 @@ def create_app():
                     'equipment': '/api/equipment',
                     'requests': '/api/requests',
                     'teams': '/api/teams',
-                    'dashboard': '/api/dashboard'
+                    'dashboard': '/api/dashboard',
+                    'changes': '/api/changes',
+                    'sync': '/api/sync'
                 }
             }
         
+        # Schema, seed data and derived tables (production runs this once, before the workers)
+        if app.config['PREPARE_DATABASE']:
+            prepare_database(app)
+    
+    return app
+
+def prepare_database(app):
+    """Create and migrate the schema, seed demo data and build the derived tables
+    
+    create_app runs this unless PREPARE_DATABASE is off. Multi-worker
+    servers turn it off and call it once before their workers start
+    (see wsgi.prepare), so workers don't race through the DDL and rebuilds.
+    """
+    from models import Team, TeamMember, Equipment, MaintenanceRequest
+    import sync
+    import counters
+    import read_model
+    
+    with app.app_context():
         # Initialize database
         db.create_all()
         
-        # Check if data already exists
-        if Team.query.count() == 0 and Equipment.query.count() == 0:
+        # Bring columns and indexes on databases created before they were declared up to date
+        from migrate import apply_columns, apply_indexes
+        apply_columns(db.engine)
+        apply_indexes(db.engine)
+        
+        # Row-version counter for /api/sync (needed before the first write)
+        sync.ensure_state()
+        
+        # Seed demo data into an empty database (SEED_DATABASE is off in production)
+        seeding = app.config['SEED_DATABASE']
+        if seeding and Team.query.count() == 0 and Equipment.query.count() == 0:
             # Seed teams
             teams_data = [
                 Team(name='Mechanics', description='Mechanical equipment maintenance'),
@@ -191,10 +254,14 @@ def create_app():
             db.session.commit()
             
             print("Database initialized with seed data")
-        else:
+        elif seeding:
             print("Database already initialized")
-    
-    return app
+        
+        # Materialized dashboard counters (built once, then maintained by writes)
+        counters.ensure_built()
+        
+        # Request read model (rebuilt if it has drifted from maintenance_requests)
+        read_model.ensure_built()
 
 if __name__ == '__main__':
     app = create_app()
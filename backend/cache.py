@@ -0,0 +1,49 @@
+"""
+In-process TTL cache
+Used to serve hot read endpoints (dashboard aggregates) between writes
+"""
+
+import threading
+import time
+
+
+class TTLCache:
+    """Thread-safe key/value cache whose entries expire after ``ttl`` seconds"""
+    
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def get_or_set(self, key, ttl, compute):
+        """Return the cached value for ``key`` or compute and store it
+        
+        A ``ttl`` of 0 (or less) disables caching and always computes.
+        """
+        if ttl <= 0:
+            return compute()
+        
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+        
+        value = compute()
+        with self._lock:
+            # Drop expired entries so keys that change (e.g. per data version) don't pile up
+            for stale in [k for k, entry in self._entries.items() if entry[0] <= now]:
+                del self._entries[stale]
+            self._entries[key] = (now + ttl, value)
+        return value
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Dashboard aggregates; cleared by every write in the data blueprints
+dashboard_cache = TTLCache()
+
+
+def invalidate_dashboard_cache():
+    dashboard_cache.clear()
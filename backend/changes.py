@@ -0,0 +1,137 @@
+"""
+Change Feed
+Compact per-row deltas for requests, equipment, teams and members
+
+ORM writes are captured by an ``after_flush`` hook, which appends one
+``change_events`` row per created, updated or deleted object in the same
+transaction as the write; Core bulk inserts call ``record_rows``. SQLite
+serializes writers, so sequence numbers become visible in commit order
+and a reader that asks for ``seq > last`` never skips an event.
+
+Events older than CHANGE_FEED_RETENTION_HOURS are deleted by the writes
+that add new ones, at most once per PRUNE_INTERVAL_SECONDS per process,
+so the table stays bounded without a separate cleanup job. A client
+resuming from further back than that has to reload its data.
+"""
+
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import event, insert, inspect, select, func, delete
+
+from database import db
+from models import Team, TeamMember, Equipment, MaintenanceRequest, ChangeEvent
+
+ENTITIES = {
+    MaintenanceRequest: 'request',
+    Equipment: 'equipment',
+    Team: 'team',
+    TeamMember: 'member',
+}
+
+PRUNE_INTERVAL_SECONDS = 60
+
+# Wakes streams in this process as soon as a change commits; streams in
+# other worker processes pick it up on their next poll
+_committed = threading.Condition()
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def row_data(model, row):
+    """JSON for a full row given as a mapping of column values"""
+    return json.dumps({key: _json_value(row.get(key)) for key in model.__table__.columns.keys()})
+
+
+def changed_data(obj):
+    """JSON of the columns of ``obj`` modified since it was loaded"""
+    state = inspect(obj)
+    changed = {attr.key: _json_value(getattr(obj, attr.key)) for attr in state.mapper.column_attrs
+               if state.attrs[attr.key].history.has_changes()}
+    return json.dumps(changed) if changed else None
+
+
+_next_prune = 0.0
+
+
+def prune(connection):
+    """Delete events past the retention window, if this process has not done so lately"""
+    global _next_prune
+    hours = current_app.config['CHANGE_FEED_RETENTION_HOURS']
+    now = time.monotonic()
+    if not hours or now < _next_prune:
+        return
+    _next_prune = now + PRUNE_INTERVAL_SECONDS
+    cutoff = datetime.utcnow() - timedelta(hours=hours)
+    connection.execute(delete(ChangeEvent.__table__).where(ChangeEvent.created_at < cutoff))
+
+
+def record_rows(model, ids, rows):
+    """Record 'created' events for rows written with a Core insert"""
+    db.session.execute(insert(ChangeEvent.__table__), [
+        {'entity': ENTITIES[model], 'entity_id': row_id, 'op': 'created', 'data': row_data(model, {**row, 'id': row_id})}
+        for row_id, row in zip(ids, rows)
+    ])
+    prune(db.session.connection())
+    db.session.info['changes_pending'] = True
+
+
+@event.listens_for(db.session, 'after_flush')
+def capture_flush(session, flush_context):
+    """Turn the flushed ORM objects into change_events rows"""
+    events = []
+    for obj in session.new:
+        entity = ENTITIES.get(type(obj))
+        if entity:
+            row = {key: getattr(obj, key) for key in obj.__table__.columns.keys()}
+            events.append({'entity': entity, 'entity_id': obj.id, 'op': 'created',
+                           'data': row_data(type(obj), row)})
+    for obj in session.dirty:
+        entity = ENTITIES.get(type(obj))
+        if entity and session.is_modified(obj, include_collections=False):
+            data = changed_data(obj)
+            if data:
+                events.append({'entity': entity, 'entity_id': obj.id, 'op': 'updated', 'data': data})
+    for obj in session.deleted:
+        entity = ENTITIES.get(type(obj))
+        if entity:
+            events.append({'entity': entity, 'entity_id': obj.id, 'op': 'deleted', 'data': None})
+
+    if events:
+        session.connection().execute(insert(ChangeEvent.__table__), events)
+        prune(session.connection())
+        session.info['changes_pending'] = True
+
+
+@event.listens_for(db.session, 'after_commit')
+def notify_streams(session):
+    if session.info.pop('changes_pending', False):
+        with _committed:
+            _committed.notify_all()
+
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_pending(session):
+    session.info.pop('changes_pending', None)
+
+
+def wait_for_commit(timeout):
+    """Block until a change commits in this process or ``timeout`` seconds pass"""
+    with _committed:
+        _committed.wait(timeout)
+
+
+def latest_seq():
+    return db.session.scalar(select(func.max(ChangeEvent.id))) or 0
+
+
+def events_since(seq, limit):
+    """Up to ``limit`` events after sequence number ``seq``, oldest first"""
+    return [change.to_dict() for change in ChangeEvent.query.filter(
+        ChangeEvent.id > seq
+    ).order_by(ChangeEvent.id).limit(limit)]
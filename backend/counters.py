@@ -0,0 +1,178 @@
+"""
+Dashboard Counters
+Incrementally maintained aggregates backing the dashboard endpoints
+
+Write endpoints call ``track`` with the counter keys a row contributed
+before and after the change; the difference is upserted into
+``dashboard_counters`` in the same session, so it commits (or rolls back)
+together with the write itself.
+"""
+
+from collections import Counter
+
+from sqlalchemy import func, case, and_, or_, cast, String
+from sqlalchemy.dialects.sqlite import insert
+
+from database import db
+from models import (Team, Equipment, MaintenanceRequest, DashboardCounter,
+                    CLOSED_STAGES)
+
+OPEN_REQUESTS = 'open_requests'
+CRITICAL_OPEN = 'critical_open'
+OPEN_BY_DATE = 'open_by_date'          # keyed by scheduled date; overdue = keys < today
+TEAM_REQUESTS = 'team_requests'        # keyed by team id (all stages)
+USABLE_EQUIPMENT = 'usable_equipment'
+EQUIPMENT_CATEGORY = 'equipment_category'  # keyed by category
+TEAMS = 'teams'
+
+
+def request_keys(req):
+    """Counter keys a maintenance request currently contributes to"""
+    keys = []
+    if req.team_id is not None:
+        keys.append((TEAM_REQUESTS, str(req.team_id)))
+    if req.stage not in CLOSED_STAGES:
+        keys.append((OPEN_REQUESTS, ''))
+        if req.scheduled_date:
+            keys.append((OPEN_BY_DATE, req.scheduled_date.isoformat()))
+        if req.priority == 'Critical':
+            keys.append((CRITICAL_OPEN, ''))
+    return keys
+
+
+def equipment_keys(equipment):
+    """Counter keys an equipment row currently contributes to"""
+    keys = [(EQUIPMENT_CATEGORY, equipment.category)]
+    if equipment.status == 'Usable':
+        keys.append((USABLE_EQUIPMENT, ''))
+    return keys
+
+
+def team_keys(team):
+    return [(TEAMS, '')]
+
+
+def track(before=(), after=()):
+    """Apply the change from ``before`` keys to ``after`` keys"""
+    deltas = Counter(after)
+    deltas.subtract(Counter(before))
+    apply_deltas(deltas)
+
+
+def drop_team(team_id):
+    """Forget a deleted team's request count (its requests are left without a team)"""
+    DashboardCounter.query.filter_by(name=TEAM_REQUESTS, key=str(team_id)).delete()
+
+
+def apply_deltas(deltas):
+    """Upsert a {(name, key): delta} mapping into dashboard_counters"""
+    rows = [{'name': name, 'key': key, 'value': delta}
+            for (name, key), delta in deltas.items() if delta]
+    if not rows:
+        return
+    stmt = insert(DashboardCounter)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['name', 'key'],
+        set_={'value': DashboardCounter.value + stmt.excluded.value}
+    )
+    db.session.execute(stmt, rows)
+
+
+def compute_all():
+    """Recompute every counter from the base tables: {(name, key): value}"""
+    counts = Counter()
+    open_requests = MaintenanceRequest.query.filter(MaintenanceRequest.open_clause())
+    counts[(OPEN_REQUESTS, '')] = open_requests.count()
+    counts[(CRITICAL_OPEN, '')] = open_requests.filter(MaintenanceRequest.priority == 'Critical').count()
+    counts[(USABLE_EQUIPMENT, '')] = Equipment.query.filter_by(status='Usable').count()
+    counts[(TEAMS, '')] = Team.query.count()
+
+    for scheduled_date, value in db.session.query(
+        MaintenanceRequest.scheduled_date, func.count()
+    ).filter(MaintenanceRequest.open_clause(), MaintenanceRequest.scheduled_date.isnot(None)
+             ).group_by(MaintenanceRequest.scheduled_date):
+        counts[(OPEN_BY_DATE, scheduled_date.isoformat())] = value
+
+    for team_id, value in db.session.query(
+        MaintenanceRequest.team_id, func.count()
+    ).filter(MaintenanceRequest.team_id.isnot(None)).group_by(MaintenanceRequest.team_id):
+        counts[(TEAM_REQUESTS, str(team_id))] = value
+
+    for category, value in db.session.query(
+        Equipment.category, func.count()
+    ).group_by(Equipment.category):
+        counts[(EQUIPMENT_CATEGORY, category)] = value
+
+    return {key: value for key, value in counts.items() if value}
+
+
+def stored():
+    """Current contents of dashboard_counters: {(name, key): value}"""
+    return {(row.name, row.key): row.value
+            for row in DashboardCounter.query.filter(DashboardCounter.value != 0)}
+
+
+def rebuild():
+    """Recompute dashboard_counters from scratch and commit
+
+    Returns the counters that disagreed with the stored values as
+    {(name, key): (stored, actual)}, which is empty when incremental
+    maintenance has kept them accurate.
+    """
+    actual = compute_all()
+    current = stored()
+    mismatches = {key: (current.get(key, 0), actual.get(key, 0))
+                  for key in set(actual) | set(current)
+                  if current.get(key, 0) != actual.get(key, 0)}
+
+    DashboardCounter.query.delete()
+    db.session.add_all(DashboardCounter(name=name, key=key, value=value)
+                       for (name, key), value in actual.items())
+    db.session.commit()
+    return mismatches
+
+
+def ensure_built():
+    """Build the counters once for databases that predate the table"""
+    if DashboardCounter.query.first() is None:
+        rebuild()
+
+
+def dashboard_stats(today):
+    """/stats counters read from dashboard_counters in one query"""
+    row = db.session.query(
+        func.sum(case((DashboardCounter.name == USABLE_EQUIPMENT, DashboardCounter.value), else_=0)),
+        func.sum(case((DashboardCounter.name == OPEN_REQUESTS, DashboardCounter.value), else_=0)),
+        func.sum(case((DashboardCounter.name == OPEN_BY_DATE, DashboardCounter.value), else_=0)),
+        func.sum(case((DashboardCounter.name == TEAMS, DashboardCounter.value), else_=0)),
+        func.sum(case((DashboardCounter.name == CRITICAL_OPEN, DashboardCounter.value), else_=0)),
+    ).filter(or_(
+        DashboardCounter.name.in_([USABLE_EQUIPMENT, OPEN_REQUESTS, TEAMS, CRITICAL_OPEN]),
+        and_(DashboardCounter.name == OPEN_BY_DATE, DashboardCounter.key < today.isoformat())
+    )).one()
+
+    return {
+        'total_equipment': row[0] or 0,
+        'active_requests': row[1] or 0,
+        'overdue_requests': row[2] or 0,
+        'total_teams': row[3] or 0,
+        'critical_requests': row[4] or 0
+    }
+
+
+def requests_by_team():
+    """Request count per team (every team, including those with none)"""
+    results = db.session.query(
+        Team.name, func.coalesce(DashboardCounter.value, 0)
+    ).outerjoin(DashboardCounter, and_(
+        DashboardCounter.name == TEAM_REQUESTS,
+        DashboardCounter.key == cast(Team.id, String)
+    )).order_by(Team.id).all()
+    return [{'team': name, 'count': count} for name, count in results]
+
+
+def equipment_by_category():
+    results = DashboardCounter.query.filter(
+        DashboardCounter.name == EQUIPMENT_CATEGORY, DashboardCounter.value != 0
+    ).order_by(DashboardCounter.key).all()
+    return [{'category': row.key, 'count': row.value} for row in results]
@@ -2,5 +2,25 @@
 Database instance - separate file to avoid circular imports
 """
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 
 db = SQLAlchemy()
+
+
+def configure_sqlite(engine, busy_timeout_ms=5000):
+    """Apply WAL mode and lock-wait settings to every new SQLite connection
+    
+    WAL lets readers run alongside the single writer, and busy_timeout makes
+    concurrent writers (threads or worker processes) wait for the lock
+    instead of failing with "database is locked".
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute(f'PRAGMA busy_timeout={int(busy_timeout_ms)}')
+        cursor.close()
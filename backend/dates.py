@@ -0,0 +1,22 @@
+"""
+Request-Scoped Dates
+One "today" per HTTP request, shared by every row serialized in it
+"""
+
+from datetime import date
+
+from flask import g, has_request_context
+
+
+def today():
+    """Today's date, resolved once per request (per call outside a request)"""
+    if not has_request_context():
+        return date.today()
+    if 'today' not in g:
+        g.today = date.today()
+    return g.today
+
+
+def is_overdue(scheduled_date, stage, closed_stages):
+    """True for open requests scheduled before today"""
+    return bool(scheduled_date) and stage not in closed_stages and scheduled_date < today()
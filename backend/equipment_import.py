@@ -0,0 +1,196 @@
+"""
+GearGuard Equipment Import
+Stream-parses CSV / NDJSON equipment files and inserts them in validated batches
+
+Rows are read lazily and validated a batch at a time against team ids and
+serial numbers prefetched once, then each batch is written together with
+its activity-log entries and counter updates in a single transaction.
+Rejected rows are reported with their line number instead of failing the
+import.
+
+Usage:
+    python equipment_import.py plant.csv
+    python equipment_import.py plant.ndjson --batch-size=5000 --rejects=rejects.csv
+"""
+
+import csv
+import json
+import os
+import sys
+from collections import Counter
+from datetime import date
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import insert, select
+
+from database import db
+from models import Equipment, Team, ActivityLog
+from api.bulk import chunked, insert_rows
+import counters
+import changes
+import sync
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+REQUIRED_FIELDS = ('name', 'serial_number', 'category', 'department')
+OPTIONAL_FIELDS = ('assigned_employee', 'location', 'notes')
+DATE_FIELDS = ('purchase_date', 'warranty_expiry')
+
+
+def guess_format(filename=None, mimetype=None):
+    """'csv' for .csv files or text/csv uploads, otherwise 'ndjson'"""
+    if (filename and filename.lower().endswith('.csv')) or mimetype == 'text/csv':
+        return 'csv'
+    return 'ndjson'
+
+
+def read_records(stream, fmt):
+    """Yield (line number, record) from a text stream without loading it whole
+
+    CSV records are dicts of strings; NDJSON records are left as the raw line
+    so a malformed line becomes a reject rather than aborting the import.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+    else:
+        for line_number, line in enumerate(stream, 1):
+            if line.strip():
+                yield line_number, line
+
+
+def _clean(value):
+    return value.strip() if isinstance(value, str) else value
+
+
+def _parse_date(value):
+    """Strict YYYY-MM-DD; fromisoformat is several times faster than strptime"""
+    if not (isinstance(value, str) and len(value) == 10 and value[4] == value[7] == '-'):
+        raise ValueError(value)
+    return date.fromisoformat(value)
+
+
+def equipment_row(record, team_ids):
+    """Validate one record into Equipment column values (raises ValueError)"""
+    if isinstance(record, str):
+        record = json.loads(record)
+    if not isinstance(record, dict):
+        raise ValueError('Expected a JSON object')
+
+    row = {}
+    for field in REQUIRED_FIELDS:
+        value = _clean(record.get(field))
+        if not value:
+            raise ValueError(f"Missing field '{field}'")
+        row[field] = str(value)
+    for field in OPTIONAL_FIELDS:
+        row[field] = _clean(record.get(field)) or None
+    for field in DATE_FIELDS:
+        value = _clean(record.get(field))
+        try:
+            row[field] = _parse_date(value) if value else None
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid {field} '{value}', expected YYYY-MM-DD")
+    row['status'] = _clean(record.get('status')) or 'Usable'
+
+    team_id = _clean(record.get('team_id'))
+    if team_id in (None, ''):
+        row['team_id'] = None
+    else:
+        try:
+            row['team_id'] = int(team_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid team_id '{team_id}'")
+        if row['team_id'] not in team_ids:
+            raise ValueError(f"Team {row['team_id']} not found")
+    return row
+
+
+def import_equipment(records, batch_size):
+    """Insert (line number, record) pairs batch by batch and return the report"""
+    team_ids = set(db.session.scalars(select(Team.id)))
+    serials = set(db.session.scalars(select(Equipment.serial_number)))
+    imported = 0
+    rejects = []
+
+    for batch in chunked(records, batch_size):
+        rows, lines = [], []
+        for line, record in batch:
+            try:
+                row = equipment_row(record, team_ids)
+                if row['serial_number'] in serials:
+                    raise ValueError(f"Duplicate serial_number '{row['serial_number']}'")
+            except ValueError as e:
+                rejects.append({'line': line, 'error': str(e)})
+                continue
+            serials.add(row['serial_number'])
+            rows.append(row)
+            lines.append(line)
+        if not rows:
+            continue
+
+        try:
+            ids = insert_rows(Equipment, sync.stamp_rows(rows))
+            db.session.execute(insert(ActivityLog.__table__), [{
+                'equipment_id': equipment_id,
+                'action': 'Equipment Created',
+                'details': f"Equipment '{row['name']}' added to system"
+            } for equipment_id, row in zip(ids, rows)])
+            changes.record_rows(Equipment, ids, rows)
+            deltas = Counter()
+            for row in rows:
+                deltas.update(counters.equipment_keys(SimpleNamespace(**row)))
+            counters.apply_deltas(deltas)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            serials.difference_update(row['serial_number'] for row in rows)
+            rejects.extend({'line': line, 'error': str(e)} for line in lines)
+            continue
+        imported += len(rows)
+
+    return {'imported': imported, 'rejected': len(rejects), 'rejects': rejects}
+
+
+def write_rejects(path, rejects):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['line', 'error'])
+        writer.writeheader()
+        writer.writerows(rejects)
+
+
+def main(args):
+    options = dict(arg[2:].split('=', 1) for arg in args if arg.startswith('--') and '=' in arg)
+    paths = [arg for arg in args if not arg.startswith('--')]
+    if len(paths) != 1:
+        print(__doc__)
+        return 1
+    path = paths[0]
+    fmt = options.get('format') or guess_format(path)
+    if fmt not in IMPORT_FORMATS:
+        print(f"Unknown format '{fmt}'. Allowed: {', '.join(IMPORT_FORMATS)}")
+        return 1
+
+    from app import create_app
+    from cache import invalidate_dashboard_cache
+    app = create_app()
+    with app.app_context():
+        batch_size = int(options.get('batch-size', app.config['BULK_BATCH_SIZE']))
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            result = import_equipment(read_records(f, fmt), batch_size)
+        invalidate_dashboard_cache()
+
+    print(f"{path}: imported {result['imported']}, rejected {result['rejected']}")
+    if options.get('rejects'):
+        write_rejects(options['rejects'], result['rejects'])
+        print(f"Reject report written to {options['rejects']}")
+    else:
+        for reject in result['rejects'][:20]:
+            print(f"  line {reject['line']}: {reject['error']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
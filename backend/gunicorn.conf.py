@@ -0,0 +1,43 @@
+"""
+Gunicorn settings for the GearGuard backend
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Tune with GEARGUARD_HOST, GEARGUARD_PORT, GEARGUARD_WORKERS and
+GEARGUARD_THREADS (see wsgi.py for the database settings).
+"""
+
+import multiprocessing
+import os
+
+bind = f"{os.environ.get('GEARGUARD_HOST', '0.0.0.0')}:{os.environ.get('GEARGUARD_PORT', '5000')}"
+workers = int(os.environ.get('GEARGUARD_WORKERS', multiprocessing.cpu_count()))
+threads = int(os.environ.get('GEARGUARD_THREADS', 4))
+# An open /api/changes/stream holds one of a worker's threads until it
+# ends (CHANGE_FEED_STREAM_SECONDS); size threads for the expected
+# number of live dashboards, or run an async worker class instead
+worker_class = 'gthread'
+
+# Each worker imports wsgi.py itself, so every process builds its own
+# engine and connection pool instead of sharing sockets across a fork
+preload_app = False
+
+# Finish in-flight requests on SIGTERM before workers exit
+graceful_timeout = 30
+timeout = 60
+
+
+def on_starting(server):
+    """Migrate and build the derived tables once, in the master, before any worker boots"""
+    from wsgi import prepare
+    
+    prepare()
+
+
+def worker_exit(server, worker):
+    """Close the worker's pooled database connections on shutdown"""
+    from database import db
+    from wsgi import app
+    
+    with app.app_context():
+        db.engine.dispose()
@@ -0,0 +1,82 @@
+"""
+JSON Providers
+Response encoding for jsonify(), with orjson when it is installed
+
+Both providers write dates and datetimes as ISO 8601 (what the model
+serializers already produce) rather than Flask's HTTP-date format, so a
+response reads the same whichever encoder built it. orjson handles them
+natively; the stdlib provider goes through ``default``.
+"""
+
+from datetime import date
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency; the stdlib provider is used instead
+    orjson = None
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's json-module provider with ISO 8601 dates"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+
+class OrjsonProvider(StdlibJSONProvider):
+    """Encodes with orjson, straight to the response bytes
+
+    Calls that pass json.dumps keyword arguments (``cls``, ``indent``...)
+    are handed to the stdlib provider, which understands them.
+    """
+
+    def _options(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default,
+                            option=self._options(indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+PROVIDERS = {
+    'stdlib': StdlibJSONProvider,
+    'orjson': OrjsonProvider,
+}
+
+
+def provider_class(name='auto'):
+    """Provider for the JSON_PROVIDER setting: 'auto', 'orjson' or 'stdlib'
+
+    'auto' picks orjson when it is importable; asking for orjson without
+    it installed is a configuration error.
+    """
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'stdlib'
+    if name not in PROVIDERS:
+        raise ValueError(f"JSON_PROVIDER must be one of auto, {', '.join(PROVIDERS)}")
+    if name == 'orjson' and orjson is None:
+        raise RuntimeError('JSON_PROVIDER is orjson but orjson is not installed')
+    return PROVIDERS[name]
@@ -0,0 +1,108 @@
+"""
+GearGuard Schema Migrations
+Applies the columns and indexes declared on the models to an existing database
+
+Safe to run repeatedly: only columns and indexes that are missing get created.
+
+Usage:
+    python migrate.py                          # the backend's own database
+    python migrate.py path/to/gearguard.db ...  # any GearGuard SQLite file
+    python migrate.py --rebuild-counters       # also recompute the backend's
+                                               # dashboard_counters and report drift
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.schema import CreateColumn
+from database import db
+
+
+def apply_columns(engine):
+    """Add model-declared columns missing from existing tables
+    
+    New columns must be nullable or carry a server default, which SQLite
+    requires for ALTER TABLE ... ADD COLUMN. Returns 'table.column' names.
+    """
+    import models  # noqa: F401 - registers the tables on db.metadata
+    
+    inspector = inspect(engine)
+    created = []
+    with engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {ddl}'))
+                    created.append(f'{table.name}.{column.name}')
+    return created
+
+
+def apply_indexes(engine):
+    """Create every model-declared index missing from ``engine``'s database
+    
+    Tables that do not exist yet are skipped (create_all builds them with
+    their indexes). Returns the names of the indexes created.
+    """
+    import models  # noqa: F401 - registers the tables on db.metadata
+    
+    inspector = inspect(engine)
+    created = []
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                # checkfirst: another process may have created it since the inspection
+                index.create(engine, checkfirst=True)
+                created.append(index.name)
+    return created
+
+
+def rebuild_counters():
+    """Recompute dashboard_counters for the current app and print any drift"""
+    import counters
+    
+    mismatches = counters.rebuild()
+    for (name, key), (stored, actual) in sorted(mismatches.items()):
+        print(f"  {name}[{key}]: stored {stored}, actual {actual}")
+    print(f"dashboard_counters rebuilt ({len(mismatches)} mismatches)")
+
+
+def report(name, created):
+    if created:
+        print(f"{name}: created {', '.join(created)}")
+    else:
+        print(f"{name}: schema up to date")
+
+
+def main(args):
+    rebuild = '--rebuild-counters' in args
+    paths = [arg for arg in args if arg != '--rebuild-counters']
+    
+    if paths:
+        for path in paths:
+            engine = create_engine(f'sqlite:///{os.path.abspath(path)}')
+            report(path, apply_columns(engine) + apply_indexes(engine))
+            engine.dispose()
+        if rebuild:
+            print("--rebuild-counters only applies to the backend's own database")
+        return
+    
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        report(app.config['SQLALCHEMY_DATABASE_URI'], apply_columns(db.engine) + apply_indexes(db.engine))
+        if rebuild:
+            rebuild_counters()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
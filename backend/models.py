@@ -4,8 +4,28 @@ SQLAlchemy ORM models for all database tables
 """
 
 from database import db
+import dates
 from datetime import datetime
-from sqlalchemy import func
+import json
+from sqlalchemy import func, bindparam
+
+# Stages that close a request; anything else counts as open
+CLOSED_STAGES = ['Repaired', 'Scrap']
+
+
+def only(data, fields):
+    """``data`` limited to ``fields`` (in that order), or all of it when ``fields`` is None"""
+    return data if fields is None else {field: data[field] for field in fields}
+
+
+def split_row(row, model):
+    """(instance, {label: value}) for a list_query row
+
+    A list_query that added no columns returns bare instances.
+    """
+    if isinstance(row, model):
+        return row, {}
+    return row[0], row._mapping
 
 class Team(db.Model):
     __tablename__ = 'teams'
@@ -14,21 +34,68 @@ class Team(db.Model):
     name = db.Column(db.String(100), unique=True, nullable=False)
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    row_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # see sync.py
     
     # Relationships
     members = db.relationship('TeamMember', backref='team', lazy=True, cascade='all, delete-orphan')
     equipment = db.relationship('Equipment', backref='team', lazy=True)
     requests = db.relationship('MaintenanceRequest', backref='team', lazy=True)
     
+    __table_args__ = (
+        db.Index('ix_teams_row_version', 'row_version'),
+    )
+    
     def to_dict(self):
-        return {
+        """Serialize one team; counts come from list_query, not the collections"""
+        row = Team.list_query(Team.query.filter(Team.id == self.id)).one()
+        return Team.serialize_row(row)
+    
+    @staticmethod
+    def member_count_column():
+        """Correlated subquery counting members per team row"""
+        return db.select(func.count(TeamMember.id)).where(
+            TeamMember.team_id == Team.id
+        ).correlate(Team).scalar_subquery()
+    
+    @staticmethod
+    def equipment_count_column():
+        """Correlated subquery counting equipment per team row"""
+        return db.select(func.count(Equipment.id)).where(
+            Equipment.team_id == Team.id
+        ).correlate(Team).scalar_subquery()
+    
+    @classmethod
+    def list_query(cls, query=None, fields=None):
+        """Attach member and equipment counts to a team query
+        
+        Rows come back as (Team, member_count, equipment_count) tuples. The
+        counts are aggregated in SQL from the team_id indexes, so serializing
+        teams never loads the members or equipment collections. A ``fields``
+        selection leaves out the counts it doesn't name.
+        """
+        query = query if query is not None else cls.query
+        counts = {'member_count': cls.member_count_column, 'equipment_count': cls.equipment_count_column}
+        return query.add_columns(*[column().label(name) for name, column in counts.items()
+                                   if fields is None or name in fields])
+    
+    @staticmethod
+    def serialize_row(row, fields=None):
+        """Serialize one list_query row (same shape as to_dict, or just ``fields``)"""
+        team, values = split_row(row, Team)
+        return team.serialize(values.get('member_count'), values.get('equipment_count'), fields)
+    
+    def serialize(self, member_count, equipment_count, fields=None):
+        return only({
             'id': self.id,
             'name': self.name,
             'description': self.description,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'member_count': len(self.members),
-            'equipment_count': len(self.equipment)
-        }
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'row_version': self.row_version,
+            'member_count': member_count,
+            'equipment_count': equipment_count
+        }, fields)
 
 class TeamMember(db.Model):
     __tablename__ = 'team_members'
@@ -40,18 +107,31 @@ class TeamMember(db.Model):
     email = db.Column(db.String(120))
     phone = db.Column(db.String(20))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    row_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # see sync.py
     
-    def to_dict(self):
-        return {
+    __table_args__ = (
+        db.Index('ix_team_members_team_id', 'team_id'),
+        db.Index('ix_team_members_row_version', 'row_version'),
+    )
+    
+    def to_dict(self, fields=None):
+        data = {
             'id': self.id,
             'team_id': self.team_id,
-            'team_name': self.team.name if self.team else None,
+            'team_name': None,
             'name': self.name,
             'role': self.role,
             'email': self.email,
             'phone': self.phone,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'row_version': self.row_version
         }
+        # Loads the team, so only when asked for
+        if fields is None or 'team_name' in fields:
+            data['team_name'] = self.team.name if self.team else None
+        return only(data, fields)
 
 class Equipment(db.Model):
     __tablename__ = 'equipment'
@@ -69,13 +149,68 @@ class Equipment(db.Model):
     team_id = db.Column(db.Integer, db.ForeignKey('teams.id'))
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    row_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # see sync.py
     
     # Relationships
     requests = db.relationship('MaintenanceRequest', backref='equipment', lazy=True)
     activity_logs = db.relationship('ActivityLog', backref='equipment', lazy=True)
     
+    __table_args__ = (
+        db.Index('ix_equipment_team_id', 'team_id'),
+        db.Index('ix_equipment_status', 'status'),
+        db.Index('ix_equipment_category', 'category'),
+        db.Index('ix_equipment_created_at', 'created_at'),
+        db.Index('ix_equipment_row_version', 'row_version'),
+    )
+    
     def to_dict(self):
-        return {
+        return self.serialize(
+            self.team.name if self.team else None,
+            self.open_request_count()
+        )
+    
+    def open_request_count(self):
+        """Count open maintenance requests without loading the request rows"""
+        return MaintenanceRequest.query.filter(
+            MaintenanceRequest.equipment_id == self.id,
+            MaintenanceRequest.open_clause()
+        ).count()
+    
+    @staticmethod
+    def open_request_count_column():
+        """Correlated subquery counting open requests per equipment row"""
+        return db.select(func.count(MaintenanceRequest.id)).where(
+            MaintenanceRequest.equipment_id == Equipment.id,
+            MaintenanceRequest.open_clause()
+        ).correlate(Equipment).scalar_subquery()
+    
+    @classmethod
+    def list_query(cls, query=None, fields=None):
+        """Attach team name and open request count to an equipment query
+        
+        Rows come back as (Equipment, team_name, request_count) tuples so list
+        endpoints serialize from a single SELECT instead of lazy loading
+        the team and requests relationships per row. A ``fields`` selection
+        skips the join and the count it doesn't name.
+        """
+        query = query if query is not None else cls.query
+        columns = []
+        if fields is None or 'team_name' in fields:
+            query = query.outerjoin(Team, cls.team_id == Team.id)
+            columns.append(Team.name.label('team_name'))
+        if fields is None or 'request_count' in fields:
+            columns.append(cls.open_request_count_column().label('request_count'))
+        return query.add_columns(*columns)
+    
+    @staticmethod
+    def serialize_row(row, fields=None):
+        """Serialize one list_query row (same shape as to_dict, or just ``fields``)"""
+        equipment, values = split_row(row, Equipment)
+        return equipment.serialize(values.get('team_name'), values.get('request_count'), fields)
+    
+    def serialize(self, team_name, request_count, fields=None):
+        return only({
             'id': self.id,
             'name': self.name,
             'serial_number': self.serial_number,
@@ -87,11 +222,13 @@ class Equipment(db.Model):
             'location': self.location,
             'status': self.status,
             'team_id': self.team_id,
-            'team_name': self.team.name if self.team else None,
+            'team_name': team_name,
             'notes': self.notes,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'request_count': len([r for r in self.requests if r.stage not in ['Repaired', 'Scrap']])
-        }
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'row_version': self.row_version,
+            'request_count': request_count
+        }, fields)
 
 class MaintenanceRequest(db.Model):
     __tablename__ = 'maintenance_requests'
@@ -109,32 +246,132 @@ class MaintenanceRequest(db.Model):
     priority = db.Column(db.String(50), default='Medium')  # Critical, High, Medium, Low
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    row_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # see sync.py
     completed_at = db.Column(db.DateTime)
     
     # Relationships
     activity_logs = db.relationship('ActivityLog', backref='request', lazy=True)
     
+    __table_args__ = (
+        db.Index('ix_maintenance_requests_stage_scheduled', 'stage', 'scheduled_date'),
+        db.Index('ix_maintenance_requests_team_id', 'team_id'),
+        db.Index('ix_maintenance_requests_equipment_stage', 'equipment_id', 'stage'),
+        db.Index('ix_maintenance_requests_created_at', 'created_at'),
+        db.Index('ix_maintenance_requests_type_scheduled', 'request_type', 'scheduled_date'),
+        db.Index('ix_maintenance_requests_row_version', 'row_version'),
+        # Partial indexes over open requests only (overdue and critical counts)
+        db.Index('ix_maintenance_requests_open_scheduled', 'scheduled_date',
+                 sqlite_where=stage.not_in(CLOSED_STAGES)),
+        db.Index('ix_maintenance_requests_open_priority', 'priority',
+                 sqlite_where=stage.not_in(CLOSED_STAGES)),
+    )
+    
+    @classmethod
+    def open_clause(cls):
+        """``stage NOT IN ('Repaired', 'Scrap')`` for queries on open requests
+        
+        The stages are rendered as literals rather than bound parameters;
+        SQLite only uses the partial open-request indexes when the query
+        repeats the index's WHERE clause verbatim.
+        """
+        return cls.stage.not_in(bindparam('closed_stages', CLOSED_STAGES, expanding=True,
+                                          literal_execute=True, unique=True))
+    
     def to_dict(self):
-        return {
+        return self.serialize(
+            self.equipment.name if self.equipment else None,
+            self.equipment.serial_number if self.equipment else None,
+            self.team.name if self.team else None
+        )
+    
+    @classmethod
+    def list_query(cls, query=None):
+        """Attach equipment name/serial and team name to a request query
+        
+        Rows come back as (MaintenanceRequest, equipment_name,
+        equipment_serial, team_name) tuples, fetched with outer joins instead
+        of lazy loading the equipment and team relationships per row.
+        """
+        query = query if query is not None else cls.query
+        return query.outerjoin(Equipment, cls.equipment_id == Equipment.id).outerjoin(
+            Team, cls.team_id == Team.id
+        ).add_columns(Equipment.name, Equipment.serial_number, Team.name)
+    
+    @staticmethod
+    def serialize_row(row):
+        """Serialize one list_query row (same shape as to_dict)"""
+        req, equipment_name, equipment_serial, team_name = row
+        return req.serialize(equipment_name, equipment_serial, team_name)
+    
+    def serialize(self, equipment_name, equipment_serial, team_name, fields=None):
+        data = {
             'id': self.id,
             'subject': self.subject,
             'equipment_id': self.equipment_id,
-            'equipment_name': self.equipment.name if self.equipment else None,
-            'equipment_serial': self.equipment.serial_number if self.equipment else None,
+            'equipment_name': equipment_name,
+            'equipment_serial': equipment_serial,
             'request_type': self.request_type,
             'scheduled_date': self.scheduled_date.isoformat() if self.scheduled_date else None,
             'duration_hours': self.duration_hours,
             'stage': self.stage,
             'assigned_technician': self.assigned_technician,
             'team_id': self.team_id,
-            'team_name': self.team.name if self.team else None,
+            'team_name': team_name,
             'department': self.department,
             'priority': self.priority,
             'description': self.description,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
-            'is_overdue': self.scheduled_date < datetime.now().date() if self.scheduled_date and self.stage not in ['Repaired', 'Scrap'] else False
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'row_version': self.row_version
         }
+        if fields is None or 'is_overdue' in fields:
+            data['is_overdue'] = dates.is_overdue(self.scheduled_date, self.stage, CLOSED_STAGES)
+        return only(data, fields)
+
+class RequestView(db.Model):
+    """Read model: one row per maintenance request with the equipment and team names copied in
+    
+    Kept current by the request, equipment and team write paths through
+    read_model.py, so the request list, board and calendar endpoints read
+    a single indexed table instead of joining (or lazy loading) per row.
+    """
+    __tablename__ = 'request_view'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    subject = db.Column(db.String(200), nullable=False)
+    equipment_id = db.Column(db.Integer, nullable=False)
+    request_type = db.Column(db.String(50), nullable=False)
+    scheduled_date = db.Column(db.Date, nullable=False)
+    duration_hours = db.Column(db.Float)
+    stage = db.Column(db.String(50))
+    assigned_technician = db.Column(db.String(100))
+    team_id = db.Column(db.Integer)
+    department = db.Column(db.String(100))
+    priority = db.Column(db.String(50))
+    description = db.Column(db.Text)
+    created_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    row_version = db.Column(db.Integer, nullable=False, default=0)
+    equipment_name = db.Column(db.String(200))
+    equipment_serial = db.Column(db.String(100))
+    team_name = db.Column(db.String(100))
+    
+    __table_args__ = (
+        db.Index('ix_request_view_stage_scheduled', 'stage', 'scheduled_date'),
+        db.Index('ix_request_view_team_id', 'team_id'),
+        db.Index('ix_request_view_equipment_stage', 'equipment_id', 'stage'),
+        db.Index('ix_request_view_created_at', 'created_at'),
+        db.Index('ix_request_view_scheduled_date', 'scheduled_date'),
+        db.Index('ix_request_view_type_scheduled', 'request_type', 'scheduled_date'),
+    )
+    
+    def to_dict(self, fields=None):
+        # Same attribute names as MaintenanceRequest, so its serializer applies as is
+        return MaintenanceRequest.serialize(self, self.equipment_name, self.equipment_serial, self.team_name,
+                                            fields)
 
 class ActivityLog(db.Model):
     __tablename__ = 'activity_log'
@@ -146,6 +383,10 @@ class ActivityLog(db.Model):
     details = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_activity_log_created_at', 'created_at'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -155,3 +396,83 @@ class ActivityLog(db.Model):
             'details': self.details,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+
+
+class DashboardCounter(db.Model):
+    """Materialized dashboard counters, maintained by the write endpoints
+    
+    Each row is one counter (``name``) optionally broken down by ``key``:
+    a team id, an equipment category or a scheduled date. See counters.py.
+    """
+    __tablename__ = 'dashboard_counters'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    key = db.Column(db.String(100), primary_key=True, default='')
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+
+class ChangeEvent(db.Model):
+    """Change feed entry written in the same transaction as the change itself
+    
+    ``id`` is the feed's sequence number. AUTOINCREMENT keeps it from ever
+    being reused, so clients can resume from the last number they saw.
+    See changes.py.
+    """
+    __tablename__ = 'change_events'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(20), nullable=False)  # request, equipment, team, member
+    entity_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)      # created, updated, deleted
+    data = db.Column(db.Text)                          # JSON of the changed columns
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_change_events_created_at', 'created_at'),
+        {'sqlite_autoincrement': True},
+    )
+    
+    def to_dict(self):
+        return {
+            'seq': self.id,
+            'entity': self.entity,
+            'op': self.op,
+            'id': self.entity_id,
+            'data': json.loads(self.data) if self.data else None
+        }
+
+
+class Tombstone(db.Model):
+    """Marker left behind by a deleted team, member, equipment or request
+    
+    Lets /api/sync report deletions to clients that synced before them.
+    """
+    __tablename__ = 'tombstones'
+    
+    entity = db.Column(db.String(20), primary_key=True)
+    entity_id = db.Column(db.Integer, primary_key=True)
+    row_version = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_tombstones_row_version', 'row_version'),
+    )
+
+
+class SyncState(db.Model):
+    """Single-row counter handing out row versions (see sync.py)"""
+    __tablename__ = 'sync_state'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+class TableVersion(db.Model):
+    """Per-table data version, bumped by every commit that writes the table
+    
+    Backs the ETags of the GET endpoints (see table_versions.py).
+    """
+    __tablename__ = 'table_versions'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
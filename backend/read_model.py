@@ -0,0 +1,84 @@
+"""
+Request Read Model
+Maintains request_view, the denormalized copy of maintenance requests
+
+Each row is a maintenance request plus its equipment name/serial and team
+name, rebuilt with one INSERT OR REPLACE ... SELECT over the affected
+requests. Write endpoints call these helpers before committing, so the
+read model commits (or rolls back) together with the write itself:
+
+    refresh_requests   requests created or updated
+    remove_requests    requests deleted
+    refresh_equipment  equipment renamed
+    refresh_team       team renamed
+
+Deleting a team nulls its requests' team_id, so delete paths collect the
+affected ids with ``request_ids`` first and refresh those afterwards.
+"""
+
+from sqlalchemy import delete, func, insert, select, true
+
+from database import db
+from models import Team, Equipment, MaintenanceRequest, RequestView
+
+COPIED_COLUMNS = [column.name for column in RequestView.__table__.columns
+                  if column.name in MaintenanceRequest.__table__.columns]
+
+
+def _refresh(where):
+    """Upsert the request_view rows of every request matching ``where``"""
+    requests = MaintenanceRequest.__table__
+    source = select(
+        *[requests.c[name] for name in COPIED_COLUMNS],
+        Equipment.name, Equipment.serial_number, Team.name
+    ).select_from(
+        requests.outerjoin(Equipment, requests.c.equipment_id == Equipment.id)
+                .outerjoin(Team, requests.c.team_id == Team.id)
+    ).where(where)
+    db.session.execute(
+        insert(RequestView).prefix_with('OR REPLACE').from_select(
+            COPIED_COLUMNS + ['equipment_name', 'equipment_serial', 'team_name'], source
+        )
+    )
+
+
+def refresh_requests(ids):
+    if ids:
+        _refresh(MaintenanceRequest.id.in_(list(ids)))
+
+
+def remove_requests(ids):
+    if ids:
+        db.session.execute(delete(RequestView).where(RequestView.id.in_(list(ids))))
+
+
+def refresh_equipment(equipment_id):
+    _refresh(MaintenanceRequest.equipment_id == equipment_id)
+
+
+def refresh_team(team_id):
+    _refresh(MaintenanceRequest.team_id == team_id)
+
+
+def request_ids(column, value):
+    """Ids of the requests whose ``column`` equals ``value``"""
+    return db.session.scalars(select(MaintenanceRequest.id).where(column == value)).all()
+
+
+def rebuild():
+    """Recreate request_view from the base tables and commit"""
+    db.session.execute(delete(RequestView))
+    _refresh(true())
+    db.session.commit()
+
+
+def ensure_built():
+    """Rebuild when the row count disagrees with maintenance_requests
+    
+    Covers databases that predate the table, or were written to by tools
+    that bypass the write endpoints.
+    """
+    views = db.session.scalar(select(func.count()).select_from(RequestView))
+    requests = db.session.scalar(select(func.count()).select_from(MaintenanceRequest))
+    if views != requests:
+        rebuild()
@@ -1,28 +1,113 @@
 """
 GearGuard Backend Server
 Run this file to start the Flask API server
+
+    python run.py                 development server (debug, auto-reload)
+    python run.py --production    multi-threaded waitress server via wsgi.py
 """
 
 import sys
 import os
+import signal
+import time
 
 # Add backend directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+
+class ShutdownRequested(Exception):
+    """Raised by the signal handler to leave waitress' event loop"""
+
+
+def drain(server, timeout):
+    """Stop accepting connections, then let in-flight requests finish
+    
+    The event loop keeps running while requests are serviced, so their
+    responses are still flushed to the clients. Whatever is still running
+    after ``timeout`` seconds is dropped.
+    """
+    from waitress import wasyncore
+    from waitress.channel import HTTPChannel
+    from waitress.server import BaseWSGIServer
+    
+    socket_map = server.map if hasattr(server, 'map') else server._map
+    for listener in list(socket_map.values()):
+        if isinstance(listener, BaseWSGIServer):
+            # Closes the listening socket only; the trigger still wakes the loop
+            wasyncore.dispatcher.close(listener)
+    
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and any(
+        channel.requests or channel.total_outbufs_len
+        for channel in list(socket_map.values()) if isinstance(channel, HTTPChannel)
+    ):
+        wasyncore.loop(timeout=0.1, map=socket_map, count=1)
+    
+    server.task_dispatcher.shutdown(timeout=max(deadline - time.monotonic(), 0))
+    wasyncore.close_all(socket_map)
+
+
+def serve_production():
+    """Serve wsgi.app with waitress until SIGINT/SIGTERM
+    
+    On a signal the listener stops accepting connections, in-flight
+    requests get up to GEARGUARD_SHUTDOWN_TIMEOUT seconds (default 30)
+    to finish, then the database pool is closed.
+    """
+    from waitress import create_server
+    from database import db
+    import wsgi
+    
+    wsgi.prepare()
+    app = wsgi.app
+    
+    host = os.environ.get('GEARGUARD_HOST', '0.0.0.0')
+    port = int(os.environ.get('GEARGUARD_PORT', 5000))
+    threads = int(os.environ.get('GEARGUARD_THREADS', 4))
+    shutdown_timeout = float(os.environ.get('GEARGUARD_SHUTDOWN_TIMEOUT', 30))
+    
+    server = create_server(app, host=host, port=port, threads=threads)
+    
+    def request_shutdown(signum, frame):
+        raise ShutdownRequested(signal.Signals(signum).name)
+    
+    signal.signal(signal.SIGTERM, request_shutdown)
+    signal.signal(signal.SIGINT, request_shutdown)
+    
+    print(f"  Production server on http://{host}:{port} ({threads} threads)")
+    try:
+        server.run()
+    except ShutdownRequested as stop:
+        print(f"  {stop}: finishing in-flight requests")
+        try:
+            drain(server, shutdown_timeout)
+        except ShutdownRequested:
+            pass  # a second signal stops waiting
+    finally:
+        with app.app_context():
+            db.engine.dispose()
+    print("  Server stopped")
+
+
 if __name__ == '__main__':
+    production = '--production' in sys.argv[1:]
     try:
-        from app import create_app
-        
-        app = create_app()
-        
         print("\n" + "="*50)
         print("  GEARGUARD BACKEND SERVER")
         print("="*50)
-        print(f"  Server running on: http://localhost:5000")
-        print(f"  API endpoints: http://localhost:5000/api/")
-        print("="*50 + "\n")
         
-        app.run(debug=True, port=5000, host='0.0.0.0')
+        if production:
+            serve_production()
+        else:
+            from app import create_app
+            
+            app = create_app()
+            
+            print(f"  Server running on: http://localhost:5000")
+            print(f"  API endpoints: http://localhost:5000/api/")
+            print("="*50 + "\n")
+            
+            app.run(debug=True, port=5000, host='0.0.0.0')
         
     except Exception as e:
         print(f"\nERROR: Failed to start backend server")
@@ -0,0 +1,117 @@
+"""
+Incremental Sync
+Row versions and tombstones behind GET /api/sync?since=<version>
+
+Every write stamps the team, member, equipment and request rows it touches
+with ``updated_at`` and a ``row_version`` drawn from the single-row
+``sync_state`` counter, and every delete leaves a tombstone carrying the
+version instead. ORM writes are stamped by a ``before_flush`` hook; Core
+bulk inserts call ``stamp_rows``.
+
+The counter is bumped with an UPDATE, which holds SQLite's write lock
+until the transaction commits, so versions become visible in commit order
+and a client that has seen version N can never later miss a row committed
+with a lower one. One version is shared by everything a transaction writes.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import event, func, select, update
+from sqlalchemy.dialects.sqlite import insert
+
+from database import db
+from models import Team, TeamMember, Equipment, MaintenanceRequest, Tombstone, SyncState
+
+SYNCED = {
+    MaintenanceRequest: 'requests',
+    Equipment: 'equipment',
+    Team: 'teams',
+    TeamMember: 'members',
+}
+
+
+def next_version(session):
+    """Version for the session's current transaction, bumping the counter once"""
+    version = session.info.get('sync_version')
+    if version is None:
+        version = session.connection().execute(
+            update(SyncState).where(SyncState.id == 1)
+            .values(version=SyncState.version + 1).returning(SyncState.version)
+        ).scalar_one()
+        session.info['sync_version'] = version
+    return version
+
+
+def stamp_rows(rows):
+    """Add updated_at / row_version to column dicts about to be inserted with Core"""
+    version = next_version(db.session)
+    now = datetime.utcnow()
+    for row in rows:
+        row['updated_at'] = now
+        row['row_version'] = version
+    return rows
+
+
+def stamp_where(model, *criteria):
+    """Stamp rows the flush will change behind the hooks' back
+    
+    Deleting a team makes the flush set ``team_id`` NULL on its equipment
+    and requests, which ``before_flush`` never sees; delete paths call
+    this for such rows first.
+    """
+    db.session.execute(update(model).where(*criteria).values(
+        row_version=next_version(db.session), updated_at=datetime.utcnow()
+    ), execution_options={'synchronize_session': False})
+
+
+@event.listens_for(db.session, 'before_flush')
+def stamp_flush(session, flush_context, instances):
+    touched = [obj for obj in session.new if type(obj) in SYNCED]
+    touched.extend(obj for obj in session.dirty if type(obj) in SYNCED
+                   and session.is_modified(obj, include_collections=False))
+    if not touched:
+        return
+    version = next_version(session)
+    now = datetime.utcnow()
+    for obj in touched:
+        obj.updated_at = now
+        obj.row_version = version
+
+
+@event.listens_for(db.session, 'after_flush')
+def record_tombstones(session, flush_context):
+    """Tombstone every deleted row, cascaded deletes included"""
+    deleted = [(SYNCED[type(obj)], obj.id) for obj in session.deleted if type(obj) in SYNCED]
+    if not deleted:
+        return
+    version = next_version(session)
+    stmt = insert(Tombstone)
+    session.connection().execute(stmt.on_conflict_do_update(
+        index_elements=['entity', 'entity_id'],
+        set_={'row_version': stmt.excluded.row_version, 'deleted_at': stmt.excluded.deleted_at}
+    ), [{'entity': entity, 'entity_id': entity_id, 'row_version': version,
+         'deleted_at': datetime.utcnow()} for entity, entity_id in deleted])
+
+
+@event.listens_for(db.session, 'after_commit')
+@event.listens_for(db.session, 'after_rollback')
+def end_version(session):
+    session.info.pop('sync_version', None)
+
+
+def current_version():
+    return db.session.scalar(select(SyncState.version).where(SyncState.id == 1)) or 0
+
+
+def ensure_state():
+    """Create the counter once, at or above any version already stored
+    
+    It starts at 1 at the least, so the version a first full sync returns
+    is never the 0 that asks for a full snapshot again.
+    """
+    if db.session.get(SyncState, 1) is not None:
+        return
+    versions = [db.session.scalar(select(func.max(model.row_version))) for model in SYNCED]
+    versions.append(db.session.scalar(select(func.max(Tombstone.row_version))))
+    db.session.add(SyncState(id=1, version=max(1, *(v or 0 for v in versions))))
+    db.session.commit()
@@ -0,0 +1,62 @@
+"""
+Table Versions
+Per-table data versions behind the ETags of the GET endpoints
+
+An engine hook notes the table of every INSERT / UPDATE / DELETE a
+connection runs, ORM flushes and Core bulk writes alike, and a
+``before_commit`` hook bumps ``table_versions`` for those tables in the
+same transaction. A response built from a set of tables is therefore
+unchanged for as long as their versions are, which lets a conditional GET
+be answered after one primary-key lookup instead of the full query.
+Writes made outside the app (e.g. by hand in the sqlite shell) do not
+bump the versions.
+"""
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.sqlite import insert
+
+from database import db
+from models import TableVersion
+
+WRITTEN = 'written_tables'
+
+
+def track_writes(engine):
+    """Record the tables each of ``engine``'s connections writes to"""
+
+    @event.listens_for(engine, 'after_execute')
+    def note_write(conn, clauseelement, multiparams, params, execution_options, result):
+        if getattr(clauseelement, 'is_dml', False):
+            name = clauseelement.table.name
+            if name != TableVersion.__tablename__:
+                conn.info.setdefault(WRITTEN, set()).add(name)
+
+    @event.listens_for(engine, 'commit')
+    @event.listens_for(engine, 'rollback')
+    def forget_writes(conn):
+        conn.info.pop(WRITTEN, None)
+
+
+@event.listens_for(db.session, 'before_commit')
+def bump_versions(session):
+    if not session.in_transaction():
+        return
+    # before_commit runs ahead of the final flush, so flush first
+    session.flush()
+    connection = session.connection()
+    written = connection.info.pop(WRITTEN, None)
+    if not written:
+        return
+    stmt = insert(TableVersion)
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=['name'], set_={'version': TableVersion.version + 1}
+    ), [{'name': name, 'version': 1} for name in sorted(written)])
+
+
+def current(names):
+    """{table name: version} for ``names``; tables never written are at 0"""
+    versions = dict.fromkeys(names, 0)
+    versions.update(db.session.execute(
+        select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(names))
+    ).all())
+    return versions
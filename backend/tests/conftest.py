@@ -0,0 +1,88 @@
+"""
+Shared pytest fixtures for the GearGuard Flask backend
+"""
+
+import importlib.util
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def load_legacy(name):
+    """Import one of the Streamlit app's modules (repo root) by path
+
+    The backend's own modules already take names like ``database``, so
+    these load as ``legacy_<name>``.
+    """
+    module = sys.modules.get(f'legacy_{name}')
+    if module is None:
+        spec = importlib.util.spec_from_file_location(f'legacy_{name}', os.path.join(ROOT, f'{name}.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Seeded backend app on a throwaway SQLite file"""
+    from app import create_app
+    from cache import dashboard_cache
+    from database import db
+
+    dashboard_cache.clear()
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'gearguard.db'}",
+    })
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def count_queries(app):
+    """Context manager collecting every (statement, parameters) sent to the engine"""
+    from sqlalchemy import event
+    from database import db
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+    return counter
+
+
+@pytest.fixture
+def legacy():
+    """Loader for the Streamlit app's modules: ``legacy('date_utils')``"""
+    return load_legacy
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """The Streamlit app's Database on a throwaway seeded SQLite file"""
+    database = load_legacy('database').Database(str(tmp_path / 'legacy.db'))
+    yield database
+    database.close()
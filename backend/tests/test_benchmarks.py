@@ -0,0 +1,49 @@
+"""
+Benchmark suite smoke tests (run with pytest)
+"""
+
+import copy
+import os
+import sys
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                'benchmarks'))
+
+BLUEPRINTS = ('equipment', 'requests', 'teams', 'dashboard')
+
+
+def test_every_data_route_is_benchmarked(app):
+    import suite
+
+    adapter = app.url_map.bind('localhost')
+    covered = {adapter.match(urlsplit(route.path.format(id=1)).path, method=route.method)[0]
+               for routes in suite.backend_routes().values() for route in routes}
+    endpoints = {rule.endpoint for rule in app.url_map.iter_rules()
+                 if rule.endpoint.split('.')[0] in BLUEPRINTS}
+    assert endpoints - covered == set()
+
+
+def test_tiny_run_reports_and_compares():
+    import suite
+    import compare
+
+    options = suite.Options(iterations=2, min_iterations=1, warmup=0, time_budget=0, full_list_max=100)
+    report = suite.run({'tiny': 300}, options)
+    scale = report['scales']['tiny']
+    results = compare.cases(scale)
+
+    assert set(scale['backend']) == set(BLUEPRINTS) and scale['legacy']
+    assert [name for name, result in results.items() if 'error' in result] == []
+    # 300 requests is above --full-list-max, 50 equipment rows is not
+    assert 'skipped' in scale['backend']['requests']['GET /api/requests/']
+    assert scale['backend']['equipment']['GET /api/equipment/']['queries'] >= 1
+    assert all(result['iterations'] >= 1 and result['peak_kib'] >= 0
+               for result in results.values() if 'skipped' not in result)
+
+    assert compare.regressions(report, report) == []
+    slower = copy.deepcopy(report)
+    stats = slower['scales']['tiny']['legacy']['get_dashboard_stats()']
+    stats['p95_ms'] += 50
+    stats['queries'] += 1
+    assert [metric for _, _, metric, _, _ in compare.regressions(report, slower)] == ['p95_ms', 'queries']
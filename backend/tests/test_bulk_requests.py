@@ -0,0 +1,103 @@
+"""
+Bulk maintenance request API tests (run with pytest)
+"""
+
+
+def _new_request(equipment_id, subject='Bulk check'):
+    return {
+        'subject': subject,
+        'equipment_id': equipment_id,
+        'request_type': 'Preventive',
+        'scheduled_date': '2030-01-15',
+    }
+
+
+def test_bulk_create_reports_per_item_results(client):
+    from models import ActivityLog, MaintenanceRequest
+
+    items = [
+        _new_request(1, 'First'),
+        _new_request(9999),
+        {'equipment_id': 1, 'request_type': 'Preventive'},
+        _new_request(2, 'Second'),
+    ]
+    response = client.post('/api/requests/bulk', json=items)
+    assert response.status_code == 200
+    body = response.json
+    assert (body['succeeded'], body['failed']) == (2, 2)
+    assert [sorted(result) for result in body['results']] == [
+        ['id', 'index'], ['error', 'index'], ['error', 'index'], ['id', 'index']
+    ]
+    assert body['results'][1]['error'] == 'Equipment not found'
+    assert body['results'][2]['error'] == "Missing field 'subject'"
+
+    created = MaintenanceRequest.query.get(body['results'][3]['id'])
+    assert created.subject == 'Second'
+    assert created.team_id == created.equipment.team_id
+    assert ActivityLog.query.filter_by(request_id=created.id, action='Request Created').count() == 1
+
+
+def test_bulk_create_query_count_is_per_batch(app, client, count_queries):
+    app.config['BULK_BATCH_SIZE'] = 50
+
+    with count_queries() as small:
+        client.post('/api/requests/bulk', json=[_new_request(1) for _ in range(5)])
+    with count_queries() as large:
+        client.post('/api/requests/bulk', json=[_new_request(1) for _ in range(50)])
+    assert len(large) == len(small)
+
+    with count_queries() as two_batches:
+        client.post('/api/requests/bulk', json=[_new_request(1) for _ in range(100)])
+    assert len(two_batches) > len(large)
+
+
+def test_bulk_create_loads_equipment_once(app, client, count_queries):
+    app.config['BULK_BATCH_SIZE'] = 2
+
+    with count_queries() as executed:
+        response = client.post('/api/requests/bulk', json=[_new_request(i % 7 + 1) for i in range(40)])
+    assert response.json['succeeded'] == 40
+    equipment_loads = [statement for statement, _ in executed
+                       if statement.lstrip().startswith('SELECT') and 'FROM equipment' in statement]
+    assert len(equipment_loads) == 1
+
+
+def test_bulk_create_accepts_numeric_string_ids(client, count_queries):
+    from database import db
+    from models import MaintenanceRequest
+
+    items = [_new_request('1', 'From a form'), _new_request(2), _new_request('abc'), _new_request(None)]
+    with count_queries() as executed:
+        body = client.post('/api/requests/bulk', json=items).json
+    assert (body['succeeded'], body['failed']) == (2, 2)
+    assert [result.get('error') for result in body['results'][2:]] == ['Equipment not found'] * 2
+    assert db.session.get(MaintenanceRequest, body['results'][0]['id']).equipment_id == 1
+    # Both ids, string or not, come from the single equipment prefetch
+    equipment_loads = [statement for statement, _ in executed
+                       if statement.lstrip().startswith('SELECT') and 'FROM equipment' in statement]
+    assert len(equipment_loads) == 1
+
+
+def test_bulk_update_scraps_equipment_and_keeps_counters(client):
+    import counters
+    from models import Equipment, MaintenanceRequest
+
+    req = MaintenanceRequest.query.filter(MaintenanceRequest.open_clause()).first()
+    other = MaintenanceRequest.query.filter(MaintenanceRequest.id != req.id).first()
+    response = client.patch('/api/requests/bulk', json={'items': [
+        {'id': req.id, 'stage': 'Scrap'},
+        {'id': other.id, 'priority': 'Low'},
+        {'id': 9999, 'stage': 'Repaired'},
+    ]})
+    body = response.json
+    assert (body['succeeded'], body['failed']) == (2, 1)
+    assert body['results'][2] == {'index': 2, 'error': 'Request not found'}
+
+    assert Equipment.query.get(req.equipment_id).status == 'Scrapped'
+    assert MaintenanceRequest.query.get(other.id).priority == 'Low'
+    assert counters.rebuild() == {}
+
+
+def test_bulk_rejects_malformed_body(client):
+    assert client.post('/api/requests/bulk', json={'subject': 'x'}).status_code == 400
+    assert client.patch('/api/requests/bulk?batch_size=x', json=[]).status_code == 400
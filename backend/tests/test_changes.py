@@ -0,0 +1,137 @@
+"""
+Change feed tests (run with pytest)
+"""
+
+import json
+
+
+def _feed(client, since):
+    return client.get(f'/api/changes/?since={since}').json
+
+
+def test_request_writes_emit_compact_deltas(client):
+    from changes import latest_seq
+
+    start = latest_seq()
+    created = client.post('/api/requests/', json={
+        'subject': 'Feed check', 'equipment_id': 1,
+        'request_type': 'Corrective', 'scheduled_date': '2030-01-15'
+    }).json
+    client.put(f"/api/requests/{created['id']}", json={'stage': 'In Progress', 'priority': 'Medium'})
+    client.delete(f"/api/requests/{created['id']}")
+
+    feed = _feed(client, start)
+    events = feed['events']
+    assert [(e['entity'], e['op'], e['id']) for e in events] == [
+        ('request', 'created', created['id']),
+        ('request', 'updated', created['id']),
+        ('request', 'deleted', created['id']),
+    ]
+    assert events[0]['data']['subject'] == 'Feed check'
+    # Only the columns that actually changed ('Medium' was already the priority)
+    assert events[1]['data']['stage'] == 'In Progress'
+    assert set(events[1]['data']) == {'stage', 'updated_at', 'row_version'}
+    assert events[2]['data'] is None
+    assert [e['seq'] for e in events] == sorted(e['seq'] for e in events)
+    assert feed['last_seq'] == events[-1]['seq']
+    assert _feed(client, feed['last_seq'])['events'] == []
+
+
+def test_bulk_import_and_team_cascade_are_recorded(client):
+    from changes import latest_seq
+
+    start = latest_seq()
+    body = client.post('/api/requests/bulk', json=[{
+        'subject': f'Bulk {i}', 'equipment_id': 1,
+        'request_type': 'Preventive', 'scheduled_date': '2030-01-15'
+    } for i in range(3)]).json
+    team = client.post('/api/teams/', json={'name': 'Feed Team'}).json
+    member = client.post('/api/teams/members', json={'team_id': team['id'], 'name': 'Ana'}).json
+    client.delete(f"/api/teams/{team['id']}")
+
+    events = _feed(client, start)['events']
+    created = [e for e in events if e['entity'] == 'request']
+    assert [e['id'] for e in created] == [result['id'] for result in body['results']]
+    assert created[0]['data']['id'] == created[0]['id']
+    deleted = {(e['entity'], e['id']) for e in events if e['op'] == 'deleted'}
+    assert deleted == {('team', team['id']), ('member', member['id'])}
+
+
+def test_stream_resumes_after_last_event_id(client):
+    from changes import latest_seq
+
+    start = latest_seq()
+    client.post('/api/teams/', json={'name': 'Stream Team'})
+
+    response = client.get('/api/changes/stream', headers={'Last-Event-ID': str(start)})
+    assert response.mimetype == 'text/event-stream'
+    chunks = iter(response.response)
+    assert next(chunks).startswith(b'retry:')
+    lines = next(chunks).decode().splitlines()
+    response.close()
+
+    assert lines[0] == f'id: {start + 1}'
+    assert lines[1] == 'event: change'
+    change = json.loads(lines[2][len('data: '):])
+    assert (change['entity'], change['op'], change['data']['name']) == ('team', 'created', 'Stream Team')
+
+
+def test_stream_ends_and_leaves_a_resume_point(app, client):
+    from changes import latest_seq
+
+    app.config.update(CHANGE_FEED_STREAM_SECONDS=0.2, CHANGE_FEED_POLL_SECONDS=0.05)
+    start = latest_seq()
+    client.post('/api/teams/', json={'name': 'Short Stream'})
+
+    body = client.get('/api/changes/stream').get_data(as_text=True)
+    assert 'Short Stream' not in body
+    # The last event id is written even though nothing was sent
+    assert body.endswith(f'id: {start + 1}\n\n')
+
+    body = client.get('/api/changes/stream', headers={'Last-Event-ID': str(start)}).get_data(as_text=True)
+    assert 'Short Stream' in body and body.endswith(f'id: {start + 1}\n\n')
+
+
+def test_feed_rejects_bad_sequence(client):
+    assert client.get('/api/changes/?since=abc').status_code == 400
+
+
+def test_writes_prune_events_past_retention(app, client, monkeypatch):
+    from datetime import datetime, timedelta
+    import changes
+    from database import db
+    from models import ChangeEvent
+
+    def add_event(hours_ago):
+        event = ChangeEvent(entity='team', entity_id=1, op='updated',
+                            created_at=datetime.utcnow() - timedelta(hours=hours_ago))
+        db.session.add(event)
+        db.session.commit()
+        return event.id
+
+    stale, recent = add_event(30), add_event(1)
+    monkeypatch.setattr(changes, '_next_prune', 0.0)
+    client.post('/api/teams/', json={'name': 'Pruning Team'})
+    assert db.session.get(ChangeEvent, stale) is None
+    assert db.session.get(ChangeEvent, recent) is not None
+
+    # At most one prune per interval in each process
+    late = add_event(30)
+    client.post('/api/requests/bulk', json=[{
+        'subject': 'Bulk prune', 'equipment_id': 1,
+        'request_type': 'Corrective', 'scheduled_date': '2030-01-15'
+    }])
+    assert db.session.get(ChangeEvent, late) is not None
+
+    monkeypatch.setattr(changes, '_next_prune', 0.0)
+    app.config['CHANGE_FEED_RETENTION_HOURS'] = 0
+    client.post('/api/teams/', json={'name': 'Keeping Team'})
+    assert db.session.get(ChangeEvent, late) is not None
+
+    app.config['CHANGE_FEED_RETENTION_HOURS'] = 24
+    client.post('/api/requests/bulk', json=[{
+        'subject': 'Bulk prune', 'equipment_id': 1,
+        'request_type': 'Corrective', 'scheduled_date': '2030-01-15'
+    }])
+    assert db.session.get(ChangeEvent, late) is None
+    assert changes.events_since(0, 500)[-1]['entity'] == 'request'
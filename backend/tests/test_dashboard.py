@@ -0,0 +1,70 @@
+"""
+Dashboard API tests (run with pytest)
+"""
+
+from datetime import date
+
+
+def test_stats_match_individual_counts(client, count_queries):
+    from models import Equipment, MaintenanceRequest, Team
+
+    open_requests = MaintenanceRequest.query.filter(MaintenanceRequest.open_clause())
+    expected = {
+        'total_equipment': Equipment.query.filter_by(status='Usable').count(),
+        'active_requests': open_requests.count(),
+        'overdue_requests': open_requests.filter(MaintenanceRequest.scheduled_date < date.today()).count(),
+        'total_teams': Team.query.count(),
+        'critical_requests': open_requests.filter(MaintenanceRequest.priority == 'Critical').count(),
+    }
+
+    with count_queries() as executed:
+        response = client.get('/api/dashboard/stats')
+    assert response.json == expected
+    assert len(executed) == 2  # the counters, plus the ETag's version lookup
+
+
+def test_stats_cached_until_a_write(client, count_queries):
+    client.get('/api/dashboard/stats')
+    with count_queries() as executed:
+        cached = client.get('/api/dashboard/stats').json
+    assert [statement for statement, params in executed if 'table_versions' not in statement] == []
+
+    client.put('/api/requests/1', json={'stage': 'Repaired'})
+    assert client.get('/api/dashboard/stats').json['active_requests'] == cached['active_requests'] - 1
+
+
+def test_cache_can_be_disabled(app, client, count_queries):
+    app.config['DASHBOARD_CACHE_TTL'] = 0
+    client.get('/api/dashboard/equipment-by-category')
+    with count_queries() as executed:
+        client.get('/api/dashboard/equipment-by-category')
+    assert len(executed) == 2
+
+
+def test_counters_stay_in_sync_with_writes(app, client):
+    import counters
+
+    app.config['DASHBOARD_CACHE_TTL'] = 0
+    client.post('/api/teams/', json={'name': 'Painters'})
+    created = client.post('/api/equipment/', json={
+        'name': 'Sprayer', 'serial_number': 'SPR-1', 'category': 'Tools',
+        'department': 'Paint', 'team_id': 6}).json
+    req = client.post('/api/requests/', json={
+        'subject': 'Nozzle clogged', 'equipment_id': created['id'], 'request_type': 'Corrective',
+        'scheduled_date': '2024-03-01', 'priority': 'Critical'}).json
+    client.put(f"/api/equipment/{created['id']}", json={'category': 'Paint Tools'})
+    client.put('/api/requests/2', json={'stage': 'Scrap'})
+    client.put(f"/api/requests/{req['id']}", json={'priority': 'Low'})
+    spare = client.post('/api/equipment/', json={
+        'name': 'Spare Sprayer', 'serial_number': 'SPR-2', 'category': 'Tools',
+        'department': 'Paint', 'team_id': 6}).json
+    assert client.delete('/api/requests/1').status_code == 200
+    assert client.delete(f"/api/equipment/{spare['id']}").status_code == 200
+    assert client.delete('/api/teams/2').status_code == 200
+
+    stats = client.get('/api/dashboard/stats').json
+    by_team = client.get('/api/dashboard/requests-by-team').json
+    assert counters.rebuild() == {}
+    assert client.get('/api/dashboard/stats').json == stats
+    assert client.get('/api/dashboard/requests-by-team').json == by_team
+    assert {'team': 'Painters', 'count': 1} in by_team
@@ -0,0 +1,36 @@
+"""
+Request-scoped date helper tests (run with pytest)
+"""
+
+from datetime import date, timedelta
+
+
+def test_overdue_flag_in_serialized_requests(client):
+    past = (date.today() - timedelta(days=3)).isoformat()
+    future = (date.today() + timedelta(days=3)).isoformat()
+    created = client.post('/api/requests/bulk', json=[
+        {'subject': 'Late', 'equipment_id': 1, 'request_type': 'Corrective', 'scheduled_date': past},
+        {'subject': 'Late but closed', 'equipment_id': 1, 'request_type': 'Corrective',
+         'scheduled_date': past, 'stage': 'Repaired'},
+        {'subject': 'Upcoming', 'equipment_id': 1, 'request_type': 'Corrective', 'scheduled_date': future},
+    ]).json['results']
+
+    flags = [client.get(f"/api/requests/{result['id']}").json['is_overdue'] for result in created]
+    assert flags == [True, False, False]
+
+
+def test_today_resolved_once_per_request(app, monkeypatch):
+    import dates
+
+    calls = []
+
+    class CountingDate(date):
+        @classmethod
+        def today(cls):
+            calls.append(1)
+            return date(2030, 1, 1)
+
+    monkeypatch.setattr(dates, 'date', CountingDate)
+    with app.test_request_context('/'):
+        assert [dates.today() for _ in range(5)] == [date(2030, 1, 1)] * 5
+    assert len(calls) == 1
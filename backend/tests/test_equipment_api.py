@@ -0,0 +1,44 @@
+"""
+Equipment API tests (run with pytest)
+"""
+
+from datetime import date
+
+
+def add_equipment(count, team_id=1):
+    from database import db
+    from models import Equipment, MaintenanceRequest
+
+    for i in range(count):
+        eq = Equipment(name=f'Pump {i}', serial_number=f'PMP-{team_id}-{i}', category='Pumps',
+                       department='Production', team_id=team_id)
+        db.session.add(eq)
+        db.session.flush()
+        for stage in ('New', 'Repaired', 'In Progress'):
+            db.session.add(MaintenanceRequest(subject=f'Check pump {i}', equipment_id=eq.id,
+                                              request_type='Preventive', stage=stage,
+                                              scheduled_date=date(2024, 1, 1), team_id=team_id))
+    db.session.commit()
+
+
+def test_list_matches_single_serialization(client):
+    from models import Equipment
+
+    add_equipment(5)
+    response = client.get('/api/equipment/')
+    assert response.status_code == 200
+
+    expected = {eq.id: eq.to_dict() for eq in Equipment.query.all()}
+    assert {item['id']: item for item in response.json} == expected
+    assert all(item['request_count'] == 2 for item in response.json if item['category'] == 'Pumps')
+
+
+def test_list_query_count_is_constant(client, count_queries):
+    with count_queries() as small:
+        client.get('/api/equipment/')
+    add_equipment(50, team_id=2)
+    with count_queries() as large:
+        response = client.get('/api/equipment/')
+
+    assert len(response.json) == 57
+    assert len(large) == len(small) == 2  # the list, plus the ETag's version lookup
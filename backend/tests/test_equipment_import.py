@@ -0,0 +1,74 @@
+"""
+Equipment import tests (run with pytest)
+"""
+
+import io
+import json
+
+CSV_HEADER = 'name,serial_number,category,department,purchase_date,team_id\n'
+
+
+def test_csv_import_reports_rejects(client):
+    from models import ActivityLog, Equipment
+
+    existing = Equipment.query.first().serial_number
+    body = CSV_HEADER + '\n'.join([
+        'Press A,IMP-001,Machinery,Production,2024-01-31,1',
+        'Press B,IMP-002,Machinery,Production,31/01/2024,1',
+        f'Press C,{existing},Machinery,Production,,1',
+        'Press D,IMP-001,Machinery,Production,,1',
+        'Press E,IMP-003,Machinery,Production,,999',
+        ',IMP-004,Machinery,Production,,',
+        'Press F,IMP-005,Machinery,Production,,',
+    ]) + '\n'
+
+    response = client.post('/api/equipment/import', data={
+        'file': (io.BytesIO(body.encode()), 'plant.csv')
+    })
+    assert response.status_code == 200
+    result = response.json
+    assert (result['imported'], result['rejected']) == (2, 5)
+    assert [reject['line'] for reject in result['rejects']] == [3, 4, 5, 6, 7]
+    assert "Invalid purchase_date '31/01/2024'" in result['rejects'][0]['error']
+    assert result['rejects'][2]['error'] == "Duplicate serial_number 'IMP-001'"
+    assert result['rejects'][3]['error'] == 'Team 999 not found'
+
+    press = Equipment.query.filter_by(serial_number='IMP-001').one()
+    assert press.team_id == 1 and press.purchase_date.isoformat() == '2024-01-31'
+    assert ActivityLog.query.filter_by(equipment_id=press.id, action='Equipment Created').count() == 1
+
+
+def test_ndjson_import_in_batches(app, client):
+    import counters
+    from models import Equipment
+
+    lines = [json.dumps({'name': f'Sensor {i}', 'serial_number': f'NDJ-{i:04d}',
+                         'category': 'Sensors', 'department': 'Quality'})
+             for i in range(250)]
+    lines.insert(10, '{not json')
+
+    before = Equipment.query.count()
+    response = client.post('/api/equipment/import?format=ndjson&batch_size=100',
+                           data='\n'.join(lines), content_type='application/x-ndjson')
+    result = response.json
+    assert (result['imported'], result['rejected']) == (250, 1)
+    assert result['rejects'][0]['line'] == 11
+    assert Equipment.query.count() == before + 250
+    assert counters.rebuild() == {}
+
+
+def test_import_from_file_writes_reject_report(app, tmp_path):
+    import equipment_import
+    from models import Equipment
+
+    path = tmp_path / 'plant.csv'
+    path.write_text(CSV_HEADER + 'Lathe,CLI-001,Machinery,Production,,\nBad,CLI-002,,Production,,\n')
+    with open(path, newline='') as f:
+        result = equipment_import.import_equipment(equipment_import.read_records(f, 'csv'), 500)
+
+    assert result['imported'] == 1
+    assert result['rejects'] == [{'line': 3, 'error': "Missing field 'category'"}]
+    assert Equipment.query.filter_by(serial_number='CLI-001').count() == 1
+
+    equipment_import.write_rejects(tmp_path / 'rejects.csv', result['rejects'])
+    assert (tmp_path / 'rejects.csv').read_text().splitlines()[1] == "3,Missing field 'category'"
@@ -0,0 +1,35 @@
+"""
+Streaming export tests (run with pytest)
+"""
+
+import csv
+import io
+import json
+
+
+def test_requests_ndjson_export_matches_list(client):
+    response = client.get('/api/requests/export')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+
+    exported = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    listed = client.get('/api/requests/', query_string={'sort': 'created_at'}).json
+    assert sorted(exported, key=lambda r: r['id']) == sorted(listed, key=lambda r: r['id'])
+
+
+def test_requests_csv_export_honours_filters(client):
+    response = client.get('/api/requests/export?format=csv&type=Preventive')
+    assert response.mimetype == 'text/csv'
+
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert rows and all(row['request_type'] == 'Preventive' for row in rows)
+
+
+def test_activity_log_export_and_bad_format(client):
+    client.post('/api/teams/', json={'name': 'Painters'})
+    client.post('/api/equipment/', json={'name': 'Sprayer', 'serial_number': 'SPR-1',
+                                         'category': 'Tools', 'department': 'Paint'})
+    lines = client.get('/api/dashboard/activity-log/export').get_data(as_text=True).splitlines()
+    assert [json.loads(line)['action'] for line in lines] == ['Equipment Created']
+
+    assert client.get('/api/requests/export?format=xml').status_code == 400
@@ -0,0 +1,86 @@
+"""
+ETag / gzip tests (run with pytest)
+"""
+
+import gzip
+import json
+
+
+def _new_request(equipment_id, subject='Cache check'):
+    return {
+        'subject': subject,
+        'equipment_id': equipment_id,
+        'request_type': 'Corrective',
+        'scheduled_date': '2030-01-15',
+    }
+
+
+def test_unchanged_resource_is_not_rebuilt(client, count_queries):
+    first = client.get('/api/equipment/')
+    etag = first.headers['ETag']
+
+    with count_queries() as executed:
+        response = client.get('/api/equipment/', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert response.data == b''
+    assert len(executed) == 1 and 'table_versions' in executed[0][0]
+
+    # The query string is part of the resource
+    assert client.get('/api/equipment/?page=1', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_etag_follows_the_tables_a_route_reads(client):
+    urls = ('/api/requests/', '/api/requests/1', '/api/teams/', '/api/dashboard/stats')
+    before = {url: client.get(url).headers['ETag'] for url in urls}
+
+    assert client.post('/api/requests/bulk', json=[_new_request(1)]).status_code == 200
+    after = {url: client.get(url).headers['ETag'] for url in urls}
+    assert after['/api/requests/'] != before['/api/requests/']
+    assert after['/api/requests/1'] != before['/api/requests/1']
+    assert after['/api/dashboard/stats'] != before['/api/dashboard/stats']
+    # Requests are not part of the teams list
+    assert after['/api/teams/'] == before['/api/teams/']
+
+    client.put('/api/teams/1', json={'name': 'Mechanics & Welders'})
+    renamed = client.get('/api/requests/1', headers={'If-None-Match': after['/api/requests/1']})
+    assert renamed.status_code == 200
+    assert renamed.json['team_name'] == 'Mechanics & Welders'
+
+
+def test_large_responses_are_gzipped(app, client):
+    app.config['GZIP_MIN_BYTES'] = 200
+    plain = client.get('/api/equipment/')
+    assert 'Content-Encoding' not in plain.headers
+    assert 'Accept-Encoding' in plain.headers['Vary']
+
+    packed = client.get('/api/equipment/', headers={'Accept-Encoding': 'gzip'})
+    assert packed.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(packed.data)) == plain.json
+    assert packed.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+
+    revalidated = client.get('/api/equipment/', headers={
+        'Accept-Encoding': 'gzip', 'If-None-Match': packed.headers['ETag']
+    })
+    assert revalidated.status_code == 304
+
+    small = client.get('/api/dashboard/stats', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
+
+
+def test_cached_dashboard_body_matches_its_etag(client):
+    from database import db
+    from models import Team
+
+    before = client.get('/api/dashboard/requests-by-team')
+    assert before.json[0]['team'] == 'Mechanics'
+
+    # A write that doesn't clear this process's cache, as one made by another worker
+    db.session.get(Team, 1).name = 'Mechanics & Welders'
+    db.session.commit()
+
+    after = client.get('/api/dashboard/requests-by-team', headers={'If-None-Match': before.headers['ETag']})
+    assert after.status_code == 200
+    assert after.json[0]['team'] == 'Mechanics & Welders'
+    assert client.get('/api/dashboard/requests-by-team',
+                      headers={'If-None-Match': after.headers['ETag']}).status_code == 304
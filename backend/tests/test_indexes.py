@@ -0,0 +1,97 @@
+"""
+Index coverage tests (run with pytest)
+"""
+
+import re
+
+from sqlalchemy import text
+
+# Small lookup tables where a full scan is cheaper than any index
+SCAN_ALLOWED = {'teams', 'team_members'}
+
+GET_ENDPOINTS = [
+    '/api/equipment/',
+    '/api/equipment/1',
+    '/api/equipment/by-team/1',
+    '/api/equipment/by-status/Usable',
+    '/api/requests/',
+    '/api/requests/?stage=New',
+    '/api/requests/?team_id=1',
+    '/api/requests/?limit=2&sort=-scheduled_date',
+    '/api/requests/1',
+    '/api/requests/by-equipment/1',
+    '/api/requests/by-stage/New',
+    '/api/requests/preventive',
+    '/api/requests/preventive?start=2024-01-01&end=2024-03-31',
+    '/api/dashboard/stats',
+    '/api/dashboard/requests-by-team',
+    '/api/dashboard/equipment-by-category',
+    '/api/dashboard/recent-activity',
+    '/api/sync/?since=1',
+]
+
+
+def full_table_scans(connection, statement, parameters):
+    plan = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+    scans = []
+    for row in plan:
+        match = re.match(r'SCAN (\w+)$', row[3])
+        if match and match.group(1) not in SCAN_ALLOWED:
+            scans.append(row[3])
+    return scans
+
+
+def test_api_queries_use_indexes(app, client, count_queries):
+    from database import db
+
+    statements = []
+    for url in GET_ENDPOINTS:
+        with count_queries() as executed:
+            assert client.get(url).status_code == 200, url
+        statements.extend((url, statement, params) for statement, params in executed)
+
+    with db.engine.connect() as connection:
+        offenders = [(url, statement, scans) for url, statement, params in statements
+                     if (scans := full_table_scans(connection, statement, params))]
+    assert offenders == []
+
+
+def test_migration_is_idempotent(app):
+    from database import db
+    from migrate import apply_indexes
+
+    with db.engine.begin() as connection:
+        connection.execute(text('DROP INDEX ix_maintenance_requests_open_scheduled'))
+
+    assert apply_indexes(db.engine) == ['ix_maintenance_requests_open_scheduled']
+    assert apply_indexes(db.engine) == []
+
+
+def test_production_app_prepares_the_database_once(tmp_path, monkeypatch, capsys):
+    import wsgi
+    from sqlalchemy import inspect
+    from app import create_app
+    from database import db
+    from models import SyncState
+
+    monkeypatch.setenv('GEARGUARD_DATABASE_URI', f"sqlite:///{tmp_path / 'production.db'}")
+
+    # Worker apps leave the schema alone
+    worker = create_app(wsgi.production_config())
+    with worker.app_context():
+        assert inspect(db.engine).get_table_names() == []
+        db.engine.dispose()
+
+    wsgi.prepare()
+    wsgi.prepare()
+    # Seeding is off in production, so there is nothing to report
+    assert capsys.readouterr().out == ''
+
+    worker = create_app(wsgi.production_config())
+    with worker.app_context():
+        inspector = inspect(db.engine)
+        assert 'ix_maintenance_requests_open_scheduled' in {
+            index['name'] for index in inspector.get_indexes('maintenance_requests')
+        }
+        assert db.session.get(SyncState, 1) is not None
+        db.engine.dispose()
@@ -0,0 +1,42 @@
+"""
+JSON provider tests (run with pytest)
+"""
+
+import json
+from datetime import date, datetime
+
+import pytest
+
+
+def test_providers_encode_alike(app, client):
+    from json_provider import StdlibJSONProvider, OrjsonProvider, orjson
+
+    if orjson is None:
+        pytest.skip('orjson is not installed')
+    assert isinstance(app.json, OrjsonProvider)
+    fast = client.get('/api/requests/')
+
+    app.json = StdlibJSONProvider(app)
+    app.json.sort_keys = False
+    slow = client.get('/api/requests/')
+    assert fast.json == slow.json
+    # Keys keep the serializers' order (JSON_SORT_KEYS is off)
+    assert list(fast.json[0]) == list(slow.json[0])
+    assert list(fast.json[0])[0] == 'id'
+
+
+def test_dates_are_iso_8601(app):
+    from json_provider import PROVIDERS
+
+    payload = {'day': date(2024, 1, 15), 'at': datetime(2024, 1, 15, 9, 30, 5, 120)}
+    for provider in PROVIDERS.values():
+        encoded = provider(app).response(payload).get_data()
+        assert json.loads(encoded) == {'day': '2024-01-15', 'at': '2024-01-15T09:30:05.000120'}
+
+
+def test_provider_setting_is_validated():
+    from json_provider import provider_class, StdlibJSONProvider
+
+    assert provider_class('stdlib') is StdlibJSONProvider
+    with pytest.raises(ValueError):
+        provider_class('simplejson')
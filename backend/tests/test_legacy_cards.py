@@ -0,0 +1,54 @@
+"""
+Streamlit card template escaping tests (run with pytest)
+"""
+
+HOSTILE = '<script>alert(1)</script> & co'
+ESCAPED = '&lt;script&gt;alert(1)&lt;/script&gt; &amp; co'
+
+
+def _assert_escaped(html, occurrences):
+    assert '<script>' not in html
+    assert html.count(ESCAPED) == occurrences
+
+
+def test_equipment_card_escapes_user_fields(legacy):
+    card_templates = legacy('card_templates')
+    html = card_templates.equipment_card({
+        'name': HOSTILE,
+        'serial_number': HOSTILE,
+        'category': HOSTILE,
+        'department': HOSTILE,
+        'location': HOSTILE,
+        'status': HOSTILE,
+        'open_requests': 3,
+    }, '#4CAF50')
+
+    _assert_escaped(html, 6)
+
+
+def test_request_cards_escape_user_fields(legacy):
+    card_templates = legacy('card_templates')
+    request = {
+        'subject': HOSTILE,
+        'equipment_name': HOSTILE,
+        'team_name': HOSTILE,
+        'assigned_technician': HOSTILE,
+        'priority': HOSTILE,
+        'scheduled_display': HOSTILE,
+        'days_until': 0,
+    }
+
+    _assert_escaped(card_templates.kanban_card(request, '#FF9800', HOSTILE, is_overdue=True), 6)
+    _assert_escaped(card_templates.upcoming_card(request, '#FF9800'), 6)
+
+
+def test_activity_item_and_badges_escape_user_fields(legacy):
+    card_templates = legacy('card_templates')
+
+    html = card_templates.activity_item({'action': HOSTILE, 'details': HOSTILE}, HOSTILE)
+    _assert_escaped(html, 3)
+    _assert_escaped(card_templates.badge(HOSTILE, '#9E9E9E'), 1)
+    _assert_escaped(card_templates.smart_button(2, HOSTILE), 1)
+
+    assert '<p class="gg-card-line"></p>' in card_templates.activity_item(
+        {'action': 'Created', 'details': None}, 'N/A')
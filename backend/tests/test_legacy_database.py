@@ -0,0 +1,161 @@
+"""
+Streamlit Database write and read helper tests (run with pytest)
+"""
+
+import sqlite3
+
+import pytest
+
+
+def _snapshot(database):
+    conn = database.get_connection()
+    return (
+        conn.execute('SELECT stage FROM maintenance_requests WHERE id = 2').fetchone()[0],
+        conn.execute('SELECT status FROM equipment WHERE id = 2').fetchone()[0],
+        conn.execute('SELECT COUNT(*) FROM activity_log').fetchone()[0],
+    )
+
+
+def test_stage_change_rolls_back_as_a_whole(legacy_db, monkeypatch):
+    before = _snapshot(legacy_db)
+    log_activity = legacy_db.log_activity
+
+    def failing_log(**entry):
+        # Fails after the stage update, the scrap and its activity row
+        if entry['action'] == 'Stage Changed':
+            raise RuntimeError('disk full')
+        log_activity(**entry)
+
+    monkeypatch.setattr(legacy_db, 'log_activity', failing_log)
+    with pytest.raises(RuntimeError, match='disk full'):
+        legacy_db.update_request_stage(2, 'Scrap')
+
+    assert _snapshot(legacy_db) == before == ('New', 'Usable', 0)
+    assert legacy_db.get_request_by_id(2)['stage'] == 'New'
+
+
+def test_caught_nested_failure_still_rolls_back(legacy_db):
+    version = legacy_db.data_version
+    with pytest.raises(RuntimeError, match='nested block failed'):
+        with legacy_db.transaction():
+            legacy_db.add_team('Partial Team')
+            try:
+                with legacy_db.transaction() as conn:
+                    conn.execute("UPDATE equipment SET status = 'Scrapped' WHERE id = 1")
+                    raise ValueError('bad row')
+            except ValueError:
+                pass
+
+    assert 'Partial Team' not in [team['name'] for team in legacy_db.get_all_teams()]
+    assert legacy_db.get_equipment_by_id(1)['status'] == 'Usable'
+    assert legacy_db.data_version == version
+
+    # The connection is usable again afterwards
+    legacy_db.add_team('Next Team')
+    assert legacy_db.data_version == version + 1
+
+
+def _memoized_reads(legacy, database):
+    """CachedReads over a plain memo standing in for st.cache_data, plus the list of real calls"""
+    memo, calls = {}, []
+
+    def cached_read(method, data_version, args, kwargs):
+        key = repr((method, data_version, args, kwargs))
+        if key not in memo:
+            calls.append(method)
+            memo[key] = getattr(database, method)(*args, **dict(kwargs))
+        return memo[key]
+
+    return legacy('database').CachedReads(database, cached_read), calls
+
+
+def test_write_misses_the_read_cache(legacy, legacy_db):
+    reads, calls = _memoized_reads(legacy, legacy_db)
+    before = reads.get_all_teams()
+    assert reads.get_all_teams() is before and calls == ['get_all_teams']
+
+    version = legacy_db.data_version
+    legacy_db.add_team('Welders')
+    assert legacy_db.data_version == version + 1
+    assert 'Welders' in [team['name'] for team in reads.get_all_teams()]
+    assert calls == ['get_all_teams', 'get_all_teams']
+
+    # Keyword arguments are part of the key too
+    assert len(reads.query_requests({'stage': 'New'}, limit=2)[0]) == 2
+    assert len(reads.query_requests({'stage': 'New'}, limit=3)[0]) == 3
+
+
+def test_rolled_back_write_keeps_the_cache(legacy, legacy_db):
+    reads, calls = _memoized_reads(legacy, legacy_db)
+    before = reads.get_all_teams()
+    version = legacy_db.data_version
+
+    with pytest.raises(sqlite3.IntegrityError):
+        legacy_db.add_team('Mechanics')  # duplicate name
+    with pytest.raises(ValueError):
+        with legacy_db.transaction():
+            legacy_db.add_team('Never Saved')
+            raise ValueError('abort')
+
+    assert legacy_db.data_version == version
+    assert reads.get_all_teams() is before and calls == ['get_all_teams']
+    assert 'Never Saved' not in [team['name'] for team in legacy_db.get_all_teams()]
+
+
+def test_open_request_counts_over_many_ids(legacy_db):
+    with legacy_db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO equipment (name, serial_number, category, department) VALUES (?, ?, 'Bulk', 'Ops')",
+            [(f'Bulk {i}', f'BULK-{i:04d}') for i in range(600)]
+        )
+        ids = [row[0] for row in conn.execute("SELECT id FROM equipment WHERE category = 'Bulk' ORDER BY id")]
+        # Two open requests on every 50th new equipment, plus a closed one that doesn't count
+        conn.executemany(
+            "INSERT INTO maintenance_requests (subject, equipment_id, request_type, scheduled_date, stage) "
+            "VALUES ('Bulk', ?, 'Corrective', '2030-01-01', ?)",
+            [(equipment_id, stage) for equipment_id in ids[::50] for stage in ('New', 'In Progress', 'Repaired')]
+        )
+
+    statements = []
+    legacy_db.get_connection().set_trace_callback(statements.append)
+    counts = legacy_db.get_open_request_counts(ids)
+    legacy_db.get_connection().set_trace_callback(None)
+
+    assert len(ids) == 600 and len(statements) == 2
+    assert counts == {equipment_id: 2 for equipment_id in ids[::50]}
+
+
+def test_open_request_counts_leave_out_idle_equipment(legacy_db):
+    # Equipment 4 has only a Repaired request, 7 has none
+    assert legacy_db.get_open_request_counts([1, 2, 4, 7]) == {1: 1, 2: 1}
+    everything = legacy_db.get_open_request_counts()
+    assert 4 not in everything and 7 not in everything
+    assert everything == legacy_db.get_open_request_counts(list(range(1, 9)))
+    assert legacy_db.get_open_request_counts([]) == {}
+
+
+def test_team_summaries_match_per_team_queries(legacy_db):
+    legacy_db.add_team('Empty Team')
+    legacy_db.add_team_member(2, 'Aaron Able', 'Apprentice')
+    legacy_db.update_request_stage(3, 'Repaired')
+
+    requests = legacy_db.get_all_requests()
+    equipment = legacy_db.get_all_equipment()
+    summaries = legacy_db.get_team_summaries()
+
+    assert [team['name'] for team in summaries] == [team['name'] for team in legacy_db.get_all_teams()]
+    for team in summaries:
+        # What the teams page used to compute per team
+        team_requests = [r for r in requests if r.get('team_id') == team['id']]
+        active = [r for r in team_requests if r['stage'] not in ['Repaired', 'Scrap']]
+        team_equipment = [e for e in equipment if e.get('team_id') == team['id']]
+
+        assert team['members'] == legacy_db.get_team_members(team['id'])
+        assert team['total_requests'] == len(team_requests)
+        assert team['active_requests'] == len(active)
+        assert team['equipment_count'] == len(team_equipment)
+
+    by_name = {team['name']: team for team in summaries}
+    assert by_name['Empty Team']['members'] == [] and by_name['Empty Team']['total_requests'] == 0
+    assert by_name['Electricians']['members'][0]['name'] == 'Aaron Able'
+    assert by_name['Electricians']['active_requests'] == 0
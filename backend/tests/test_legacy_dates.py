@@ -0,0 +1,112 @@
+"""
+Streamlit date helper, calendar window and preventive range tests (run with pytest)
+"""
+
+from datetime import date, datetime, timedelta
+
+
+def _original_format_date(date_str, format_out="%b %d, %Y"):
+    # utils.format_date as it was before the lru_cache version
+    if not date_str:
+        return "N/A"
+
+    try:
+        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+        return date_obj.strftime(format_out)
+    except:
+        return date_str
+
+
+def _add_preventive(database, *scheduled, stage='New'):
+    for day in scheduled:
+        database.add_maintenance_request({
+            'subject': f'Preventive {day}',
+            'equipment_id': 1,
+            'request_type': 'Preventive',
+            'scheduled_date': day,
+            'stage': stage,
+        })
+
+
+def _subjects(requests):
+    return [request['subject'] for request in requests]
+
+
+def test_month_window(legacy):
+    calendar_window = legacy('date_utils').calendar_window
+
+    assert calendar_window(date(2024, 12, 15)) == (date(2024, 12, 1), date(2024, 12, 31))
+    assert calendar_window(date(2024, 12, 31), 'Month', 1) == (date(2025, 1, 1), date(2025, 1, 31))
+    assert calendar_window(date(2025, 1, 1), 'Month', -1) == (date(2024, 12, 1), date(2024, 12, 31))
+    assert calendar_window(date(2024, 2, 10)) == (date(2024, 2, 1), date(2024, 2, 29))
+    assert calendar_window(date(2025, 1, 31), 'Month', 1) == (date(2025, 2, 1), date(2025, 2, 28))
+
+
+def test_quarter_window(legacy):
+    calendar_window = legacy('date_utils').calendar_window
+
+    assert calendar_window(date(2024, 11, 20), 'Quarter') == (date(2024, 10, 1), date(2024, 12, 31))
+    assert calendar_window(date(2024, 11, 20), 'Quarter', 1) == (date(2025, 1, 1), date(2025, 3, 31))
+    assert calendar_window(date(2025, 2, 1), 'Quarter', -1) == (date(2024, 10, 1), date(2024, 12, 31))
+    assert calendar_window(date(2025, 5, 5), 'Quarter', -6) == (date(2023, 10, 1), date(2023, 12, 31))
+
+
+def test_preventive_range_is_inclusive(legacy, legacy_db):
+    _add_preventive(legacy_db, '2025-01-01', '2025-01-31', '2025-02-01')
+    start, end = legacy('date_utils').calendar_window(date(2024, 12, 31), 'Month', 1)
+
+    window = legacy_db.get_preventive_requests(start, end)
+    assert _subjects(window) == ['Preventive 2025-01-01', 'Preventive 2025-01-31']
+
+    december = legacy_db.get_preventive_requests(*legacy('date_utils').calendar_window(date(2024, 12, 1)))
+    assert [request['scheduled_date'] for request in december] == \
+        ['2024-12-28', '2024-12-29', '2024-12-30', '2024-12-31']
+
+    quarter = legacy_db.get_preventive_requests(
+        *legacy('date_utils').calendar_window(date(2024, 12, 1), 'Quarter', 1))
+    assert _subjects(quarter) == _subjects(window) + ['Preventive 2025-02-01']
+
+
+def test_upcoming_preventive_requests(legacy_db):
+    today = date.today()
+    days = [(today + timedelta(days=offset)).isoformat() for offset in (-1, 0, 30, 31)]
+    _add_preventive(legacy_db, *days)
+    _add_preventive(legacy_db, today.isoformat(), stage='Repaired')
+    _add_preventive(legacy_db, today.isoformat(), stage='Scrap')
+
+    upcoming = legacy_db.get_preventive_requests(today, today + timedelta(days=30), open_only=True)
+    assert [request['scheduled_date'] for request in upcoming] == [days[1], days[2]]
+    assert all(request['request_type'] == 'Preventive' for request in upcoming)
+
+    everything = legacy_db.get_preventive_requests(today, today + timedelta(days=30))
+    assert {request['stage'] for request in everything} == {'New', 'Repaired', 'Scrap'}
+
+
+def test_format_date_matches_the_original(legacy):
+    format_date = legacy('date_utils').format_date
+    values = [None, '', '2024-12-28', '2024-02-29', '2024-1-5', '2024-12-28 10:15:00',
+              '2024-13-01', '2024-02-30', 'soon', date(2024, 12, 28), datetime(2024, 12, 28, 9)]
+
+    for value in values:
+        for format_out in ('%b %d, %Y', '%d/%m'):
+            # Twice, so the second call is answered by the cache
+            assert format_date(value, format_out) == _original_format_date(value, format_out)
+            assert format_date(value, format_out) == _original_format_date(value, format_out)
+
+
+def test_annotate_requests(legacy):
+    annotate_requests = legacy('date_utils').annotate_requests
+    today = date(2025, 1, 1)
+    rows = annotate_requests([
+        {'scheduled_date': '2024-12-31', 'stage': 'New'},
+        {'scheduled_date': '2024-12-31', 'stage': 'Repaired'},
+        {'scheduled_date': '2025-01-01', 'stage': 'In Progress'},
+        {'scheduled_date': '2025-01-31', 'stage': 'New'},
+        {'scheduled_date': None, 'stage': 'New'},
+        {'scheduled_date': '2025-02-30', 'stage': 'New'},
+    ], today)
+
+    assert [row['is_overdue'] for row in rows] == [True, False, False, False, False, False]
+    assert [row['days_until'] for row in rows] == [-1, -1, 0, 30, None, None]
+    assert [row['scheduled_display'] for row in rows] == \
+        ['Dec 31, 2024', 'Dec 31, 2024', 'Jan 01, 2025', 'Jan 31, 2025', 'N/A', '2025-02-30']
@@ -0,0 +1,107 @@
+"""
+Streamlit Database filtered query tests (run with pytest)
+"""
+
+from contextlib import contextmanager
+
+
+def _add_requests(database, count, **fields):
+    for i in range(count):
+        database.add_maintenance_request({
+            'subject': f'Paged {i}',
+            'equipment_id': 1,
+            'request_type': 'Corrective',
+            'scheduled_date': '2030-01-15',
+            **fields,
+        })
+
+
+@contextmanager
+def _traced(database):
+    statements = []
+    conn = database.get_connection()
+    conn.set_trace_callback(statements.append)
+    try:
+        yield statements
+    finally:
+        conn.set_trace_callback(None)
+
+
+def test_request_pages_cover_every_row_once(legacy_db):
+    _add_requests(legacy_db, 60)
+    everything = sorted(legacy_db.get_all_requests(), key=lambda r: (r['created_at'], r['id']), reverse=True)
+
+    pages = [legacy_db.query_requests(limit=25, offset=offset) for offset in (0, 25, 50)]
+    assert [total for _, total in pages] == [67, 67, 67]
+    assert [len(rows) for rows, _ in pages] == [25, 25, 17]
+    assert [row['id'] for rows, _ in pages for row in rows] == [row['id'] for row in everything]
+
+    # Past the end: no rows, but the real total, so the page picker can clamp
+    assert legacy_db.query_requests(limit=25, offset=100) == ([], 67)
+
+
+def test_request_filters(legacy_db):
+    _add_requests(legacy_db, 3, priority='Critical')
+
+    rows, total = legacy_db.query_requests({'stage': 'New'})
+    assert total == len(rows) == 7 and {row['stage'] for row in rows} == {'New'}
+
+    rows, total = legacy_db.query_requests({'priority': ['Critical', 'High'], 'stage': 'New'})
+    assert total == 4 and {row['priority'] for row in rows} == {'Critical', 'High'}
+
+    # The seeded requests are scheduled in 2024, the new ones in 2030
+    rows, total = legacy_db.query_requests(overdue_only=True)
+    assert total == 6 and all(row['scheduled_date'] < '2030' for row in rows)
+
+    assert legacy_db.query_requests({'stage': 'Nope'}) == ([], 0)
+
+
+def test_full_page_counts_separately(legacy_db):
+    with _traced(legacy_db) as statements:
+        assert legacy_db.query_requests(limit=5)[1] == 7
+        assert legacy_db.query_requests(limit=50)[1] == 7
+    assert not any('OVER' in statement for statement in statements)
+    # Only the full page needed a COUNT(*)
+    assert sum('COUNT(*)' in statement for statement in statements) == 1
+
+
+def test_equipment_page_counts_open_requests(legacy_db):
+    rows, total = legacy_db.query_equipment(limit=3, include_request_counts=True)
+    assert total == 8 and len(rows) == 3
+    assert all(row['open_requests'] == legacy_db.get_equipment_request_count(row['id']) for row in rows)
+    assert all(row['team_name'] for row in rows)
+
+    rows, total = legacy_db.query_equipment({'category': 'Machinery'}, limit=2, offset=2)
+    assert total == 3 and [row['category'] for row in rows] == ['Machinery']
+    assert 'open_requests' not in rows[0]
+
+    assert legacy_db.query_equipment(limit=30, offset=30) == ([], 8)
+
+
+def test_kanban_columns_are_limited_and_ordered(legacy_db):
+    stages = ['New', 'In Progress', 'Repaired', 'Scrap']
+    _add_requests(legacy_db, 4, priority='Low')
+    for i, day in enumerate(('2024-03-01', '2024-05-01', '2024-04-01')):
+        request_id = legacy_db.add_maintenance_request({
+            'subject': f'Closed {i}', 'equipment_id': 2, 'request_type': 'Corrective', 'scheduled_date': day,
+        })
+        legacy_db.update_request_stage(request_id, 'Repaired')
+
+    board = legacy_db.get_kanban_board(stages, {'Repaired': 2}, default_limit=3)
+    assert {stage: column['count'] for stage, column in board.items()} == {
+        'New': 8, 'In Progress': 2, 'Repaired': 4, 'Scrap': 0
+    }
+    assert [len(board[stage]['requests']) for stage in stages] == [3, 2, 2, 0]
+
+    # Open columns: priority, then soonest first
+    new = [(req['priority'], req['scheduled_date']) for req in board['New']['requests']]
+    assert new == [('High', '2024-12-27'), ('Medium', '2024-12-29'), ('Low', '2024-12-30')]
+    # Closed columns: priority, then most recent first
+    repaired = [(req['priority'], req['scheduled_date']) for req in board['Repaired']['requests']]
+    assert repaired == [('Critical', '2024-12-26'), ('Medium', '2024-05-01')]
+
+    # "Load more" raises one column's limit
+    more = legacy_db.get_kanban_board(stages, {'Repaired': 4}, default_limit=3)
+    assert [req['id'] for req in more['Repaired']['requests'][:2]] == \
+        [req['id'] for req in board['Repaired']['requests']]
+    assert len(more['Repaired']['requests']) == 4
@@ -0,0 +1,56 @@
+"""
+List endpoint pagination, sorting and sparse fieldset tests (run with pytest)
+"""
+
+
+def test_unpaged_list_stays_an_array(client):
+    response = client.get('/api/equipment/')
+    assert response.status_code == 200
+    assert isinstance(response.json, list)
+
+
+def test_keyset_pages_cover_every_row_once(client):
+    seen = []
+    cursor = None
+    while True:
+        params = {'limit': 2, 'sort': '-created_at'}
+        if cursor:
+            params['cursor'] = cursor
+        page = client.get('/api/requests/', query_string=params).json
+        seen.extend(item['id'] for item in page['items'])
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+
+    everything = client.get('/api/requests/', query_string={'sort': '-created_at'}).json
+    assert seen == [item['id'] for item in everything]
+    assert len(seen) == len(set(seen)) == 7
+
+
+def test_fields_and_sort(client):
+    items = client.get('/api/teams/', query_string={'fields': 'id,name', 'sort': 'name'}).json
+    assert all(set(item) == {'id', 'name'} for item in items)
+    assert [item['name'] for item in items] == sorted(item['name'] for item in items)
+
+
+def test_fields_skip_unrequested_joins(client, count_queries):
+    full = {item['id']: item for item in client.get('/api/equipment/').json}
+
+    with count_queries() as executed:
+        items = client.get('/api/equipment/', query_string={'fields': 'id,name'}).json
+    assert [sorted(item) for item in items] == [['id', 'name']] * len(full)
+    listing = [statement for statement, _ in executed if 'FROM equipment' in statement]
+    assert len(listing) == 1 and 'JOIN teams' not in listing[0] and 'count(' not in listing[0]
+
+    counts = client.get('/api/equipment/', query_string={'fields': 'request_count,id'}).json
+    assert list(counts[0]) == ['request_count', 'id']
+    assert all(item['request_count'] == full[item['id']]['request_count'] for item in counts)
+
+    requests = client.get('/api/requests/', query_string={'fields': 'id,is_overdue'}).json
+    assert all(set(item) == {'id', 'is_overdue'} for item in requests)
+
+
+def test_rejects_unknown_sort_field_and_cursor(client):
+    assert client.get('/api/equipment/?sort=notes').status_code == 400
+    assert client.get('/api/equipment/?fields=password').status_code == 400
+    assert client.get('/api/teams/members?cursor=garbage').status_code == 400
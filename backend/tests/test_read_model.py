@@ -0,0 +1,54 @@
+"""
+Request read model tests (run with pytest)
+"""
+
+
+def assert_view_matches_base_tables():
+    from models import MaintenanceRequest, RequestView
+
+    expected = {row[0].id: MaintenanceRequest.serialize_row(row)
+                for row in MaintenanceRequest.list_query()}
+    assert {view.id: view.to_dict() for view in RequestView.query} == expected
+
+
+def test_write_paths_keep_view_consistent(client):
+    new = {'equipment_id': 2, 'request_type': 'Corrective', 'scheduled_date': '2030-02-01'}
+    created = client.post('/api/requests/', json={**new, 'subject': 'Seal check'}).json
+    assert created['equipment_name'] == 'Hydraulic Press HP-200'
+    client.put(f"/api/requests/{created['id']}", json={'stage': 'In Progress'})
+    client.post('/api/requests/bulk', json=[{**new, 'subject': f'Batch {i}'} for i in range(3)])
+    client.patch('/api/requests/bulk', json=[{'id': 1, 'priority': 'Low'}, {'id': 2, 'stage': 'Repaired'}])
+    client.delete('/api/requests/3')
+    assert_view_matches_base_tables()
+
+    client.put('/api/equipment/2', json={'name': 'Press HP-250'})
+    client.put('/api/teams/1', json={'name': 'Mechanical'})
+    assert client.get(f"/api/requests/{created['id']}").json['equipment_name'] == 'Press HP-250'
+    assert {item['team_name'] for item in client.get('/api/requests/?team_id=1').json} == {'Mechanical'}
+    assert_view_matches_base_tables()
+
+    assert client.delete('/api/teams/5').status_code == 200
+    assert_view_matches_base_tables()
+
+
+def test_list_reads_one_table(client, count_queries):
+    with count_queries() as executed:
+        for url in ('/api/requests/', '/api/requests/by-stage/New', '/api/requests/1',
+                    '/api/requests/preventive?start=2024-01-01'):
+            assert client.get(url).status_code == 200
+    executed = [(statement, params) for statement, params in executed
+                if 'table_versions' not in statement]
+    assert len(executed) == 4
+    assert all('request_view' in statement and 'JOIN' not in statement
+               for statement, params in executed)
+
+
+def test_drifted_view_is_rebuilt(app):
+    from database import db
+    from models import RequestView
+    import read_model
+
+    RequestView.query.filter(RequestView.id > 4).delete()
+    db.session.commit()
+    read_model.ensure_built()
+    assert_view_matches_base_tables()
@@ -0,0 +1,87 @@
+"""
+Incremental sync tests (run with pytest)
+"""
+
+import io
+
+
+def _sync(client, since):
+    response = client.get(f'/api/sync/?since={since}')
+    assert response.status_code == 200
+    return response.json
+
+
+def test_full_snapshot_then_only_churn(client):
+    from models import MaintenanceRequest, Equipment, Team
+
+    snapshot = _sync(client, 0)
+    assert len(snapshot['changed']['requests']) == MaintenanceRequest.query.count()
+    assert len(snapshot['changed']['equipment']) == Equipment.query.count()
+    assert len(snapshot['changed']['teams']) == Team.query.count()
+    assert _sync(client, snapshot['version'])['changed']['requests'] == []
+
+    client.put('/api/requests/1', json={'stage': 'In Progress'})
+    client.put('/api/requests/2', json={'priority': 'Medium'})  # already Medium: no write
+    client.post('/api/equipment/import?format=ndjson',
+                data=io.BytesIO(b'{"name": "Pump", "serial_number": "SYNC-1", '
+                                b'"category": "Pumps", "department": "Utilities"}'))
+
+    delta = _sync(client, snapshot['version'])
+    assert [row['id'] for row in delta['changed']['requests']] == [1]
+    assert delta['changed']['requests'][0]['stage'] == 'In Progress'
+    assert [row['serial_number'] for row in delta['changed']['equipment']] == ['SYNC-1']
+    assert delta['changed']['teams'] == [] and delta['changed']['members'] == []
+    assert delta['version'] > snapshot['version']
+    assert all(row['row_version'] > snapshot['version'] for row in delta['changed']['requests'])
+
+
+def test_deletes_leave_tombstones(client):
+    version = _sync(client, 0)['version']
+    team = client.post('/api/teams/', json={'name': 'Night Shift'}).json
+    member = client.post('/api/teams/members', json={'team_id': team['id'], 'name': 'Omar'}).json
+    middle = _sync(client, version)
+    assert [row['id'] for row in middle['changed']['members']] == [member['id']]
+
+    client.delete(f"/api/teams/{team['id']}")
+    client.delete('/api/requests/3')
+
+    delta = _sync(client, middle['version'])
+    assert delta['deleted'] == {'requests': [3], 'equipment': [],
+                                'teams': [team['id']], 'members': [member['id']]}
+    assert delta['changed']['teams'] == []
+    # A full snapshot reports current rows only
+    assert _sync(client, 0)['deleted']['requests'] == []
+
+
+def test_columns_added_to_existing_tables(app):
+    from sqlalchemy import text
+    from database import db
+    from migrate import apply_columns
+
+    with db.engine.begin() as connection:
+        connection.execute(text('DROP INDEX ix_teams_row_version'))
+        connection.execute(text('ALTER TABLE teams DROP COLUMN row_version'))
+
+    assert apply_columns(db.engine) == ['teams.row_version']
+    assert apply_columns(db.engine) == []
+    with db.engine.connect() as connection:
+        assert connection.execute(text('SELECT MIN(row_version) FROM teams')).scalar() == 0
+
+
+def test_sync_rejects_bad_version(client):
+    assert client.get('/api/sync/?since=-1').status_code == 400
+    assert client.get('/api/sync/?since=abc').status_code == 400
+
+
+def test_team_delete_reports_orphaned_rows(client):
+    from models import Equipment, MaintenanceRequest
+
+    version = _sync(client, 0)['version']
+    assert client.delete('/api/teams/2').status_code == 200
+
+    delta = _sync(client, version)
+    assert [row['id'] for row in delta['changed']['equipment']] == [3]
+    assert [row['id'] for row in delta['changed']['requests']] == [3]
+    assert all(row['team_id'] is None for row in delta['changed']['equipment'] + delta['changed']['requests'])
+    assert Equipment.query.filter_by(team_id=2).count() == MaintenanceRequest.query.filter_by(team_id=2).count() == 0
+    assert delta['deleted']['teams'] == [2]
@@ -0,0 +1,41 @@
+"""
+Teams API tests (run with pytest)
+"""
+
+
+def add_staff(team_id, members, equipment):
+    from database import db
+    from models import Equipment, TeamMember
+
+    db.session.add_all(TeamMember(team_id=team_id, name=f'Tech {i}') for i in range(members))
+    db.session.add_all(Equipment(name=f'Rig {i}', serial_number=f'RIG-{team_id}-{i}', category='Rigs',
+                                 department='Production', team_id=team_id) for i in range(equipment))
+    db.session.commit()
+
+
+def test_counts_match_collections(client):
+    from models import Team
+
+    add_staff(2, members=4, equipment=6)
+    response = client.get('/api/teams/')
+    assert response.status_code == 200
+
+    expected = {team.id: (len(team.members), len(team.equipment)) for team in Team.query.all()}
+    assert {item['id']: (item['member_count'], item['equipment_count'])
+            for item in response.json} == expected
+    assert client.get('/api/teams/2').json == next(item for item in response.json if item['id'] == 2)
+    assert client.get('/api/teams/999').status_code == 404
+
+
+def test_query_count_is_constant(client, count_queries):
+    with count_queries() as small:
+        client.get('/api/teams/')
+        client.get('/api/teams/1')
+    add_staff(1, members=40, equipment=200)
+    client.post('/api/teams/', json={'name': 'Welders'})
+    with count_queries() as large:
+        teams = client.get('/api/teams/').json
+        team = client.get('/api/teams/1').json
+
+    assert len(teams) == 6 and team['equipment_count'] == 203
+    assert len(large) == len(small) == 4  # plus an ETag version lookup per request
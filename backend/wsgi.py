@@ -0,0 +1,66 @@
+"""
+GearGuard WSGI Entry Point
+Production application object for multi-worker WSGI servers
+
+    gunicorn -c gunicorn.conf.py wsgi:app     (Linux/macOS, multi-process)
+    python run.py --production                (any OS, multi-threaded waitress)
+
+Both call prepare() once before serving; the app each worker builds skips
+the schema and rebuild steps.
+
+Settings are read from environment variables:
+    GEARGUARD_DATABASE_URI      database URI (default: sqlite:///gearguard.db)
+    GEARGUARD_THREADS           request threads per worker (default: 4); also
+                                sizes each worker's connection pool
+    GEARGUARD_BUSY_TIMEOUT_MS   how long a writer waits for the SQLite lock
+                                (default: 10000)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, prepare_database
+from database import db
+
+
+def production_config():
+    """create_app overrides for serving real traffic
+    
+    Seeding and prepare_database are skipped, and each worker process gets
+    its own small pool (one connection per request thread) on top of the
+    WAL/busy_timeout settings create_app applies to SQLite.
+    """
+    threads = int(os.environ.get('GEARGUARD_THREADS', 4))
+    config = {
+        'SEED_DATABASE': False,
+        'PREPARE_DATABASE': False,
+        'SQLITE_BUSY_TIMEOUT_MS': int(os.environ.get('GEARGUARD_BUSY_TIMEOUT_MS', 10000)),
+        'SQLALCHEMY_ENGINE_OPTIONS': {
+            'pool_size': threads,
+            'max_overflow': 2,
+            'pool_timeout': 30,
+        },
+    }
+    if os.environ.get('GEARGUARD_DATABASE_URI'):
+        config['SQLALCHEMY_DATABASE_URI'] = os.environ['GEARGUARD_DATABASE_URI']
+    return config
+
+
+def prepare():
+    """Migrate the schema and build the derived tables, once per deployment"""
+    setup = create_app(production_config())
+    prepare_database(setup)
+    with setup.app_context():
+        db.engine.dispose()
+
+
+def __getattr__(name):
+    # ``app`` is built on first use, so gunicorn's master can import this
+    # module for prepare() without creating an engine its workers inherit
+    global app
+    if name == 'app':
+        app = create_app(production_config())
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
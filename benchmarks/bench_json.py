@@ -0,0 +1,114 @@
+"""
+JSON Encoding Micro-benchmark
+Time to encode serialized maintenance requests with each JSON provider
+
+Compares Flask's stock provider (what jsonify() used before
+backend/json_provider.py), the stdlib provider and the orjson provider
+on the same list of request dicts, built by the real serializer. Only the
+encoding is timed: each run is one ``provider.response(rows)`` call, which
+is what jsonify() does.
+
+Usage:
+    python benchmarks/bench_json.py                     # 10k requests
+    python benchmarks/bench_json.py --rows 100000 --repeat 5
+    python benchmarks/bench_json.py --output json.json  # also save the results
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+STAGES = ('New', 'In Progress', 'Repaired', 'Scrap')
+PRIORITIES = ('Critical', 'High', 'Medium', 'Low')
+
+
+def serialized_requests(count):
+    """``count`` request dicts shaped exactly like the list endpoint's items"""
+    from models import MaintenanceRequest
+
+    start = datetime(2024, 1, 1, 8, 0, 0)
+    rows = []
+    for i in range(1, count + 1):
+        req = MaintenanceRequest(
+            id=i, subject=f'Scheduled check #{i}', equipment_id=i % 500 + 1,
+            request_type='Preventive' if i % 3 else 'Corrective',
+            scheduled_date=date(2024, 1, 1) + timedelta(days=i % 730),
+            duration_hours=1.5, stage=STAGES[i % 4], assigned_technician=f'Technician {i % 40}',
+            team_id=i % 5 + 1, department='Production', priority=PRIORITIES[i % 4],
+            description='Inspect, lubricate and log readings', created_at=start + timedelta(minutes=i),
+            updated_at=start + timedelta(minutes=i, seconds=30), row_version=i,
+            completed_at=start + timedelta(days=1, minutes=i) if i % 4 == 2 else None,
+        )
+        rows.append(req.serialize(f'Equipment {i % 500 + 1}', f'EQ-{i % 500 + 1:05d}', f'Team {i % 5 + 1}'))
+    return rows
+
+
+def providers(app):
+    """{label: provider} for the providers available in this environment"""
+    from json_provider import PROVIDERS, orjson
+
+    found = {'flask-default (before)': DefaultJSONProvider(app)}
+    for name, provider_class in PROVIDERS.items():
+        if name == 'orjson' and orjson is None:
+            continue
+        found[name] = provider_class(app)
+        found[name].sort_keys = False  # as configured by create_app (JSON_SORT_KEYS)
+    return found
+
+
+def time_encode(provider, rows, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = provider.response(rows).get_data()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'min_ms': round(min(timings), 2),
+        'median_ms': round(statistics.median(timings), 2),
+        'bytes': len(body),
+    }
+
+
+def run(rows, repeat):
+    app = Flask(__name__)
+    with app.app_context():
+        data = serialized_requests(rows)
+        results = {label: time_encode(provider, data, repeat)
+                   for label, provider in providers(app).items()}
+    baseline = results['flask-default (before)']['median_ms']
+    for result in results.values():
+        result['speedup'] = round(baseline / result['median_ms'], 2) if result['median_ms'] else None
+    return {'rows': rows, 'repeat': repeat, 'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    args = parser.parse_args()
+
+    report = run(args.rows, args.repeat)
+    print(f"Encoding {report['rows']} serialized requests, {report['repeat']} runs each\n")
+    print(f"{'provider':<24}{'median ms':>12}{'min ms':>10}{'bytes':>12}{'speedup':>10}")
+    for label, result in report['results'].items():
+        print(f"{label:<24}{result['median_ms']:>12}{result['min_ms']:>10}"
+              f"{result['bytes']:>12}{result['speedup']:>9}x")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark Comparison
+Regressions between two benchmark suite reports
+
+A case regresses when its p95 latency or peak memory grows by more than
+the threshold (and by more than a small absolute floor, so noise on
+sub-millisecond calls does not count), when it executes more SQL
+statements, or when it now fails where it used to pass. Cases and scales
+present in only one report are ignored.
+
+Usage:
+    python benchmarks/compare.py baseline.json current.json [--threshold 0.25]
+"""
+
+import argparse
+import json
+import sys
+
+DEFAULT_THRESHOLD = 0.25
+MIN_LATENCY_MS = 1.0
+MIN_MEMORY_KIB = 64.0
+
+
+def cases(scale):
+    """Flatten one scale of a report into {'backend equipment GET /api/...': result}"""
+    flat = {}
+    for blueprint, routes in scale.get('backend', {}).items():
+        for route, result in routes.items():
+            flat[f'backend {blueprint} {route}'] = result
+    for method, result in scale.get('legacy', {}).items():
+        flat[f'legacy {method}'] = result
+    return flat
+
+
+def _grew(before, after, threshold, floor):
+    return after - before > floor and after > before * (1 + threshold)
+
+
+def regressions(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """[(scale, case, metric, before, after)] for every regression in ``current``"""
+    found = []
+    for scale_name, scale in current['scales'].items():
+        if scale_name not in baseline['scales']:
+            continue
+        before_cases = cases(baseline['scales'][scale_name])
+        for name, after in cases(scale).items():
+            before = before_cases.get(name)
+            if before is None or 'p95_ms' not in before:
+                continue
+            if 'error' in after:
+                found.append((scale_name, name, 'error', None, after['error']))
+                continue
+            if 'p95_ms' not in after:
+                continue
+            if _grew(before['p95_ms'], after['p95_ms'], threshold, MIN_LATENCY_MS):
+                found.append((scale_name, name, 'p95_ms', before['p95_ms'], after['p95_ms']))
+            if after['queries'] > before['queries']:
+                found.append((scale_name, name, 'queries', before['queries'], after['queries']))
+            if _grew(before['peak_kib'], after['peak_kib'], threshold, MIN_MEMORY_KIB):
+                found.append((scale_name, name, 'peak_kib', before['peak_kib'], after['peak_kib']))
+    return found
+
+
+def print_regressions(found):
+    if not found:
+        print('No regressions')
+        return
+    print(f'{len(found)} regression(s):')
+    for scale, name, metric, before, after in found:
+        print(f'  [{scale}] {name}: {metric} {before} -> {after}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='relative growth counted as a regression (default 0.25)')
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    found = regressions(baseline, current, args.threshold)
+    print_regressions(found)
+    sys.exit(1 if found else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+"""
+Benchmark Datasets
+Scaled synthetic GearGuard data in throwaway SQLite files
+
+A scale is a number of maintenance requests; the other tables grow with
+it (one equipment row per ten requests, one activity log entry per ten
+requests) around a fixed set of teams. Rows are generated from a fixed
+seed with dates relative to today, so a scale always has the same shape
+and date-relative routes (overdue, upcoming) hit comparable row counts on
+any day. The same rows are loaded into a backend database (through
+create_app, with counters and the request read model rebuilt afterwards)
+and into a legacy Streamlit database (through database.Database).
+"""
+
+import importlib.util
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+SCALES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+TEAMS = 20
+MEMBERS_PER_TEAM = 10
+BATCH_SIZE = 10_000
+SEED = 42
+
+CATEGORIES = ('Conveyor Systems', 'Hydraulic Equipment', 'Electrical Systems', 'IT Equipment',
+              'HVAC Systems', 'Power Systems', 'Material Handling', 'Pumps', 'Compressors',
+              'Welding', 'Lab Instruments', 'Vehicles')
+DEPARTMENTS = ('Production', 'Manufacturing', 'Facilities', 'IT', 'Warehouse', 'Logistics',
+               'Quality', 'Research')
+STAGES = (('New', 30), ('In Progress', 20), ('Repaired', 45), ('Scrap', 5))
+PRIORITIES = (('Critical', 5), ('High', 20), ('Medium', 50), ('Low', 25))
+ACTIONS = ('Maintenance Request Created', 'Stage Changed', 'Equipment Created', 'Equipment Updated')
+
+
+def table_sizes(requests):
+    """Row count per table for a dataset with ``requests`` maintenance requests"""
+    return {
+        'teams': TEAMS,
+        'team_members': TEAMS * MEMBERS_PER_TEAM,
+        'equipment': max(50, requests // 10),
+        'maintenance_requests': requests,
+        'activity_log': max(50, requests // 10),
+    }
+
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def _team_of(equipment_id):
+    return equipment_id % TEAMS + 1
+
+
+def _department_of(equipment_id):
+    return DEPARTMENTS[equipment_id % len(DEPARTMENTS)]
+
+
+def generate(requests):
+    """{table: iterator of column dicts} in insert order, ids included"""
+    sizes = table_sizes(requests)
+    today = date.today()
+    now = datetime.combine(today, datetime.min.time())
+
+    def teams():
+        for i in range(1, TEAMS + 1):
+            yield {'id': i, 'name': f'Team {i:02d}', 'description': f'Maintenance crew {i}',
+                   'created_at': now - timedelta(days=800)}
+
+    def members():
+        rng = random.Random(SEED)
+        for i in range(1, sizes['team_members'] + 1):
+            yield {'id': i, 'team_id': (i - 1) // MEMBERS_PER_TEAM + 1, 'name': f'Technician {i}',
+                   'role': rng.choice(('Technician', 'Senior Technician', 'Lead', 'Apprentice')),
+                   'email': f'tech{i}@company.com', 'phone': f'555-{i:04d}',
+                   'created_at': now - timedelta(days=rng.randrange(800))}
+
+    def equipment():
+        rng = random.Random(SEED + 1)
+        for i in range(1, sizes['equipment'] + 1):
+            purchased = today - timedelta(days=rng.randrange(365, 3650))
+            yield {'id': i, 'name': f'{CATEGORIES[i % len(CATEGORIES)]} #{i}',
+                   'serial_number': f'EQ-{i:07d}', 'category': CATEGORIES[i % len(CATEGORIES)],
+                   'department': _department_of(i), 'assigned_employee': f'Technician {i % 200 + 1}',
+                   'purchase_date': purchased, 'warranty_expiry': purchased + timedelta(days=1095),
+                   'location': f'Building {i % 12 + 1}', 'status': 'Scrapped' if rng.random() < 0.05 else 'Usable',
+                   'team_id': _team_of(i), 'notes': 'Synthetic benchmark equipment',
+                   'created_at': now - timedelta(days=rng.randrange(730), seconds=rng.randrange(86400))}
+
+    def maintenance_requests():
+        rng = random.Random(SEED + 2)
+        for i in range(1, requests + 1):
+            equipment_id = rng.randrange(1, sizes['equipment'] + 1)
+            stage = _weighted(rng, STAGES)
+            created = now - timedelta(days=rng.randrange(730), seconds=rng.randrange(86400))
+            yield {'id': i, 'subject': f'Maintenance task #{i}', 'equipment_id': equipment_id,
+                   'request_type': 'Preventive' if rng.random() < 0.6 else 'Corrective',
+                   'scheduled_date': today + timedelta(days=rng.randrange(-365, 365)),
+                   'duration_hours': rng.choice((0.5, 1.0, 2.0, 4.0)), 'stage': stage,
+                   'assigned_technician': f'Technician {rng.randrange(1, sizes["team_members"] + 1)}',
+                   'team_id': _team_of(equipment_id), 'department': _department_of(equipment_id),
+                   'priority': _weighted(rng, PRIORITIES), 'description': 'Synthetic benchmark request',
+                   'created_at': created,
+                   'completed_at': created + timedelta(days=rng.randrange(1, 30)) if stage == 'Repaired' else None}
+
+    def activity_log():
+        rng = random.Random(SEED + 3)
+        for i in range(1, sizes['activity_log'] + 1):
+            yield {'id': i, 'equipment_id': rng.randrange(1, sizes['equipment'] + 1),
+                   'request_id': rng.randrange(1, requests + 1) if requests else None,
+                   'action': rng.choice(ACTIONS), 'details': f'Synthetic activity #{i}',
+                   'created_at': now - timedelta(days=rng.randrange(730), seconds=rng.randrange(86400))}
+
+    return {
+        'teams': teams(),
+        'team_members': members(),
+        'equipment': equipment(),
+        'maintenance_requests': maintenance_requests(),
+        'activity_log': activity_log(),
+    }
+
+
+def batches(rows, size=BATCH_SIZE):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def build_backend(path, requests, config=None):
+    """Create a backend app on a new SQLite file at ``path`` holding the dataset
+
+    The dashboard cache is off so every call measures the real query.
+    Returns the app; its tables (and the derived dashboard_counters and
+    request_view) are loaded and committed.
+    """
+    from app import create_app
+    from database import db
+    from sqlalchemy import insert
+    from models import Team, TeamMember, Equipment, MaintenanceRequest, ActivityLog
+    import counters
+    import read_model
+
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+        'SEED_DATABASE': False,
+        'DASHBOARD_CACHE_TTL': 0,
+        **(config or {}),
+    })
+    models = {
+        'teams': Team,
+        'team_members': TeamMember,
+        'equipment': Equipment,
+        'maintenance_requests': MaintenanceRequest,
+        'activity_log': ActivityLog,
+    }
+    with app.app_context():
+        for table, rows in generate(requests).items():
+            for batch in batches(rows):
+                db.session.execute(insert(models[table].__table__), batch)
+                db.session.commit()
+        counters.rebuild()
+        read_model.rebuild()
+        db.session.remove()
+    return app
+
+
+def legacy_database_class():
+    """The Streamlit app's Database class (root database.py)
+
+    Loaded by path: the backend's own ``database`` module takes that name.
+    """
+    module = sys.modules.get('legacy_database')
+    if module is None:
+        spec = importlib.util.spec_from_file_location('legacy_database', os.path.join(ROOT, 'database.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['legacy_database'] = module
+        spec.loader.exec_module(module)
+    return module.Database
+
+
+def _sql_value(value):
+    return str(value) if isinstance(value, (date, datetime)) else value
+
+
+def build_legacy(path, requests):
+    """Create a legacy Database on a new SQLite file at ``path`` holding the dataset
+
+    Database() creates and seeds the schema; the demo rows are replaced by
+    the synthetic ones and request_view is rebuilt.
+    """
+    database = legacy_database_class()(str(path))
+    with database.transaction() as conn:
+        for table in ('activity_log', 'request_view', 'maintenance_requests', 'equipment',
+                      'team_members', 'teams', 'sqlite_sequence'):
+            conn.execute(f'DELETE FROM {table}')
+        for table, rows in generate(requests).items():
+            for batch in batches(rows):
+                columns = list(batch[0])
+                conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    [tuple(_sql_value(row[column]) for column in columns) for row in batch]
+                )
+    database.rebuild_request_view()
+    return database
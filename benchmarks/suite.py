@@ -0,0 +1,475 @@
+"""
+GearGuard Benchmark Suite
+Latency percentiles, query counts and peak memory per route at scale
+
+For every scale, builds the synthetic dataset (datasets.py) into a
+temporary backend database and a temporary legacy database, then
+measures:
+
+- every equipment, requests, teams and dashboard blueprint route, read
+  and write, through the Flask test client
+- the legacy Database methods the Streamlit app (app.py) calls
+
+Each case runs until ``--iterations`` samples are taken or, once
+``--min-iterations`` are in, ``--time-budget`` seconds have passed. Each
+case reports:
+
+- latency percentiles in ms
+- the most SQL statements a single call executed
+- the peak Python heap during one extra traced call (tracemalloc)
+
+The peak memory figure leaves out SQLite's own allocations. Routes whose
+response grows with a whole table (unpaginated lists, exports) are
+skipped once that table is larger than ``--full-list-max`` rows.
+
+Results are written as JSON; compare two runs with compare.py.
+
+Usage:
+    python benchmarks/suite.py                              # 10k scale
+    python benchmarks/suite.py --scales 10k,100k,1m --output results.json
+    python benchmarks/suite.py --rows 2000 --only backend   # quick custom scale
+    python benchmarks/suite.py --output new.json --compare baseline.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import datasets
+import compare
+
+Options = namedtuple('Options', 'iterations min_iterations warmup time_budget full_list_max')
+DEFAULT_OPTIONS = Options(iterations=20, min_iterations=3, warmup=1, time_budget=10.0, full_list_max=100_000)
+
+# A backend route: ``path`` and ``body`` are filled from the call's context
+# (``n`` is unique per call, ``setup`` may add e.g. an id to delete);
+# ``grows`` names the table the response size is proportional to.
+Route = namedtuple('Route', 'method path body setup grows', defaults=(None, None, None))
+
+# A legacy Database call: ``call(database, context)``
+Call = namedtuple('Call', 'call setup grows', defaults=(None, None))
+
+_unique = itertools.count(1)
+
+
+# ============ BACKEND ROUTES ============
+
+def _today():
+    return date.today().isoformat()
+
+
+def _month_window():
+    start = date.today().replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return start.isoformat(), end.isoformat()
+
+
+def _new_equipment(ctx):
+    n = ctx['n']
+    return {'name': f'Bench rig {n}', 'serial_number': f'BENCH-{n:08d}', 'category': 'Pumps',
+            'department': 'Production', 'team_id': n % datasets.TEAMS + 1}
+
+
+def _new_request(ctx, offset=0):
+    n = ctx['n'] + offset
+    return {'subject': f'Bench request {n}', 'equipment_id': n % 50 + 1,
+            'request_type': 'Corrective', 'scheduled_date': _today()}
+
+
+def _new_member(ctx):
+    n = ctx['n']
+    return {'team_id': n % datasets.TEAMS + 1, 'name': f'Bench tech {n}', 'role': 'Technician'}
+
+
+def _import_body(ctx):
+    rows = ({'name': f'Imported rig {ctx["n"]}-{i}', 'serial_number': f'IMP-{ctx["n"]:08d}-{i:03d}',
+             'category': 'Pumps', 'department': 'Production', 'team_id': i % datasets.TEAMS + 1}
+            for i in range(100))
+    return ''.join(json.dumps(row) + '\n' for row in rows).encode()
+
+
+def _created(path, body):
+    """Setup that creates a row through the API and hands its id to the timed call"""
+    def setup(client, ctx):
+        response = client.post(path, json=body(ctx))
+        assert response.status_code == 201, response.get_data(as_text=True)
+        return {'id': response.json['id']}
+    return setup
+
+
+def backend_routes():
+    """{blueprint: [Route]} covering every route of the four data blueprints"""
+    month_start, month_end = _month_window()
+    return {
+        'equipment': [
+            Route('GET', '/api/equipment/', grows='equipment'),
+            Route('GET', '/api/equipment/?limit=100'),
+            Route('GET', '/api/equipment/?limit=100&sort=name&fields=id,name,team_name,request_count'),
+            Route('GET', '/api/equipment/1'),
+            Route('GET', '/api/equipment/by-team/1'),
+            Route('GET', '/api/equipment/by-status/Scrapped'),
+            Route('GET', '/api/equipment/by-status/Usable', grows='equipment'),
+            Route('POST', '/api/equipment/', body=_new_equipment),
+            Route('POST', '/api/equipment/import?format=ndjson', body=_import_body),
+            Route('PUT', '/api/equipment/{id}', body=lambda ctx: {'location': f'Bay {ctx["n"]}'},
+                  setup=lambda client, ctx: {'id': ctx['n'] % 50 + 1}),
+            Route('PUT', '/api/equipment/{id}?rename', body=lambda ctx: {'name': f'Renamed rig {ctx["n"]}'},
+                  setup=lambda client, ctx: {'id': ctx['n'] % 50 + 1}),
+            Route('DELETE', '/api/equipment/{id}', setup=_created('/api/equipment/', _new_equipment)),
+        ],
+        'requests': [
+            Route('GET', '/api/requests/', grows='maintenance_requests'),
+            Route('GET', '/api/requests/?limit=100'),
+            Route('GET', '/api/requests/?limit=100&sort=-scheduled_date'),
+            Route('GET', '/api/requests/?stage=New&team_id=3&limit=100'),
+            Route('GET', '/api/requests/1'),
+            Route('GET', '/api/requests/by-equipment/1'),
+            Route('GET', '/api/requests/by-stage/New?limit=100'),
+            Route('GET', f'/api/requests/preventive?start={month_start}&end={month_end}'),
+            Route('GET', '/api/requests/export', grows='maintenance_requests'),
+            Route('GET', '/api/requests/export?format=csv', grows='maintenance_requests'),
+            Route('POST', '/api/requests/', body=_new_request),
+            Route('POST', '/api/requests/bulk', body=lambda ctx: [_new_request(ctx, i) for i in range(100)]),
+            Route('PUT', '/api/requests/{id}',
+                  body=lambda ctx: {'stage': ('New', 'In Progress')[ctx['n'] % 2]},
+                  setup=lambda client, ctx: {'id': ctx['n'] % 100 + 1}),
+            Route('PATCH', '/api/requests/bulk',
+                  body=lambda ctx: [{'id': i + 1, 'priority': ('High', 'Medium')[ctx['n'] % 2]}
+                                    for i in range(100)]),
+            Route('DELETE', '/api/requests/{id}', setup=_created('/api/requests/', _new_request)),
+        ],
+        'teams': [
+            Route('GET', '/api/teams/'),
+            Route('GET', '/api/teams/1'),
+            Route('GET', '/api/teams/members'),
+            Route('GET', '/api/teams/1/members'),
+            Route('POST', '/api/teams/', body=lambda ctx: {'name': f'Bench team {ctx["n"]}'}),
+            Route('PUT', '/api/teams/{id}', body=lambda ctx: {'name': f'Team {ctx["id"]:02d} / {ctx["n"]}'},
+                  setup=lambda client, ctx: {'id': ctx['n'] % datasets.TEAMS + 1}),
+            Route('DELETE', '/api/teams/{id}',
+                  setup=_created('/api/teams/', lambda ctx: {'name': f'Doomed team {ctx["n"]}'})),
+            Route('POST', '/api/teams/members', body=_new_member),
+            Route('PUT', '/api/teams/members/{id}', body=lambda ctx: {'role': f'Grade {ctx["n"] % 5}'},
+                  setup=lambda client, ctx: {'id': ctx['n'] % 100 + 1}),
+            Route('DELETE', '/api/teams/members/{id}', setup=_created('/api/teams/members', _new_member)),
+        ],
+        'dashboard': [
+            Route('GET', '/api/dashboard/stats'),
+            Route('GET', '/api/dashboard/requests-by-team'),
+            Route('GET', '/api/dashboard/equipment-by-category'),
+            Route('GET', '/api/dashboard/recent-activity?limit=10'),
+            Route('GET', '/api/dashboard/activity-log/export', grows='activity_log'),
+        ],
+    }
+
+
+# ============ LEGACY DATABASE CALLS ============
+
+def _legacy_request(ctx):
+    return {'subject': f'Bench request {ctx["n"]}', 'equipment_id': ctx['n'] % 50 + 1,
+            'request_type': 'Corrective', 'scheduled_date': _today(), 'priority': 'Medium'}
+
+
+def legacy_calls():
+    """{name: Call} for the Database methods app.py uses, with its arguments"""
+    today = date.today()
+    month_start = today.replace(day=1)
+    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    stages = ['New', 'In Progress', 'Repaired', 'Scrap']
+    return {
+        'get_dashboard_stats()': Call(lambda db, ctx: db.get_dashboard_stats()),
+        'get_requests_by_team()': Call(lambda db, ctx: db.get_requests_by_team()),
+        'get_equipment_by_category()': Call(lambda db, ctx: db.get_equipment_by_category()),
+        'get_recent_activity(limit=8)': Call(lambda db, ctx: db.get_recent_activity(limit=8)),
+        'get_all_equipment()': Call(lambda db, ctx: db.get_all_equipment(), grows='equipment'),
+        'get_equipment_by_id(1)': Call(lambda db, ctx: db.get_equipment_by_id(1)),
+        'get_distinct_values(equipment, category)': Call(
+            lambda db, ctx: db.get_distinct_values('equipment', 'category')),
+        'get_distinct_values(equipment, department)': Call(
+            lambda db, ctx: db.get_distinct_values('equipment', 'department')),
+        'query_equipment(page 1, request counts)': Call(
+            lambda db, ctx: db.query_equipment({}, limit=30, offset=0, include_request_counts=True)),
+        'query_equipment(category filter, page 3)': Call(
+            lambda db, ctx: db.query_equipment({'category': 'Pumps'}, limit=30, offset=60,
+                                               include_request_counts=True)),
+        'query_requests(page 1)': Call(lambda db, ctx: db.query_requests({}, limit=50, offset=0)),
+        'query_requests(open high priority, overdue)': Call(
+            lambda db, ctx: db.query_requests({'stage': 'New', 'priority': 'High'}, overdue_only=True,
+                                              limit=50, offset=0)),
+        'get_requests_by_equipment(1)': Call(lambda db, ctx: db.get_requests_by_equipment(1)),
+        'get_kanban_board()': Call(
+            lambda db, ctx: db.get_kanban_board(stages, {'Repaired': 10, 'Scrap': 10}, default_limit=50)),
+        'get_preventive_requests(month)': Call(
+            lambda db, ctx: db.get_preventive_requests(month_start, month_end)),
+        'get_preventive_requests(next 30 days, open)': Call(
+            lambda db, ctx: db.get_preventive_requests(today, today + timedelta(days=30), open_only=True)),
+        'get_all_teams()': Call(lambda db, ctx: db.get_all_teams()),
+        'get_team_summaries()': Call(lambda db, ctx: db.get_team_summaries()),
+        'get_all_team_members()': Call(lambda db, ctx: db.get_all_team_members()),
+        'get_team_members(1)': Call(lambda db, ctx: db.get_team_members(1)),
+        'add_equipment()': Call(lambda db, ctx: db.add_equipment(_new_equipment(ctx))),
+        'add_maintenance_request()': Call(lambda db, ctx: db.add_maintenance_request(_legacy_request(ctx))),
+        'update_request_stage()': Call(
+            lambda db, ctx: db.update_request_stage(ctx['n'] % 100 + 1, ('New', 'In Progress')[ctx['n'] % 2])),
+        'add_team()': Call(lambda db, ctx: db.add_team(f'Bench team {ctx["n"]}', 'Benchmark')),
+        'add_team_member()': Call(lambda db, ctx: db.add_team_member(ctx['n'] % datasets.TEAMS + 1,
+                                                                     f'Bench tech {ctx["n"]}', 'Technician')),
+        'remove_team_member()': Call(
+            lambda db, ctx: db.remove_team_member(ctx['id']),
+            setup=lambda db, ctx: {'id': db.add_team_member(1, f'Leaving tech {ctx["n"]}')}),
+    }
+
+
+# ============ MEASUREMENT ============
+
+def latency_stats(timings):
+    """Percentiles (ms) of a list of call durations in ms"""
+    ordered = sorted(timings)
+    if len(ordered) > 1:
+        cuts = statistics.quantiles(ordered, n=100, method='inclusive')
+        p50, p90, p95, p99 = cuts[49], cuts[89], cuts[94], cuts[98]
+    else:
+        p50 = p90 = p95 = p99 = ordered[0]
+    return {
+        'iterations': len(ordered),
+        'mean_ms': round(statistics.fmean(ordered), 3),
+        'p50_ms': round(p50, 3),
+        'p90_ms': round(p90, 3),
+        'p95_ms': round(p95, 3),
+        'p99_ms': round(p99, 3),
+        'max_ms': round(ordered[-1], 3),
+    }
+
+
+def measure(call, count_statements, options, setup=None):
+    """Run ``call(context)`` repeatedly: latency, statements per call and peak memory
+
+    ``setup(context)`` runs untimed before each call and may add to its
+    context; ``count_statements()`` is a context manager yielding the list
+    of statements executed inside it.
+    """
+    def context():
+        ctx = {'n': next(_unique)}
+        if setup:
+            ctx.update(setup(ctx))
+        return ctx
+
+    for _ in range(options.warmup):
+        call(context())
+
+    timings, statements = [], 0
+    started = time.perf_counter()
+    while len(timings) < options.iterations:
+        ctx = context()
+        with count_statements() as executed:
+            began = time.perf_counter()
+            call(ctx)
+            timings.append((time.perf_counter() - began) * 1000)
+        statements = max(statements, len(executed))
+        if len(timings) >= options.min_iterations and time.perf_counter() - started > options.time_budget:
+            break
+
+    ctx = context()
+    tracemalloc.start()
+    try:
+        call(ctx)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {**latency_stats(timings), 'queries': statements, 'peak_kib': round(peak / 1024, 1)}
+
+
+def run_cases(cases, sizes, options):
+    """{name: result} for (name, grows, measure thunk) triples, skipping oversized full lists"""
+    results = {}
+    for name, grows, run in cases:
+        if grows and sizes[grows] > options.full_list_max:
+            results[name] = {'skipped': f'{grows} has {sizes[grows]} rows (> --full-list-max)'}
+            continue
+        try:
+            results[name] = run()
+        except Exception as e:
+            results[name] = {'error': f'{type(e).__name__}: {e}'}
+        print(f"    {name:<70} {_summary(results[name])}", flush=True)
+    return results
+
+
+def _summary(result):
+    if 'p50_ms' not in result:
+        return result.get('error') or 'skipped'
+    return f"p50 {result['p50_ms']:>9.2f} ms  p95 {result['p95_ms']:>9.2f} ms  {result['queries']:>3} queries"
+
+
+def bench_backend(path, requests, sizes, options):
+    """{blueprint: {route: result}} against a backend app on a new database at ``path``"""
+    from sqlalchemy import event
+    from database import db
+
+    app = datasets.build_backend(path, requests)
+    client = app.test_client()
+    results = {}
+    with app.app_context():
+        @contextmanager
+        def count_statements():
+            executed = []
+
+            def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+                executed.append(statement)
+
+            event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+            try:
+                yield executed
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+        def runner(route):
+            def call(ctx):
+                kwargs = {}
+                if route.body:
+                    body = route.body(ctx)
+                    kwargs = {'data': body} if isinstance(body, bytes) else {'json': body}
+                response = client.open(route.path.format(**ctx), method=route.method, **kwargs)
+                response.get_data()  # drains streamed exports
+                if response.status_code >= 400:
+                    raise RuntimeError(f'{response.status_code}: {response.get_data(as_text=True)[:200]}')
+                response.close()
+
+            setup = (lambda ctx: route.setup(client, ctx)) if route.setup else None
+            return lambda: measure(call, count_statements, options, setup)
+
+        for blueprint, routes in backend_routes().items():
+            print(f'  backend / {blueprint}', flush=True)
+            results[blueprint] = run_cases(
+                [(f'{route.method} {route.path}', route.grows, runner(route)) for route in routes],
+                sizes, options)
+        db.session.remove()
+        db.engine.dispose()
+    return results
+
+
+def bench_legacy(path, requests, sizes, options):
+    """{method: result} against a legacy Database on a new database at ``path``"""
+    database = datasets.build_legacy(path, requests)
+
+    @contextmanager
+    def count_statements():
+        executed = []
+        connection = database.get_connection()
+        connection.set_trace_callback(executed.append)
+        try:
+            yield executed
+        finally:
+            connection.set_trace_callback(None)
+
+    def runner(spec):
+        setup = (lambda ctx: spec.setup(database, ctx)) if spec.setup else None
+        return lambda: measure(lambda ctx: spec.call(database, ctx), count_statements, options, setup)
+
+    print('  legacy / Database', flush=True)
+    try:
+        return run_cases([(name, spec.grows, runner(spec)) for name, spec in legacy_calls().items()],
+                         sizes, options)
+    finally:
+        database.close()
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=datasets.ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales, options=DEFAULT_OPTIONS, targets=('backend', 'legacy')):
+    """Benchmark every {name: request count} scale and return the report"""
+    from json_provider import orjson
+
+    report = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'json_provider': 'orjson' if orjson is not None else 'stdlib',
+            'options': options._asdict(),
+        },
+        'scales': {},
+    }
+    for name, requests in scales.items():
+        sizes = datasets.table_sizes(requests)
+        print(f"Scale {name}: {', '.join(f'{table}={count}' for table, count in sizes.items())}", flush=True)
+        scale = {'rows': sizes}
+        with tempfile.TemporaryDirectory(prefix=f'gearguard-bench-{name}-') as workdir:
+            for target, bench in (('backend', bench_backend), ('legacy', bench_legacy)):
+                if target not in targets:
+                    continue
+                started = time.perf_counter()
+                scale[target] = bench(os.path.join(workdir, f'{target}.db'), requests, sizes, options)
+                scale[f'{target}_seconds'] = round(time.perf_counter() - started, 1)
+        report['scales'][name] = scale
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--scales', default='10k',
+                        help=f"comma-separated scales out of {', '.join(datasets.SCALES)} (default 10k)")
+    parser.add_argument('--rows', type=int, help='run one custom scale with this many requests instead')
+    parser.add_argument('--only', choices=('backend', 'legacy'), help='benchmark one tier only')
+    parser.add_argument('--iterations', type=int, default=DEFAULT_OPTIONS.iterations)
+    parser.add_argument('--min-iterations', type=int, default=DEFAULT_OPTIONS.min_iterations)
+    parser.add_argument('--warmup', type=int, default=DEFAULT_OPTIONS.warmup)
+    parser.add_argument('--time-budget', type=float, default=DEFAULT_OPTIONS.time_budget,
+                        help='seconds per case before stopping early (after --min-iterations)')
+    parser.add_argument('--full-list-max', type=int, default=DEFAULT_OPTIONS.full_list_max,
+                        help='skip unpaginated lists / exports of tables larger than this')
+    parser.add_argument('--output', help='write the JSON report to this file')
+    parser.add_argument('--compare', metavar='BASELINE', help='report regressions against a previous run')
+    parser.add_argument('--threshold', type=float, default=compare.DEFAULT_THRESHOLD,
+                        help='relative slowdown / memory growth counted as a regression')
+    args = parser.parse_args()
+
+    if args.rows:
+        scales = {str(args.rows): args.rows}
+    else:
+        names = [name.strip().lower() for name in args.scales.split(',') if name.strip()]
+        unknown = [name for name in names if name not in datasets.SCALES]
+        if unknown:
+            parser.error(f"unknown scale(s): {', '.join(unknown)}")
+        scales = {name: datasets.SCALES[name] for name in names}
+
+    options = Options(args.iterations, args.min_iterations, args.warmup, args.time_budget, args.full_list_max)
+    report = run(scales, options, (args.only,) if args.only else ('backend', 'legacy'))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'\nResults written to {args.output}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare.regressions(baseline, report, args.threshold)
+        compare.print_regressions(regressions)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
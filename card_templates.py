@@ -0,0 +1,125 @@
+"""
+GearGuard - Card Templates
+Compact HTML templates for badges, smart buttons and the card views
+
+Card styling lives in styles.css (the gg-* classes), so a rendered card
+carries only its data and at most one per-card colour. Templates are
+plain format strings built once at import, and every user-controlled
+field is escaped before it is substituted.
+"""
+
+from html import escape
+from typing import Callable, Dict, Iterable
+
+BADGE = '<span class="gg-badge" style="background:{color}">{text}</span>'
+
+SMART_BUTTON = ('<div class="gg-smart-button"><span class="gg-smart-count">{count}</span>'
+                '<span class="gg-smart-label">{label}</span></div>')
+
+OVERDUE_BADGE = '<span class="gg-overdue-badge">OVERDUE</span>'
+
+KANBAN_CARD = (
+    '<div class="gg-kanban-card{overdue_class}">'
+    '<div class="gg-card-head"><h4>{subject}</h4>{overdue_badge}</div>'
+    '<p class="gg-card-line"><strong>{equipment}</strong></p>'
+    '<div class="gg-card-foot">'
+    '<div class="gg-tech"><div class="gg-avatar">{avatar}</div><span>{technician}</span></div>'
+    '<span class="gg-pill" style="background:{priority_color}">{priority}</span>'
+    '</div>'
+    '<div class="gg-card-date">📅 {date}</div>'
+    '</div>'
+)
+
+EQUIPMENT_CARD = (
+    '<div class="equipment-card gg-equipment-card">'
+    '<h4>{name}</h4>'
+    '<p class="gg-card-line"><strong>SN:</strong> {serial_number}</p>'
+    '<p class="gg-card-line"><strong>Category:</strong> {category}</p>'
+    '<p class="gg-card-line"><strong>Department:</strong> {department}</p>'
+    '<p class="gg-card-line"><strong>Location:</strong> {location}</p>'
+    '<div class="gg-card-row">{status_badge}</div>'
+    '<div class="gg-card-row">{open_requests}</div>'
+    '</div>'
+)
+
+UPCOMING_CARD = (
+    '<div class="gg-upcoming-card" style="border-left-color:{priority_color}">'
+    '<div><h4>{subject}</h4>'
+    '<p class="gg-card-line"><strong>Equipment:</strong> {equipment} | '
+    '<strong>Team:</strong> {team} | <strong>Technician:</strong> {technician}</p></div>'
+    '<div class="gg-upcoming-when">'
+    '<span class="gg-pill" style="background:{priority_color}">{priority}</span>'
+    '<div class="gg-card-line">📅 {date}</div>'
+    '<div class="gg-card-date">{countdown}</div>'
+    '</div>'
+    '</div>'
+)
+
+ACTIVITY_ITEM = (
+    '<div class="activity-item">'
+    '<strong>{action}</strong>'
+    '<p class="gg-card-line">{details}</p>'
+    '<span class="gg-card-date">{timestamp}</span>'
+    '</div>'
+)
+
+
+def badge(text, color: str) -> str:
+    return BADGE.format(text=escape(str(text)), color=color)
+
+
+def smart_button(count, label: str) -> str:
+    return SMART_BUTTON.format(count=count, label=escape(label))
+
+
+def kanban_card(request: Dict, priority_color: str, avatar: str, is_overdue: bool = False) -> str:
+    return KANBAN_CARD.format(
+        overdue_class=' overdue' if is_overdue else '',
+        overdue_badge=OVERDUE_BADGE if is_overdue else '',
+        subject=escape(request.get('subject') or 'N/A'),
+        equipment=escape(request.get('equipment_name') or 'N/A'),
+        avatar=escape(avatar),
+        technician=escape(request.get('assigned_technician') or 'Unassigned'),
+        priority_color=priority_color,
+        priority=escape(request.get('priority') or 'Medium'),
+        date=escape(request.get('scheduled_display') or 'N/A'),
+    )
+
+
+def equipment_card(equipment: Dict, status_color: str) -> str:
+    return EQUIPMENT_CARD.format(
+        name=escape(equipment['name']),
+        serial_number=escape(equipment['serial_number']),
+        category=escape(equipment['category']),
+        department=escape(equipment['department']),
+        location=escape(equipment.get('location') or 'N/A'),
+        status_badge=badge(equipment['status'], status_color),
+        open_requests=smart_button(equipment.get('open_requests', 0), 'Open Requests'),
+    )
+
+
+def upcoming_card(request: Dict, priority_color: str) -> str:
+    days_until = request.get('days_until')
+    return UPCOMING_CARD.format(
+        priority_color=priority_color,
+        subject=escape(request['subject']),
+        equipment=escape(request.get('equipment_name') or 'N/A'),
+        team=escape(request.get('team_name') or 'N/A'),
+        technician=escape(request.get('assigned_technician') or 'Not Assigned'),
+        priority=escape(request['priority']),
+        date=escape(request.get('scheduled_display') or 'N/A'),
+        countdown='Today!' if days_until == 0 else f'In {days_until} days',
+    )
+
+
+def activity_item(activity: Dict, timestamp: str) -> str:
+    return ACTIVITY_ITEM.format(
+        action=escape(activity['action']),
+        details=escape(activity.get('details') or ''),
+        timestamp=escape(timestamp),
+    )
+
+
+def render_cards(render: Callable[[Dict], str], rows: Iterable[Dict]) -> str:
+    """Render every row with one card function and join them into a single block"""
+    return ''.join(map(render, rows))
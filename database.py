@@ -4,255 +4,499 @@ Handles SQLite database operations, schema creation, and data management
 """
 
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime, date
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import json
 
+# Managed secondary indexes, kept in sync with backend/models.py.
+# The partial indexes only cover open requests; queries must repeat the
+# exact "stage NOT IN ('Repaired', 'Scrap')" predicate for SQLite to use them.
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_equipment_team_id ON equipment (team_id)",
+    "CREATE INDEX IF NOT EXISTS ix_equipment_status ON equipment (status)",
+    "CREATE INDEX IF NOT EXISTS ix_equipment_category ON equipment (category)",
+    "CREATE INDEX IF NOT EXISTS ix_equipment_created_at ON equipment (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_team_members_team_id ON team_members (team_id)",
+    "CREATE INDEX IF NOT EXISTS ix_maintenance_requests_stage_scheduled ON maintenance_requests (stage, scheduled_date)",
+    "CREATE INDEX IF NOT EXISTS ix_maintenance_requests_team_id ON maintenance_requests (team_id)",
+    "CREATE INDEX IF NOT EXISTS ix_maintenance_requests_equipment_stage ON maintenance_requests (equipment_id, stage)",
+    "CREATE INDEX IF NOT EXISTS ix_maintenance_requests_created_at ON maintenance_requests (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_maintenance_requests_type_scheduled ON maintenance_requests (request_type, scheduled_date)",
+    "CREATE INDEX IF NOT EXISTS ix_maintenance_requests_open_scheduled ON maintenance_requests (scheduled_date) "
+    "WHERE (stage NOT IN ('Repaired', 'Scrap'))",
+    "CREATE INDEX IF NOT EXISTS ix_maintenance_requests_open_priority ON maintenance_requests (priority) "
+    "WHERE (stage NOT IN ('Repaired', 'Scrap'))",
+    "CREATE INDEX IF NOT EXISTS ix_activity_log_created_at ON activity_log (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_request_view_stage_scheduled ON request_view (stage, scheduled_date)",
+    "CREATE INDEX IF NOT EXISTS ix_request_view_team_id ON request_view (team_id)",
+    "CREATE INDEX IF NOT EXISTS ix_request_view_equipment_stage ON request_view (equipment_id, stage)",
+    "CREATE INDEX IF NOT EXISTS ix_request_view_created_at ON request_view (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_request_view_scheduled_date ON request_view (scheduled_date)",
+    "CREATE INDEX IF NOT EXISTS ix_request_view_type_scheduled ON request_view (request_type, scheduled_date)",
+]
+
+# request_view is a read model: each maintenance request with its equipment
+# name/serial and team name copied in, so request reads hit one table.
+# Write methods refresh the rows they affect with REQUEST_VIEW_REFRESH.
+REQUEST_COLUMNS = ('id', 'subject', 'equipment_id', 'request_type', 'scheduled_date', 'duration_hours',
+                   'stage', 'assigned_technician', 'team_id', 'department', 'priority', 'description',
+                   'created_at', 'completed_at')
+REQUEST_VIEW_REFRESH = f"""
+    INSERT OR REPLACE INTO request_view
+    SELECT {', '.join('mr.' + column for column in REQUEST_COLUMNS)},
+           e.name, e.serial_number, t.name
+    FROM maintenance_requests mr
+    LEFT JOIN equipment e ON mr.equipment_id = e.id
+    LEFT JOIN teams t ON mr.team_id = t.id
+"""
+
+# Per-connection tuning applied when a thread opens its pooled connection
+PRAGMAS = [
+    "PRAGMA journal_mode=WAL",       # readers don't block the writer
+    "PRAGMA synchronous=NORMAL",     # fsync at checkpoints only (safe with WAL)
+    "PRAGMA cache_size=-20000",      # ~20 MB page cache
+    "PRAGMA mmap_size=268435456",    # 256 MB memory-mapped reads
+    "PRAGMA temp_store=MEMORY",
+]
+
+# Filterable columns for query_equipment / query_requests, and the
+# whitelisted (table, column) pairs get_distinct_values may read
+EQUIPMENT_FILTERS = {
+    'status': 'e.status',
+    'category': 'e.category',
+    'department': 'e.department',
+    'team_id': 'e.team_id',
+}
+REQUEST_FILTERS = {
+    'stage': 'mr.stage',
+    'request_type': 'mr.request_type',
+    'priority': 'mr.priority',
+    'team_id': 'mr.team_id',
+    'equipment_id': 'mr.equipment_id',
+}
+FACETS = {
+    'equipment': ('status', 'category', 'department'),
+    'maintenance_requests': ('stage', 'request_type', 'priority'),
+}
+
+def build_where(filters: Optional[Dict], columns: Dict[str, str]) -> Tuple[List[str], List]:
+    """Turn {name: value} filters into parameterized SQL conditions
+    
+    None values are skipped; lists and tuples become IN (...). Only names
+    present in ``columns`` are accepted, so no caller text reaches the SQL.
+    """
+    conditions, params = [], []
+    for name, value in (filters or {}).items():
+        if value is None:
+            continue
+        if name not in columns:
+            raise ValueError(f"Unknown filter '{name}'")
+        if isinstance(value, (list, tuple)):
+            conditions.append(f"{columns[name]} IN ({', '.join('?' * len(value))})")
+            params.extend(value)
+        else:
+            conditions.append(f"{columns[name]} = ?")
+            params.append(value)
+    return conditions, params
+
+class CachedReads:
+    """Drop-in for a Database's read methods (get_* / query_*) served through a cache
+    
+    ``cached_read(method, data_version, args, kwargs)`` is a memoized
+    function that calls the method (st.cache_data in app.py). Its key
+    includes data_version, so the first read after any committed write
+    misses the cache.
+    """
+    
+    def __init__(self, database, cached_read):
+        self._database = database
+        self._cached_read = cached_read
+    
+    def __getattr__(self, name):
+        if not name.startswith(('get_', 'query_')):
+            raise AttributeError(name)
+        
+        def read(*args, **kwargs):
+            return self._cached_read(name, self._database.data_version, args, tuple(sorted(kwargs.items())))
+        return read
+
 class Database:
-    def __init__(self, db_name: str = "gearguard.db"):
+    def __init__(self, db_name: str = "gearguard.db", timeout: float = 5.0):
         self.db_name = db_name
+        self.timeout = timeout
+        self._local = threading.local()
+        self._version = 0
+        self._version_lock = threading.Lock()
         self.init_database()
     
     def get_connection(self):
-        """Create a database connection"""
-        conn = sqlite3.connect(self.db_name)
-        conn.row_factory = sqlite3.Row
+        """Get this thread's pooled database connection
+        
+        Each thread keeps one connection open for the life of the thread
+        instead of reconnecting per call. Connections run in autocommit
+        mode; writes are grouped with transaction().
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_name, timeout=self.timeout, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            self._local.depth = 0
         return conn
     
+    @contextmanager
+    def transaction(self):
+        """Run a block of writes as one atomic commit
+        
+        Nested blocks (e.g. update_request_stage -> scrap_equipment ->
+        log_activity) join the outermost transaction, so a logical
+        operation commits once or rolls back entirely. A nested block that
+        fails marks the whole transaction rollback-only: even if a caller
+        catches the error, the outermost block rolls back and raises
+        RuntimeError instead of committing the partial writes.
+        """
+        conn = self.get_connection()
+        outermost = self._local.depth == 0
+        if outermost:
+            conn.execute('BEGIN IMMEDIATE')
+            self._local.rollback_only = False
+        self._local.depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth -= 1
+            if outermost:
+                conn.execute('ROLLBACK')
+            else:
+                self._local.rollback_only = True
+            raise
+        self._local.depth -= 1
+        if outermost:
+            if self._local.rollback_only:
+                conn.execute('ROLLBACK')
+                raise RuntimeError('Transaction rolled back: a nested block failed')
+            conn.execute('COMMIT')
+            self._bump_version()
+    
+    @property
+    def data_version(self) -> int:
+        """Stamp that changes whenever this Database commits a write
+        
+        Read caches include it in their key, so every write method
+        (add_equipment, update_request_stage, add_team_member, ...)
+        invalidates them through transaction().
+        """
+        return self._version
+    
+    def _bump_version(self):
+        with self._version_lock:
+            self._version += 1
+    
+    def close(self):
+        """Close this thread's pooled connection (reopened on next use)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
     def init_database(self):
         """Initialize database with all required tables"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Teams Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS teams (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                description TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Team Members Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS team_members (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                team_id INTEGER NOT NULL,
-                name TEXT NOT NULL,
-                role TEXT,
-                email TEXT,
-                phone TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (team_id) REFERENCES teams(id) ON DELETE CASCADE
-            )
-        ''')
-        
-        # Equipment Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS equipment (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                serial_number TEXT UNIQUE NOT NULL,
-                category TEXT NOT NULL,
-                department TEXT NOT NULL,
-                assigned_employee TEXT,
-                purchase_date DATE,
-                warranty_expiry DATE,
-                location TEXT,
-                status TEXT DEFAULT 'Usable',
-                team_id INTEGER,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (team_id) REFERENCES teams(id)
-            )
-        ''')
-        
-        # Maintenance Requests Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS maintenance_requests (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                subject TEXT NOT NULL,
-                equipment_id INTEGER NOT NULL,
-                request_type TEXT NOT NULL,
-                scheduled_date DATE NOT NULL,
-                duration_hours REAL DEFAULT 1.0,
-                stage TEXT DEFAULT 'New',
-                assigned_technician TEXT,
-                team_id INTEGER,
-                department TEXT,
-                priority TEXT DEFAULT 'Medium',
-                description TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                completed_at TIMESTAMP,
-                FOREIGN KEY (equipment_id) REFERENCES equipment(id),
-                FOREIGN KEY (team_id) REFERENCES teams(id)
-            )
-        ''')
-        
-        # Activity Log Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS activity_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                equipment_id INTEGER,
-                request_id INTEGER,
-                action TEXT NOT NULL,
-                details TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (equipment_id) REFERENCES equipment(id),
-                FOREIGN KEY (request_id) REFERENCES maintenance_requests(id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Teams Table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS teams (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT UNIQUE NOT NULL,
+                    description TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Team Members Table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS team_members (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    team_id INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    role TEXT,
+                    email TEXT,
+                    phone TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (team_id) REFERENCES teams(id) ON DELETE CASCADE
+                )
+            ''')
+            
+            # Equipment Table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS equipment (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    serial_number TEXT UNIQUE NOT NULL,
+                    category TEXT NOT NULL,
+                    department TEXT NOT NULL,
+                    assigned_employee TEXT,
+                    purchase_date DATE,
+                    warranty_expiry DATE,
+                    location TEXT,
+                    status TEXT DEFAULT 'Usable',
+                    team_id INTEGER,
+                    notes TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (team_id) REFERENCES teams(id)
+                )
+            ''')
+            
+            # Maintenance Requests Table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS maintenance_requests (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    subject TEXT NOT NULL,
+                    equipment_id INTEGER NOT NULL,
+                    request_type TEXT NOT NULL,
+                    scheduled_date DATE NOT NULL,
+                    duration_hours REAL DEFAULT 1.0,
+                    stage TEXT DEFAULT 'New',
+                    assigned_technician TEXT,
+                    team_id INTEGER,
+                    department TEXT,
+                    priority TEXT DEFAULT 'Medium',
+                    description TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    completed_at TIMESTAMP,
+                    FOREIGN KEY (equipment_id) REFERENCES equipment(id),
+                    FOREIGN KEY (team_id) REFERENCES teams(id)
+                )
+            ''')
+            
+            # Activity Log Table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS activity_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    equipment_id INTEGER,
+                    request_id INTEGER,
+                    action TEXT NOT NULL,
+                    details TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (equipment_id) REFERENCES equipment(id),
+                    FOREIGN KEY (request_id) REFERENCES maintenance_requests(id)
+                )
+            ''')
+            
+            # Request read model (same columns as the backend's request_view)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS request_view (
+                    id INTEGER PRIMARY KEY,
+                    subject TEXT NOT NULL,
+                    equipment_id INTEGER NOT NULL,
+                    request_type TEXT NOT NULL,
+                    scheduled_date DATE NOT NULL,
+                    duration_hours REAL,
+                    stage TEXT,
+                    assigned_technician TEXT,
+                    team_id INTEGER,
+                    department TEXT,
+                    priority TEXT,
+                    description TEXT,
+                    created_at TIMESTAMP,
+                    completed_at TIMESTAMP,
+                    equipment_name TEXT,
+                    equipment_serial TEXT,
+                    team_name TEXT
+                )
+            ''')
+            
+            # Secondary indexes (same names as the backend models declare)
+            for statement in INDEXES:
+                cursor.execute(statement)
         
         # Initialize with sample data if tables are empty
         self.seed_data()
+        self.ensure_request_view()
     
     def seed_data(self):
         """Seed database with initial data if empty"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Check if teams exist
-        cursor.execute("SELECT COUNT(*) FROM teams")
-        if cursor.fetchone()[0] == 0:
-            teams = [
-                ('Mechanics', 'Mechanical equipment maintenance'),
-                ('Electricians', 'Electrical systems and wiring'),
-                ('IT Support', 'Computer and network equipment'),
-                ('HVAC', 'Heating, ventilation, and air conditioning'),
-                ('Facilities', 'Building and general maintenance')
-            ]
-            cursor.executemany('INSERT INTO teams (name, description) VALUES (?, ?)', teams)
-        
-        # Check if equipment exists
-        cursor.execute("SELECT COUNT(*) FROM equipment")
-        if cursor.fetchone()[0] == 0:
-            equipment = [
-                ('CNC Machine A1', 'CNC-2024-001', 'Machinery', 'Production', 'John Smith', 
-                 '2024-01-15', '2026-01-15', 'Factory Floor A', 'Usable', 1),
-                ('Hydraulic Press B2', 'HYD-2024-002', 'Machinery', 'Production', 'Jane Doe', 
-                 '2024-02-20', '2026-02-20', 'Factory Floor B', 'Usable', 1),
-                ('Industrial Generator', 'GEN-2024-003', 'Electrical', 'Maintenance', 'Mike Johnson', 
-                 '2024-03-10', '2027-03-10', 'Power Room', 'Usable', 2),
-                ('Server Rack Main', 'SRV-2024-004', 'IT Equipment', 'IT Department', 'Sarah Williams', 
-                 '2024-04-05', '2027-04-05', 'Data Center', 'Usable', 3),
-                ('HVAC Unit North', 'HVAC-2024-005', 'Climate Control', 'Facilities', 'Robert Brown', 
-                 '2024-05-12', '2026-05-12', 'Roof North', 'Usable', 4),
-                ('Conveyor Belt C3', 'CNV-2024-006', 'Machinery', 'Production', 'Emily Davis', 
-                 '2024-06-18', '2026-06-18', 'Factory Floor C', 'Usable', 1),
-                ('Backup Generator', 'GEN-2024-007', 'Electrical', 'Maintenance', 'David Wilson', 
-                 '2024-07-22', '2027-07-22', 'Power Room', 'Usable', 2),
-                ('Forklift FL-12', 'FRK-2024-008', 'Vehicles', 'Logistics', 'Lisa Anderson', 
-                 '2024-08-30', '2025-08-30', 'Warehouse A', 'Usable', 5),
-            ]
-            cursor.executemany('''
-                INSERT INTO equipment (name, serial_number, category, department, assigned_employee,
-                                     purchase_date, warranty_expiry, location, status, team_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', equipment)
-        
-        # Check if maintenance requests exist
-        cursor.execute("SELECT COUNT(*) FROM maintenance_requests")
-        if cursor.fetchone()[0] == 0:
-            requests = [
-                ('Monthly Oil Change', 1, 'Preventive', '2024-12-28', 2.0, 'In Progress', 
-                 'John Smith', 1, 'Production', 'Medium', 'Regular monthly maintenance'),
-                ('Hydraulic Leak Repair', 2, 'Corrective', '2024-12-27', 4.0, 'New', 
-                 'Jane Doe', 1, 'Production', 'High', 'Oil leak detected on hydraulic press'),
-                ('Generator Load Test', 3, 'Preventive', '2024-12-29', 3.0, 'New', 
-                 'Mike Johnson', 2, 'Maintenance', 'Medium', 'Quarterly load test'),
-                ('Server Cooling Issue', 4, 'Corrective', '2024-12-26', 2.0, 'Repaired', 
-                 'Sarah Williams', 3, 'IT Department', 'Critical', 'Server overheating detected'),
-                ('HVAC Filter Replacement', 5, 'Preventive', '2024-12-30', 1.5, 'New', 
-                 'Robert Brown', 4, 'Facilities', 'Low', 'Scheduled filter replacement'),
-                ('Conveyor Belt Alignment', 6, 'Corrective', '2024-12-27', 3.0, 'In Progress', 
-                 'Emily Davis', 1, 'Production', 'High', 'Belt misalignment causing jams'),
-                ('Forklift Battery Check', 8, 'Preventive', '2024-12-31', 1.0, 'New', 
-                 'Lisa Anderson', 5, 'Logistics', 'Low', 'Weekly battery inspection'),
-            ]
-            cursor.executemany('''
-                INSERT INTO maintenance_requests (subject, equipment_id, request_type, scheduled_date,
-                                                 duration_hours, stage, assigned_technician, team_id,
-                                                 department, priority, description)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', requests)
-        
-        # Check if team members exist
-        cursor.execute("SELECT COUNT(*) FROM team_members")
-        if cursor.fetchone()[0] == 0:
-            team_members = [
-                # Mechanics Team (team_id=1)
-                (1, 'John Smith', 'Senior Technician', 'john.smith@company.com', '555-0101'),
-                (1, 'Jane Doe', 'Mechanic Lead', 'jane.doe@company.com', '555-0102'),
-                (1, 'Emily Davis', 'Technician', 'emily.davis@company.com', '555-0103'),
-                (1, 'Tom Baker', 'Apprentice', 'tom.baker@company.com', '555-0104'),
-                # Electricians Team (team_id=2)
-                (2, 'Mike Johnson', 'Master Electrician', 'mike.johnson@company.com', '555-0201'),
-                (2, 'David Wilson', 'Electrician', 'david.wilson@company.com', '555-0202'),
-                (2, 'Chris Martin', 'Electrical Technician', 'chris.martin@company.com', '555-0203'),
-                # IT Support Team (team_id=3)
-                (3, 'Sarah Williams', 'IT Manager', 'sarah.williams@company.com', '555-0301'),
-                (3, 'Alex Turner', 'System Administrator', 'alex.turner@company.com', '555-0302'),
-                (3, 'Nina Patel', 'IT Support Specialist', 'nina.patel@company.com', '555-0303'),
-                # HVAC Team (team_id=4)
-                (4, 'Robert Brown', 'HVAC Technician', 'robert.brown@company.com', '555-0401'),
-                (4, 'James Lee', 'HVAC Specialist', 'james.lee@company.com', '555-0402'),
-                # Facilities Team (team_id=5)
-                (5, 'Lisa Anderson', 'Facilities Manager', 'lisa.anderson@company.com', '555-0501'),
-                (5, 'Mark Thompson', 'Maintenance Worker', 'mark.thompson@company.com', '555-0502'),
-            ]
-            cursor.executemany('''
-                INSERT INTO team_members (team_id, name, role, email, phone)
-                VALUES (?, ?, ?, ?, ?)
-            ''', team_members)
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Check if teams exist
+            cursor.execute("SELECT COUNT(*) FROM teams")
+            if cursor.fetchone()[0] == 0:
+                teams = [
+                    ('Mechanics', 'Mechanical equipment maintenance'),
+                    ('Electricians', 'Electrical systems and wiring'),
+                    ('IT Support', 'Computer and network equipment'),
+                    ('HVAC', 'Heating, ventilation, and air conditioning'),
+                    ('Facilities', 'Building and general maintenance')
+                ]
+                cursor.executemany('INSERT INTO teams (name, description) VALUES (?, ?)', teams)
+            
+            # Check if equipment exists
+            cursor.execute("SELECT COUNT(*) FROM equipment")
+            if cursor.fetchone()[0] == 0:
+                equipment = [
+                    ('CNC Machine A1', 'CNC-2024-001', 'Machinery', 'Production', 'John Smith', 
+                     '2024-01-15', '2026-01-15', 'Factory Floor A', 'Usable', 1),
+                    ('Hydraulic Press B2', 'HYD-2024-002', 'Machinery', 'Production', 'Jane Doe', 
+                     '2024-02-20', '2026-02-20', 'Factory Floor B', 'Usable', 1),
+                    ('Industrial Generator', 'GEN-2024-003', 'Electrical', 'Maintenance', 'Mike Johnson', 
+                     '2024-03-10', '2027-03-10', 'Power Room', 'Usable', 2),
+                    ('Server Rack Main', 'SRV-2024-004', 'IT Equipment', 'IT Department', 'Sarah Williams', 
+                     '2024-04-05', '2027-04-05', 'Data Center', 'Usable', 3),
+                    ('HVAC Unit North', 'HVAC-2024-005', 'Climate Control', 'Facilities', 'Robert Brown', 
+                     '2024-05-12', '2026-05-12', 'Roof North', 'Usable', 4),
+                    ('Conveyor Belt C3', 'CNV-2024-006', 'Machinery', 'Production', 'Emily Davis', 
+                     '2024-06-18', '2026-06-18', 'Factory Floor C', 'Usable', 1),
+                    ('Backup Generator', 'GEN-2024-007', 'Electrical', 'Maintenance', 'David Wilson', 
+                     '2024-07-22', '2027-07-22', 'Power Room', 'Usable', 2),
+                    ('Forklift FL-12', 'FRK-2024-008', 'Vehicles', 'Logistics', 'Lisa Anderson', 
+                     '2024-08-30', '2025-08-30', 'Warehouse A', 'Usable', 5),
+                ]
+                cursor.executemany('''
+                    INSERT INTO equipment (name, serial_number, category, department, assigned_employee,
+                                         purchase_date, warranty_expiry, location, status, team_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', equipment)
+            
+            # Check if maintenance requests exist
+            cursor.execute("SELECT COUNT(*) FROM maintenance_requests")
+            if cursor.fetchone()[0] == 0:
+                requests = [
+                    ('Monthly Oil Change', 1, 'Preventive', '2024-12-28', 2.0, 'In Progress', 
+                     'John Smith', 1, 'Production', 'Medium', 'Regular monthly maintenance'),
+                    ('Hydraulic Leak Repair', 2, 'Corrective', '2024-12-27', 4.0, 'New', 
+                     'Jane Doe', 1, 'Production', 'High', 'Oil leak detected on hydraulic press'),
+                    ('Generator Load Test', 3, 'Preventive', '2024-12-29', 3.0, 'New', 
+                     'Mike Johnson', 2, 'Maintenance', 'Medium', 'Quarterly load test'),
+                    ('Server Cooling Issue', 4, 'Corrective', '2024-12-26', 2.0, 'Repaired', 
+                     'Sarah Williams', 3, 'IT Department', 'Critical', 'Server overheating detected'),
+                    ('HVAC Filter Replacement', 5, 'Preventive', '2024-12-30', 1.5, 'New', 
+                     'Robert Brown', 4, 'Facilities', 'Low', 'Scheduled filter replacement'),
+                    ('Conveyor Belt Alignment', 6, 'Corrective', '2024-12-27', 3.0, 'In Progress', 
+                     'Emily Davis', 1, 'Production', 'High', 'Belt misalignment causing jams'),
+                    ('Forklift Battery Check', 8, 'Preventive', '2024-12-31', 1.0, 'New', 
+                     'Lisa Anderson', 5, 'Logistics', 'Low', 'Weekly battery inspection'),
+                ]
+                cursor.executemany('''
+                    INSERT INTO maintenance_requests (subject, equipment_id, request_type, scheduled_date,
+                                                     duration_hours, stage, assigned_technician, team_id,
+                                                     department, priority, description)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', requests)
+            
+            # Check if team members exist
+            cursor.execute("SELECT COUNT(*) FROM team_members")
+            if cursor.fetchone()[0] == 0:
+                team_members = [
+                    # Mechanics Team (team_id=1)
+                    (1, 'John Smith', 'Senior Technician', 'john.smith@company.com', '555-0101'),
+                    (1, 'Jane Doe', 'Mechanic Lead', 'jane.doe@company.com', '555-0102'),
+                    (1, 'Emily Davis', 'Technician', 'emily.davis@company.com', '555-0103'),
+                    (1, 'Tom Baker', 'Apprentice', 'tom.baker@company.com', '555-0104'),
+                    # Electricians Team (team_id=2)
+                    (2, 'Mike Johnson', 'Master Electrician', 'mike.johnson@company.com', '555-0201'),
+                    (2, 'David Wilson', 'Electrician', 'david.wilson@company.com', '555-0202'),
+                    (2, 'Chris Martin', 'Electrical Technician', 'chris.martin@company.com', '555-0203'),
+                    # IT Support Team (team_id=3)
+                    (3, 'Sarah Williams', 'IT Manager', 'sarah.williams@company.com', '555-0301'),
+                    (3, 'Alex Turner', 'System Administrator', 'alex.turner@company.com', '555-0302'),
+                    (3, 'Nina Patel', 'IT Support Specialist', 'nina.patel@company.com', '555-0303'),
+                    # HVAC Team (team_id=4)
+                    (4, 'Robert Brown', 'HVAC Technician', 'robert.brown@company.com', '555-0401'),
+                    (4, 'James Lee', 'HVAC Specialist', 'james.lee@company.com', '555-0402'),
+                    # Facilities Team (team_id=5)
+                    (5, 'Lisa Anderson', 'Facilities Manager', 'lisa.anderson@company.com', '555-0501'),
+                    (5, 'Mark Thompson', 'Maintenance Worker', 'mark.thompson@company.com', '555-0502'),
+                ]
+                cursor.executemany('''
+                    INSERT INTO team_members (team_id, name, role, email, phone)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', team_members)
+    
+    # ============ REQUEST READ MODEL ============
+    
+    def _refresh_request_view(self, conn, where: str, params: Tuple = ()):
+        """Recopy the request_view rows of the requests matching a WHERE clause on mr"""
+        conn.execute(f"{REQUEST_VIEW_REFRESH} WHERE {where}", params)
+    
+    def rebuild_request_view(self):
+        """Recreate request_view from the base tables"""
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM request_view')
+            self._refresh_request_view(conn, '1')
+    
+    def ensure_request_view(self):
+        """Rebuild request_view when its row count disagrees with maintenance_requests
         
-        conn.commit()
-        conn.close()
+        Covers databases that predate the table or were written by other tools.
+        """
+        conn = self.get_connection()
+        views = conn.execute('SELECT COUNT(*) FROM request_view').fetchone()[0]
+        requests = conn.execute('SELECT COUNT(*) FROM maintenance_requests').fetchone()[0]
+        if views != requests:
+            self.rebuild_request_view()
     
     # ============ EQUIPMENT OPERATIONS ============
     
     def add_equipment(self, data: Dict) -> int:
         """Add new equipment"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT INTO equipment (name, serial_number, category, department, assigned_employee,
+                                     purchase_date, warranty_expiry, location, status, team_id, notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                data['name'], data['serial_number'], data['category'], data['department'],
+                data.get('assigned_employee'), data.get('purchase_date'), data.get('warranty_expiry'),
+                data.get('location'), data.get('status', 'Usable'), data.get('team_id'), data.get('notes')
+            ))
+            
+            equipment_id = cursor.lastrowid
+            
+            # Log activity
+            self.log_activity(equipment_id=equipment_id, action='Equipment Created', 
+                             details=f"Equipment '{data['name']}' added to system")
         
-        cursor.execute('''
-            INSERT INTO equipment (name, serial_number, category, department, assigned_employee,
-                                 purchase_date, warranty_expiry, location, status, team_id, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            data['name'], data['serial_number'], data['category'], data['department'],
-            data.get('assigned_employee'), data.get('purchase_date'), data.get('warranty_expiry'),
-            data.get('location'), data.get('status', 'Usable'), data.get('team_id'), data.get('notes')
-        ))
-        
-        equipment_id = cursor.lastrowid
-        
-        # Log activity
-        self.log_activity(equipment_id=equipment_id, action='Equipment Created', 
-                         details=f"Equipment '{data['name']}' added to system")
-        
-        conn.commit()
-        conn.close()
         return equipment_id
     
-    def get_all_equipment(self) -> List[Dict]:
-        """Get all equipment with team information"""
+    def get_all_equipment(self, include_request_counts: bool = False) -> List[Dict]:
+        """Get all equipment with team information
+        
+        With include_request_counts each row also carries 'open_requests',
+        joined from one grouped count instead of a query per equipment.
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT e.*, t.name as team_name
-            FROM equipment e
-            LEFT JOIN teams t ON e.team_id = t.id
-            ORDER BY e.created_at DESC
-        ''')
+        if include_request_counts:
+            cursor.execute('''
+                SELECT e.*, t.name as team_name, COALESCE(oc.count, 0) as open_requests
+                FROM equipment e
+                LEFT JOIN teams t ON e.team_id = t.id
+                LEFT JOIN (
+                    SELECT equipment_id, COUNT(*) as count
+                    FROM maintenance_requests
+                    WHERE (stage NOT IN ('Repaired', 'Scrap'))
+                    GROUP BY equipment_id
+                ) oc ON oc.equipment_id = e.id
+                ORDER BY e.created_at DESC
+            ''')
+        else:
+            cursor.execute('''
+                SELECT e.*, t.name as team_name
+                FROM equipment e
+                LEFT JOIN teams t ON e.team_id = t.id
+                ORDER BY e.created_at DESC
+            ''')
         
         equipment = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return equipment
     
     def get_equipment_by_id(self, equipment_id: int) -> Optional[Dict]:
@@ -268,44 +512,38 @@ class Database:
         ''', (equipment_id,))
         
         row = cursor.fetchone()
-        conn.close()
         return dict(row) if row else None
     
     def update_equipment(self, equipment_id: int, data: Dict):
         """Update equipment information"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE equipment
-            SET name=?, serial_number=?, category=?, department=?, assigned_employee=?,
-                purchase_date=?, warranty_expiry=?, location=?, status=?, team_id=?, notes=?
-            WHERE id=?
-        ''', (
-            data['name'], data['serial_number'], data['category'], data['department'],
-            data.get('assigned_employee'), data.get('purchase_date'), data.get('warranty_expiry'),
-            data.get('location'), data.get('status', 'Usable'), data.get('team_id'), 
-            data.get('notes'), equipment_id
-        ))
-        
-        self.log_activity(equipment_id=equipment_id, action='Equipment Updated', 
-                         details=f"Equipment information modified")
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                UPDATE equipment
+                SET name=?, serial_number=?, category=?, department=?, assigned_employee=?,
+                    purchase_date=?, warranty_expiry=?, location=?, status=?, team_id=?, notes=?
+                WHERE id=?
+            ''', (
+                data['name'], data['serial_number'], data['category'], data['department'],
+                data.get('assigned_employee'), data.get('purchase_date'), data.get('warranty_expiry'),
+                data.get('location'), data.get('status', 'Usable'), data.get('team_id'), 
+                data.get('notes'), equipment_id
+            ))
+            self._refresh_request_view(conn, 'mr.equipment_id = ?', (equipment_id,))
+            
+            self.log_activity(equipment_id=equipment_id, action='Equipment Updated', 
+                             details=f"Equipment information modified")
     
     def scrap_equipment(self, equipment_id: int, reason: str):
         """Mark equipment as scrapped"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('UPDATE equipment SET status=? WHERE id=?', ('Scrapped', equipment_id))
-        
-        self.log_activity(equipment_id=equipment_id, action='Equipment Scrapped', 
-                         details=f"Equipment marked as scrapped. Reason: {reason}")
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('UPDATE equipment SET status=? WHERE id=?', ('Scrapped', equipment_id))
+            
+            self.log_activity(equipment_id=equipment_id, action='Equipment Scrapped', 
+                             details=f"Equipment marked as scrapped. Reason: {reason}")
     
     def get_equipment_request_count(self, equipment_id: int) -> int:
         """Get count of open maintenance requests for equipment"""
@@ -319,21 +557,46 @@ class Database:
         ''', (equipment_id,))
         
         count = cursor.fetchone()[0]
-        conn.close()
         return count
     
+    def get_open_request_counts(self, equipment_ids: Optional[List[int]] = None) -> Dict[int, int]:
+        """Get open maintenance request counts per equipment in one grouped query
+        
+        Counts cover the given equipment ids (all equipment when omitted);
+        equipment without open requests is absent from the result.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        query = '''
+            SELECT equipment_id, COUNT(*) as count
+            FROM maintenance_requests
+            WHERE (stage NOT IN ('Repaired', 'Scrap'))
+        '''
+        if equipment_ids is None:
+            cursor.execute(query + ' GROUP BY equipment_id')
+            return {row['equipment_id']: row['count'] for row in cursor.fetchall()}
+        
+        counts = {}
+        ids = list(equipment_ids)
+        # Chunked to stay under SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(query + f' AND equipment_id IN ({placeholders}) GROUP BY equipment_id', chunk)
+            counts.update((row['equipment_id'], row['count']) for row in cursor.fetchall())
+        return counts
+    
     # ============ TEAM OPERATIONS ============
     
     def add_team(self, name: str, description: str = '') -> int:
         """Add new team"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('INSERT INTO teams (name, description) VALUES (?, ?)', (name, description))
-        team_id = cursor.lastrowid
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('INSERT INTO teams (name, description) VALUES (?, ?)', (name, description))
+            team_id = cursor.lastrowid
         
-        conn.commit()
-        conn.close()
         return team_id
     
     def get_all_teams(self) -> List[Dict]:
@@ -344,7 +607,6 @@ class Database:
         cursor.execute('SELECT * FROM teams ORDER BY name')
         teams = [dict(row) for row in cursor.fetchall()]
         
-        conn.close()
         return teams
     
     def get_team_by_id(self, team_id: int) -> Optional[Dict]:
@@ -355,42 +617,84 @@ class Database:
         cursor.execute('SELECT * FROM teams WHERE id = ?', (team_id,))
         row = cursor.fetchone()
         
-        conn.close()
         return dict(row) if row else None
     
-    # ============ MAINTENANCE REQUEST OPERATIONS ============
-    
-    def add_maintenance_request(self, data: Dict) -> int:
-        """Add new maintenance request with auto-fill logic"""
+    def get_team_summaries(self) -> List[Dict]:
+        """Get all teams with their workload and members in two queries
+        
+        Each team carries total_requests, active_requests, equipment_count
+        and a 'members' list (ordered by name).
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        # Auto-fill department and team from equipment
-        equipment = self.get_equipment_by_id(data['equipment_id'])
-        if equipment:
-            data['department'] = equipment['department']
-            data['team_id'] = equipment['team_id']
+        cursor.execute('''
+            SELECT t.*,
+                   COALESCE(rq.total, 0) as total_requests,
+                   COALESCE(rq.active, 0) as active_requests,
+                   COALESCE(eq.count, 0) as equipment_count
+            FROM teams t
+            LEFT JOIN (
+                SELECT team_id, COUNT(*) as total,
+                       SUM(CASE WHEN stage NOT IN ('Repaired', 'Scrap') THEN 1 ELSE 0 END) as active
+                FROM maintenance_requests
+                GROUP BY team_id
+            ) rq ON rq.team_id = t.id
+            LEFT JOIN (
+                SELECT team_id, COUNT(*) as count
+                FROM equipment
+                GROUP BY team_id
+            ) eq ON eq.team_id = t.id
+            ORDER BY t.name
+        ''')
+        teams = [dict(row) for row in cursor.fetchall()]
         
+        members_by_team = {team['id']: [] for team in teams}
         cursor.execute('''
-            INSERT INTO maintenance_requests (subject, equipment_id, request_type, scheduled_date,
-                                             duration_hours, stage, assigned_technician, team_id,
-                                             department, priority, description)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            data['subject'], data['equipment_id'], data['request_type'], data['scheduled_date'],
-            data.get('duration_hours', 1.0), data.get('stage', 'New'), 
-            data.get('assigned_technician'), data.get('team_id'), data.get('department'),
-            data.get('priority', 'Medium'), data.get('description')
-        ))
-        
-        request_id = cursor.lastrowid
-        
-        self.log_activity(equipment_id=data['equipment_id'], request_id=request_id,
-                         action='Maintenance Request Created', 
-                         details=f"Request '{data['subject']}' created")
-        
-        conn.commit()
-        conn.close()
+            SELECT id, team_id, name, role, email, phone, created_at
+            FROM team_members
+            ORDER BY team_id, name
+        ''')
+        for row in cursor.fetchall():
+            if row['team_id'] in members_by_team:
+                members_by_team[row['team_id']].append(dict(row))
+        
+        for team in teams:
+            team['members'] = members_by_team[team['id']]
+        return teams
+    
+    # ============ MAINTENANCE REQUEST OPERATIONS ============
+    
+    def add_maintenance_request(self, data: Dict) -> int:
+        """Add new maintenance request with auto-fill logic"""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Auto-fill department and team from equipment
+            equipment = self.get_equipment_by_id(data['equipment_id'])
+            if equipment:
+                data['department'] = equipment['department']
+                data['team_id'] = equipment['team_id']
+            
+            cursor.execute('''
+                INSERT INTO maintenance_requests (subject, equipment_id, request_type, scheduled_date,
+                                                 duration_hours, stage, assigned_technician, team_id,
+                                                 department, priority, description)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                data['subject'], data['equipment_id'], data['request_type'], data['scheduled_date'],
+                data.get('duration_hours', 1.0), data.get('stage', 'New'), 
+                data.get('assigned_technician'), data.get('team_id'), data.get('department'),
+                data.get('priority', 'Medium'), data.get('description')
+            ))
+            
+            request_id = cursor.lastrowid
+            self._refresh_request_view(conn, 'mr.id = ?', (request_id,))
+            
+            self.log_activity(equipment_id=data['equipment_id'], request_id=request_id,
+                             action='Maintenance Request Created', 
+                             details=f"Request '{data['subject']}' created")
+        
         return request_id
     
     def get_all_requests(self) -> List[Dict]:
@@ -398,16 +702,9 @@ class Database:
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT mr.*, e.name as equipment_name, e.serial_number, t.name as team_name
-            FROM maintenance_requests mr
-            LEFT JOIN equipment e ON mr.equipment_id = e.id
-            LEFT JOIN teams t ON mr.team_id = t.id
-            ORDER BY mr.created_at DESC
-        ''')
+        cursor.execute('SELECT * FROM request_view ORDER BY created_at DESC')
         
         requests = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return requests
     
     def get_request_by_id(self, request_id: int) -> Optional[Dict]:
@@ -415,43 +712,34 @@ class Database:
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT mr.*, e.name as equipment_name, e.serial_number, t.name as team_name
-            FROM maintenance_requests mr
-            LEFT JOIN equipment e ON mr.equipment_id = e.id
-            LEFT JOIN teams t ON mr.team_id = t.id
-            WHERE mr.id = ?
-        ''', (request_id,))
+        cursor.execute('SELECT * FROM request_view WHERE id = ?', (request_id,))
         
         row = cursor.fetchone()
-        conn.close()
         return dict(row) if row else None
     
     def update_request_stage(self, request_id: int, new_stage: str):
         """Update request stage with scrap logic"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Get request details
-        request = self.get_request_by_id(request_id)
-        
-        # Update stage
-        cursor.execute('UPDATE maintenance_requests SET stage=? WHERE id=?', (new_stage, request_id))
-        
-        # If moved to Scrap, update equipment status
-        if new_stage == 'Scrap' and request:
-            self.scrap_equipment(request['equipment_id'], f"Maintenance request #{request_id} marked as scrap")
-        
-        # If completed, set completed timestamp
-        if new_stage == 'Repaired':
-            cursor.execute('UPDATE maintenance_requests SET completed_at=? WHERE id=?', 
-                         (datetime.now(), request_id))
-        
-        self.log_activity(request_id=request_id, action='Stage Changed', 
-                         details=f"Stage updated to {new_stage}")
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Get request details
+            request = self.get_request_by_id(request_id)
+            
+            # Update stage
+            cursor.execute('UPDATE maintenance_requests SET stage=? WHERE id=?', (new_stage, request_id))
+            
+            # If moved to Scrap, update equipment status
+            if new_stage == 'Scrap' and request:
+                self.scrap_equipment(request['equipment_id'], f"Maintenance request #{request_id} marked as scrap")
+            
+            # If completed, set completed timestamp
+            if new_stage == 'Repaired':
+                cursor.execute('UPDATE maintenance_requests SET completed_at=? WHERE id=?', 
+                             (datetime.now(), request_id))
+            
+            self._refresh_request_view(conn, 'mr.id = ?', (request_id,))
+            self.log_activity(request_id=request_id, action='Stage Changed', 
+                             details=f"Stage updated to {new_stage}")
     
     def get_requests_by_equipment(self, equipment_id: int) -> List[Dict]:
         """Get all requests for specific equipment"""
@@ -459,15 +747,12 @@ class Database:
         cursor = conn.cursor()
         
         cursor.execute('''
-            SELECT mr.*, t.name as team_name
-            FROM maintenance_requests mr
-            LEFT JOIN teams t ON mr.team_id = t.id
-            WHERE mr.equipment_id = ?
-            ORDER BY mr.created_at DESC
+            SELECT * FROM request_view
+            WHERE equipment_id = ?
+            ORDER BY created_at DESC
         ''', (equipment_id,))
         
         requests = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return requests
     
     def get_requests_by_stage(self, stage: str) -> List[Dict]:
@@ -475,19 +760,163 @@ class Database:
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT mr.*, e.name as equipment_name, t.name as team_name
-            FROM maintenance_requests mr
-            LEFT JOIN equipment e ON mr.equipment_id = e.id
-            LEFT JOIN teams t ON mr.team_id = t.id
-            WHERE mr.stage = ?
-            ORDER BY mr.scheduled_date
-        ''', (stage,))
+        cursor.execute('SELECT * FROM request_view WHERE stage = ? ORDER BY scheduled_date', (stage,))
         
         requests = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return requests
     
+    # ============ FILTERED QUERIES ============
+    
+    def query_equipment(self, filters: Optional[Dict] = None, limit: int = 30, offset: int = 0,
+                        include_request_counts: bool = False) -> Tuple[List[Dict], int]:
+        """Get one page of equipment matching the filters, plus the total match count
+        
+        filters keys come from EQUIPMENT_FILTERS. The page is read in
+        created_at index order; with include_request_counts only the page's
+        rows get an 'open_requests' count (see get_open_request_counts).
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        conditions, params = build_where(filters, EQUIPMENT_FILTERS)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        cursor.execute(f'''
+            SELECT e.*, t.name as team_name
+            FROM equipment e
+            LEFT JOIN teams t ON e.team_id = t.id
+            {where}
+            ORDER BY e.created_at DESC, e.id DESC
+            LIMIT ? OFFSET ?
+        ''', params + [limit, offset])
+        
+        rows = [dict(row) for row in cursor.fetchall()]
+        if include_request_counts and rows:
+            counts = self.get_open_request_counts([row['id'] for row in rows])
+            for row in rows:
+                row['open_requests'] = counts.get(row['id'], 0)
+        return rows, self._page_total(cursor, f'SELECT COUNT(*) FROM equipment e {where}', params,
+                                      rows, limit, offset)
+    
+    def query_requests(self, filters: Optional[Dict] = None, overdue_only: bool = False,
+                       limit: int = 50, offset: int = 0) -> Tuple[List[Dict], int]:
+        """Get one page of requests matching the filters, plus the total match count
+        
+        filters keys come from REQUEST_FILTERS; overdue_only keeps open
+        requests scheduled before today. The page is read in created_at
+        index order.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        conditions, params = build_where(filters, REQUEST_FILTERS)
+        if overdue_only:
+            conditions.append("(mr.stage NOT IN ('Repaired', 'Scrap')) AND mr.scheduled_date < ?")
+            params.append(date.today().isoformat())
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        cursor.execute(f'''
+            SELECT mr.*
+            FROM request_view mr
+            {where}
+            ORDER BY mr.created_at DESC, mr.id DESC
+            LIMIT ? OFFSET ?
+        ''', params + [limit, offset])
+        
+        rows = [dict(row) for row in cursor.fetchall()]
+        return rows, self._page_total(cursor, f'SELECT COUNT(*) FROM request_view mr {where}', params,
+                                      rows, limit, offset)
+    
+    @staticmethod
+    def _page_total(cursor, count_sql: str, params: List, rows: List[Dict], limit: int, offset: int) -> int:
+        """Total match count for a page, counted only when the page can't tell
+        
+        A partly filled page ends the results, so its total is known. A full
+        page, or an empty one past the end, runs count_sql.
+        """
+        if (rows and len(rows) < limit) or (not rows and offset == 0):
+            return offset + len(rows)
+        cursor.execute(count_sql, params)
+        return cursor.fetchone()[0]
+    
+    def get_distinct_values(self, table: str, column: str) -> List:
+        """Get the sorted distinct non-null values of a facet column (for filter select boxes)"""
+        if column not in FACETS.get(table, ()):
+            raise ValueError(f"Unknown facet '{table}.{column}'")
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f'SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL ORDER BY {column}')
+        return [row[0] for row in cursor.fetchall()]
+    
+    def get_preventive_requests(self, start, end, open_only: bool = False) -> List[Dict]:
+        """Get preventive requests scheduled between start and end (inclusive)
+        
+        start/end are dates or 'YYYY-MM-DD' strings; the range is served by
+        the (request_type, scheduled_date) index. open_only drops
+        Repaired/Scrap requests.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        open_filter = "AND (mr.stage NOT IN ('Repaired', 'Scrap'))" if open_only else ''
+        cursor.execute(f'''
+            SELECT mr.*
+            FROM request_view mr
+            WHERE mr.request_type = 'Preventive' AND mr.scheduled_date BETWEEN ? AND ? {open_filter}
+            ORDER BY mr.scheduled_date, mr.id
+        ''', (str(start), str(end)))
+        
+        requests = [dict(row) for row in cursor.fetchall()]
+        return requests
+    
+    def get_kanban_board(self, stages: List[str], limits: Optional[Dict[str, int]] = None,
+                         default_limit: int = 25) -> Dict[str, Dict]:
+        """Get the kanban board in two queries: per-stage counts plus the top cards of each column
+        
+        Returns {stage: {'count': total in stage, 'requests': [...]}}. Each
+        column holds at most limits.get(stage, default_limit) cards, ordered
+        by priority then scheduled date (most recent first for the closed
+        Repaired/Scrap columns). Every column is its own
+        "WHERE stage = ? ... LIMIT ?" branch of a UNION ALL, so it reads only
+        its stage through the (stage, scheduled_date) index.
+        """
+        board = {stage: {'count': 0, 'requests': []} for stage in stages}
+        if not stages:
+            return board
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        limits = limits or {}
+        branches, params = [], []
+        for stage in stages:
+            direction = 'DESC' if stage in ('Repaired', 'Scrap') else 'ASC'
+            branches.append(f'''
+                SELECT * FROM (
+                    SELECT mr.*
+                    FROM request_view mr
+                    WHERE mr.stage = ?
+                    ORDER BY CASE mr.priority WHEN 'Critical' THEN 0 WHEN 'High' THEN 1
+                                              WHEN 'Medium' THEN 2 WHEN 'Low' THEN 3 ELSE 4 END,
+                             mr.scheduled_date {direction}, mr.id
+                    LIMIT ?
+                )''')
+            params += [stage, limits.get(stage, default_limit)]
+        
+        cursor.execute(' UNION ALL '.join(branches), params)
+        for row in cursor.fetchall():
+            board[row['stage']]['requests'].append(dict(row))
+        
+        cursor.execute(f'''
+            SELECT stage, COUNT(*) as count
+            FROM request_view
+            WHERE stage IN ({', '.join('?' * len(stages))})
+            GROUP BY stage
+        ''', list(stages))
+        for row in cursor.fetchall():
+            board[row['stage']]['count'] = row['count']
+        return board
+    
     # ============ ANALYTICS ============
     
     def get_requests_by_team(self) -> List[Dict]:
@@ -504,7 +933,6 @@ class Database:
         ''')
         
         data = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return data
     
     def get_equipment_by_category(self) -> List[Dict]:
@@ -520,57 +948,41 @@ class Database:
         ''')
         
         data = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return data
     
     def get_dashboard_stats(self) -> Dict:
-        """Get dashboard statistics"""
+        """Get dashboard statistics in a single pass over open requests"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        stats = {}
-        
-        # Total equipment
-        cursor.execute('SELECT COUNT(*) FROM equipment WHERE status = "Usable"')
-        stats['total_equipment'] = cursor.fetchone()[0]
-        
-        # Active requests
-        cursor.execute('SELECT COUNT(*) FROM maintenance_requests WHERE stage NOT IN ("Repaired", "Scrap")')
-        stats['active_requests'] = cursor.fetchone()[0]
-        
-        # Overdue requests
         cursor.execute('''
-            SELECT COUNT(*) FROM maintenance_requests 
-            WHERE stage NOT IN ("Repaired", "Scrap") AND scheduled_date < date('now')
+            SELECT
+                (SELECT COUNT(*) FROM equipment WHERE status = 'Usable') as total_equipment,
+                COUNT(*) as active_requests,
+                COALESCE(SUM(CASE WHEN scheduled_date < date('now') THEN 1 ELSE 0 END), 0) as overdue_requests,
+                (SELECT COUNT(*) FROM teams) as total_teams,
+                COALESCE(SUM(CASE WHEN priority = 'Critical' THEN 1 ELSE 0 END), 0) as critical_requests
+            FROM maintenance_requests
+            WHERE (stage NOT IN ('Repaired', 'Scrap'))
         ''')
-        stats['overdue_requests'] = cursor.fetchone()[0]
-        
-        # Total teams
-        cursor.execute('SELECT COUNT(*) FROM teams')
-        stats['total_teams'] = cursor.fetchone()[0]
         
-        # Critical requests
-        cursor.execute('SELECT COUNT(*) FROM maintenance_requests WHERE priority = "Critical" AND stage NOT IN ("Repaired", "Scrap")')
-        stats['critical_requests'] = cursor.fetchone()[0]
-        
-        conn.close()
+        stats = dict(cursor.fetchone())
         return stats
     
     # ============ TEAM MEMBERS OPERATIONS ============
     
     def add_team_member(self, team_id: int, name: str, role: str = '', email: str = '', phone: str = '') -> int:
         """Add a new team member"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO team_members (team_id, name, role, email, phone)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (team_id, name, role, email, phone))
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT INTO team_members (team_id, name, role, email, phone)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (team_id, name, role, email, phone))
+            
+            member_id = cursor.lastrowid
         
-        member_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
         return member_id
     
     def get_team_members(self, team_id: int) -> List[Dict]:
@@ -586,7 +998,6 @@ class Database:
         ''', (team_id,))
         
         members = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return members
     
     def get_all_team_members(self) -> List[Dict]:
@@ -603,48 +1014,38 @@ class Database:
         ''')
         
         members = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return members
     
     def remove_team_member(self, member_id: int):
         """Remove a team member"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM team_members WHERE id = ?', (member_id,))
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('DELETE FROM team_members WHERE id = ?', (member_id,))
     
     def update_team_member(self, member_id: int, data: Dict):
         """Update team member information"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE team_members
-            SET name = ?, role = ?, email = ?, phone = ?
-            WHERE id = ?
-        ''', (data.get('name'), data.get('role'), data.get('email'), data.get('phone'), member_id))
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                UPDATE team_members
+                SET name = ?, role = ?, email = ?, phone = ?
+                WHERE id = ?
+            ''', (data.get('name'), data.get('role'), data.get('email'), data.get('phone'), member_id))
     
     # ============ ACTIVITY LOG ============
     
     def log_activity(self, equipment_id: Optional[int] = None, request_id: Optional[int] = None,
                      action: str = '', details: str = ''):
         """Log activity"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO activity_log (equipment_id, request_id, action, details)
-            VALUES (?, ?, ?, ?)
-        ''', (equipment_id, request_id, action, details))
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT INTO activity_log (equipment_id, request_id, action, details)
+                VALUES (?, ?, ?, ?)
+            ''', (equipment_id, request_id, action, details))
     
     def get_recent_activity(self, limit: int = 10) -> List[Dict]:
         """Get recent activity log"""
@@ -661,5 +1062,4 @@ class Database:
         ''', (limit,))
         
         activities = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return activities
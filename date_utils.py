@@ -0,0 +1,76 @@
+"""
+GearGuard - Date Utilities
+Batch date computations for request result sets
+
+Dates come back from SQLite as 'YYYY-MM-DD' strings, so overdue checks
+compare strings against one "today" resolved per batch instead of
+parsing every row, and display formatting is memoized because large
+result sets repeat the same few hundred dates.
+"""
+
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+CLOSED_STAGES = ('Repaired', 'Scrap')
+
+def _is_iso_date(value) -> bool:
+    return isinstance(value, str) and len(value) >= 10 and value[4] == '-' and value[7] == '-'
+
+@lru_cache(maxsize=4096)
+def format_date(date_str: str, format_out: str = "%b %d, %Y") -> str:
+    """Format date string for display"""
+    if not date_str:
+        return "N/A"
+
+    if _is_iso_date(date_str) and len(date_str) == 10:
+        try:
+            return date.fromisoformat(date_str).strftime(format_out)
+        except ValueError:
+            pass
+
+    # Anything else gets the original strptime parse, so values it rejected
+    # (datetimes, date objects, junk) still come back unchanged
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d').strftime(format_out)
+    except (TypeError, ValueError):
+        return date_str
+
+def calendar_window(anchor: date, span: str = "Month", shift: int = 0):
+    """Return (start, end) of the month or quarter containing anchor, moved by shift windows"""
+    months = 3 if span == "Quarter" else 1
+    first_month = anchor.year * 12 + (anchor.month - 1) // months * months + shift * months
+    start = date(first_month // 12, first_month % 12 + 1, 1)
+    next_month = first_month + months
+    end = date(next_month // 12, next_month % 12 + 1, 1) - timedelta(days=1)
+    return start, end
+
+def is_overdue(scheduled_date: str, today: Optional[date] = None) -> bool:
+    """Check if a scheduled date is before today"""
+    if not _is_iso_date(scheduled_date):
+        return False
+    return scheduled_date[:10] < (today or date.today()).isoformat()
+
+def annotate_requests(requests: List[Dict], today: Optional[date] = None) -> List[Dict]:
+    """Add is_overdue, days_until and scheduled_display to each request dict in place
+
+    is_overdue only flags open requests; days_until is None when the
+    scheduled date is missing or malformed.
+    """
+    today = today or date.today()
+    today_iso = today.isoformat()
+    today_ordinal = today.toordinal()
+
+    for req in requests:
+        scheduled = req.get('scheduled_date')
+        if _is_iso_date(scheduled):
+            req['is_overdue'] = scheduled[:10] < today_iso and req.get('stage') not in CLOSED_STAGES
+            try:
+                req['days_until'] = date.fromisoformat(scheduled[:10]).toordinal() - today_ordinal
+            except ValueError:
+                req['days_until'] = None
+        else:
+            req['is_overdue'] = False
+            req['days_until'] = None
+        req['scheduled_display'] = format_date(scheduled)
+    return requests
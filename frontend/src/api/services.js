@@ -1,14 +1,32 @@
 import api from "./axios";
 
+// List endpoints accept optional params:
+//   sort   - whitelisted column, prefix with "-" for descending
+//   fields - comma separated keys to return
+//   limit / cursor - keyset pagination; the response becomes
+//            { items, next_cursor } and next_cursor feeds the next call
+export async function fetchAllPages(getPage, params = {}) {
+  const items = [];
+  let cursor;
+  do {
+    const { data } = await getPage({ limit: 500, ...params, cursor });
+    items.push(...data.items);
+    cursor = data.next_cursor;
+  } while (cursor);
+  return items;
+}
+
 // Equipment API
 export const equipmentAPI = {
-  getAll: () => api.get("/equipment"),
+  getAll: (params) => api.get("/equipment", { params }),
   getById: (id) => api.get(`/equipment/${id}`),
   create: (data) => api.post("/equipment", data),
   update: (id, data) => api.put(`/equipment/${id}`, data),
   delete: (id) => api.delete(`/equipment/${id}`),
-  getByTeam: (teamId) => api.get(`/equipment/by-team/${teamId}`),
-  getByStatus: (status) => api.get(`/equipment/by-status/${status}`),
+  getByTeam: (teamId, params) =>
+    api.get(`/equipment/by-team/${teamId}`, { params }),
+  getByStatus: (status, params) =>
+    api.get(`/equipment/by-status/${status}`, { params }),
 };
 
 // Maintenance Requests API
@@ -18,22 +36,27 @@ export const requestsAPI = {
   create: (data) => api.post("/requests", data),
   update: (id, data) => api.put(`/requests/${id}`, data),
   delete: (id) => api.delete(`/requests/${id}`),
-  getByEquipment: (equipmentId) =>
-    api.get(`/requests/by-equipment/${equipmentId}`),
-  getByStage: (stage) => api.get(`/requests/by-stage/${stage}`),
-  getPreventive: () => api.get("/requests/preventive"),
+  bulkCreate: (items) => api.post("/requests/bulk", items),
+  bulkUpdate: (items) => api.patch("/requests/bulk", items),
+  getByEquipment: (equipmentId, params) =>
+    api.get(`/requests/by-equipment/${equipmentId}`, { params }),
+  getByStage: (stage, params) =>
+    api.get(`/requests/by-stage/${stage}`, { params }),
+  getPreventive: (params) => api.get("/requests/preventive", { params }),
 };
 
 // Teams API
 export const teamsAPI = {
-  getAll: () => api.get("/teams"),
+  getAll: (params) => api.get("/teams", { params }),
   getById: (id) => api.get(`/teams/${id}`),
   create: (data) => api.post("/teams", data),
+  update: (id, data) => api.put(`/teams/${id}`, data),
   delete: (id) => api.delete(`/teams/${id}`),
 
   // Team Members
-  getAllMembers: () => api.get("/teams/members"),
-  getTeamMembers: (teamId) => api.get(`/teams/${teamId}/members`),
+  getAllMembers: (params) => api.get("/teams/members", { params }),
+  getTeamMembers: (teamId, params) =>
+    api.get(`/teams/${teamId}/members`, { params }),
   createMember: (data) => api.post("/teams/members", data),
   updateMember: (id, data) => api.put(`/teams/members/${id}`, data),
   deleteMember: (id) => api.delete(`/teams/members/${id}`),
@@ -47,9 +70,30 @@ export const dashboardAPI = {
   getRecentActivity: () => api.get("/dashboard/recent-activity"),
 };
 
+// Change feed: deltas shaped { seq, entity, op, id, data }, where data holds
+// only the changed columns. EventSource reconnects on its own and resumes
+// from the last seq it received (sent as Last-Event-ID).
+export const changesAPI = {
+  getSince: (since, params) => api.get("/changes", { params: { since, ...params } }),
+  subscribe: (onChange, since) => {
+    const query = since == null ? "" : `?since=${since}`;
+    const source = new EventSource(`/api/changes/stream${query}`);
+    source.addEventListener("change", (event) => onChange(JSON.parse(event.data)));
+    return () => source.close();
+  },
+};
+
+// Incremental sync: rows changed and ids deleted since a stored version.
+// since 0 returns a full snapshot; keep the response's version for next time.
+export const syncAPI = {
+  getSince: (since = 0) => api.get("/sync", { params: { since } }),
+};
+
 export default {
   equipment: equipmentAPI,
   requests: requestsAPI,
   teams: teamsAPI,
   dashboard: dashboardAPI,
+  changes: changesAPI,
+  sync: syncAPI,
 };
@@ -6,28 +6,9 @@ Helper functions for date handling, UI components, and formatting
 from datetime import datetime, date, timedelta
 from typing import List, Dict
 import streamlit as st
-
-def is_overdue(scheduled_date: str) -> bool:
-    """Check if a scheduled date is overdue"""
-    if not scheduled_date:
-        return False
-    
-    try:
-        scheduled = datetime.strptime(scheduled_date, '%Y-%m-%d').date()
-        return scheduled < date.today()
-    except:
-        return False
-
-def format_date(date_str: str, format_out: str = "%b %d, %Y") -> str:
-    """Format date string for display"""
-    if not date_str:
-        return "N/A"
-    
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        return date_obj.strftime(format_out)
-    except:
-        return date_str
+import card_templates
+from card_templates import render_cards
+from date_utils import is_overdue, format_date, annotate_requests, calendar_window
 
 def get_priority_color(priority: str) -> str:
     """Get color for priority badge"""
@@ -61,25 +42,47 @@ def get_stage_color(stage: str) -> str:
 
 def create_badge(text: str, color: str) -> str:
     """Create HTML badge"""
-    return f'<span style="background-color: {color}; color: white; padding: 4px 12px; border-radius: 12px; font-size: 12px; font-weight: 600;">{text}</span>'
+    return card_templates.badge(text, color)
 
 def create_smart_button(count: int, label: str) -> str:
     """Create smart button HTML"""
-    return f'''
-    <div style="
-        display: inline-block;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 8px 16px;
-        border-radius: 20px;
-        font-weight: 600;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        margin: 5px;
-    ">
-        <span style="font-size: 18px; margin-right: 8px;">{count}</span>
-        <span style="font-size: 12px;">{label}</span>
-    </div>
-    '''
+    return card_templates.smart_button(count, label)
+
+def page_selector(total: int, page_size: int, key: str) -> int:
+    """Render a page picker for a paginated list and return the current page
+    
+    The key should change with the active filters so a new filter set
+    starts again from page 1.
+    """
+    pages = max(1, -(-total // page_size))
+    if st.session_state.get(key, 1) > pages:
+        st.session_state[key] = pages
+    if pages > 1:
+        st.number_input(f"Page (of {pages}, {total} results)", min_value=1, max_value=pages, step=1, key=key)
+    return st.session_state.get(key, 1)
+
+def fetch_page(fetch, page_size: int, key: str):
+    """Return ``fetch(limit, offset)`` for the page stored under key, as (rows, total)
+    
+    A stored page past the end (rows deleted, or a smaller result than
+    last time) is clamped to the last page and fetched again before any
+    page picker is rendered.
+    """
+    page = st.session_state.get(key, 1)
+    rows, total = fetch(page_size, (page - 1) * page_size)
+    if not rows and page > 1:
+        page = max(1, -(-total // page_size))
+        st.session_state[key] = page
+        rows, total = fetch(page_size, (page - 1) * page_size)
+    return rows, total
+
+def compact_html(html: str) -> str:
+    """Strip indentation and blank lines so markdown keeps a large block as raw HTML
+    
+    A blank line ends an HTML block in markdown, after which indented
+    lines would render as code.
+    """
+    return '\n'.join(line.strip() for line in html.splitlines() if line.strip())
 
 def get_technician_avatar(name: str) -> str:
     """Get initials for technician avatar"""
@@ -93,54 +96,27 @@ def get_technician_avatar(name: str) -> str:
 
 def create_kanban_card(request: Dict, is_overdue: bool = False) -> str:
     """Create Kanban card HTML"""
-    border_color = '#FF4444' if is_overdue else '#E0E0E0'
-    priority_color = get_priority_color(request.get('priority', 'Medium'))
-    avatar = get_technician_avatar(request.get('assigned_technician', ''))
-    
-    overdue_badge = '<span style="background: #FF4444; color: white; padding: 2px 8px; border-radius: 8px; font-size: 10px; font-weight: 600;">OVERDUE</span>' if is_overdue else ''
-    
-    return f'''
-    <div style="
-        background: white;
-        border-left: 4px solid {border_color};
-        border-radius: 8px;
-        padding: 12px;
-        margin-bottom: 10px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        transition: transform 0.2s;
-    ">
-        <div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 8px;">
-            <h4 style="margin: 0; font-size: 14px; color: #333; flex: 1;">{request.get('subject', 'N/A')}</h4>
-            {overdue_badge}
-        </div>
-        <p style="margin: 4px 0; font-size: 12px; color: #666;">
-            <strong>{request.get('equipment_name', 'N/A')}</strong>
-        </p>
-        <div style="display: flex; justify-content: space-between; align-items: center; margin-top: 10px;">
-            <div style="display: flex; align-items: center; gap: 8px;">
-                <div style="
-                    width: 32px;
-                    height: 32px;
-                    border-radius: 50%;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    font-size: 11px;
-                    font-weight: 600;
-                ">{avatar}</div>
-                <span style="font-size: 11px; color: #666;">{request.get('assigned_technician', 'Unassigned')}</span>
-            </div>
-            <span style="background: {priority_color}; color: white; padding: 2px 8px; border-radius: 8px; font-size: 10px; font-weight: 600;">
-                {request.get('priority', 'Medium')}
-            </span>
-        </div>
-        <div style="margin-top: 8px; font-size: 11px; color: #999;">
-            📅 {format_date(request.get('scheduled_date', ''))}
-        </div>
-    </div>
-    '''
+    if 'scheduled_display' not in request:
+        request = {**request, 'scheduled_display': format_date(request.get('scheduled_date', ''))}
+    return card_templates.kanban_card(
+        request,
+        get_priority_color(request.get('priority', 'Medium')),
+        get_technician_avatar(request.get('assigned_technician', '')),
+        is_overdue
+    )
+
+def create_equipment_card(equipment: Dict) -> str:
+    """Create equipment grid card HTML (expects the open_requests count)"""
+    return card_templates.equipment_card(equipment, get_status_color(equipment['status']))
+
+def create_upcoming_card(request: Dict) -> str:
+    """Create upcoming maintenance card HTML for an annotated request"""
+    return card_templates.upcoming_card(request, get_priority_color(request['priority']))
+
+def create_activity_item(activity: Dict) -> str:
+    """Create recent activity entry HTML"""
+    created_at = activity.get('created_at')
+    return card_templates.activity_item(activity, format_date(created_at.split()[0]) if created_at else 'N/A')
 
 def get_calendar_events(requests: List[Dict]) -> List[Dict]:
     """Convert maintenance requests to calendar events"""